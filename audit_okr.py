@@ -4,121 +4,2540 @@ import pandas as pd
 from pathlib import Path
 from datetime import datetime
 import language_tool_python
-from docx import Document
 from nltk.corpus import words
 import warnings
 import re
 import subprocess
 import sys
+import math
+import struct
+import mmap
+import copy
+import time
+import asyncio
+import threading
+import tracemalloc
+import hashlib
+import importlib.util
+import sqlite3
+import pickle
+import queue
+import socket
+import shutil
+import tempfile
+import zipfile
+import xml.etree.ElementTree as ET
+import urllib.request
+from array import array
+from bisect import bisect_right
+from collections import deque, namedtuple
+from concurrent.futures import Future
+from functools import partial
+from itertools import accumulate, islice
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Listener
+from operator import mul
 warnings.filterwarnings("ignore")
 
+try:
+    import audioop
+except ImportError:  # Python 3.13+: mismo respaldo que usa PyDub
+    import pyaudioop as audioop
+
+try:
+    import resource
+except ImportError:  # Windows: sin getrusage, la memoria pico queda sin medir
+    resource = None
+
+CARPETA_DOCUMENTOS = "MATERIAL DE ESTUDIO"
+CARPETA_VIDEOS = "VIDEOS"
+EXTENSIONES_VIDEO = (".mp4", ".avi", ".mov")
+
+MODOS_AUDIO = ("completo", "streaming", "muestreo")
+MOTORES_AUDIO = ("pydub", "numpy")
+
+# Umbrales de evaluar_problemas_audio por métrica: en modo muestreo, si el intervalo de una
+# estimación contiene alguno, el veredicto podría cambiar y el video se analiza completo.
+# La cantidad de cortes se estima con su intervalo pero no escala: con pocas ventanas casi
+# nunca descarta los 15 cortes y obligaría a decodificar todos los videos
+UMBRALES_AUDIO = {
+    "porcentaje_silencio": (25, 40),
+    "volumen_max": (-60, -40, -20, -1),
+    "volumen_minimo": (-50,),
+    "volumen_desviacion": (10,)
+}
+Z_CONFIANZA = 1.96  # intervalos de ~95 %
+MARGEN_MUESTREO_DB = 3.0  # cuánto más alto (o bajo) puede estar un pico no muestreado
+PISO_DBFS = -120.0  # por debajo de cualquier umbral; reemplaza a -inf en las estadísticas
+
+
+class AnalizadorAudioIncremental:
+    """
+    Calcula las métricas de audio bloque a bloque, con memoria constante.
+    Replica los criterios de PyDub: max_dBFS, chunks de 10 s y detect_silence(seek_step=1)
+    """
+
+    def __init__(self, frame_rate, canales, ancho_muestra,
+                 min_silencio_ms=2000, umbral_silencio_db=-50, chunk_ms=10000):
+        from pydub.utils import db_to_float
+
+        self.frame_rate = frame_rate
+        self.canales = canales
+        self.ancho_muestra = ancho_muestra
+        self.ancho_frame = canales * ancho_muestra
+        self.min_silencio_ms = min_silencio_ms
+        self.chunk_ms = chunk_ms
+        self.max_amplitud_posible = (2 ** (ancho_muestra * 8)) / 2
+        self.umbral_silencio = db_to_float(umbral_silencio_db) * self.max_amplitud_posible
+        self._tipo_array = {1: 'b', 2: 'h', 4: 'i'}[ancho_muestra]
+
+        self.frames_totales = 0
+        self.max_absoluto = 0
+        self._resto = b""
+
+        # PCM aún no consumido en bins de 1 ms
+        self._pendiente = bytearray()
+        self._frame_pendiente = 0
+        self._bin_siguiente = 0
+
+        # Chunks de 10 s: (max absoluto, frames) de cada chunk cerrado
+        self._max_chunk = 0
+        self._bins_chunk = 0
+        self._chunks = []
+
+        # Ventana deslizante de silencio: (suma de cuadrados, muestras) por ms
+        self._ventana = deque()
+        self._suma_ventana = 0
+        self._muestras_ventana = 0
+
+        # Rangos de silencio (misma fusión que pydub.silence.detect_silence)
+        self._prev_silencio = None
+        self._inicio_rango = None
+        self.cantidad_silencios = 0
+        self.duracion_silencios_ms = 0
+        # En modo muestreo: si la ventana empieza en silencio, ese rango viene de antes
+        self.primer_silencio_ms = None
+
+    def silencio_confirmado_ms(self):
+        """Silencio ya detectado (rangos cerrados más el que sigue abierto): al terminar solo puede ser mayor"""
+        abierto = 0
+        if self._prev_silencio is not None:
+            abierto = self._prev_silencio + self.min_silencio_ms - self._inicio_rango
+        return self.duracion_silencios_ms + abierto
+
+    def _frame(self, ms):
+        """Misma conversión ms -> frame que AudioSegment._parse_position"""
+        return int(ms * (self.frame_rate / 1000.0))
+
+    def alimentar(self, datos):
+        """Procesar un bloque de PCM entrelazado (little-endian, con signo)"""
+        datos = self._resto + bytes(datos)
+        utilizable = len(datos) - len(datos) % self.ancho_frame
+        self._resto = datos[utilizable:]
+        if not utilizable:
+            return
+        datos = datos[:utilizable]
+
+        self.max_absoluto = max(self.max_absoluto, audioop.max(datos, self.ancho_muestra))
+        self.frames_totales += utilizable // self.ancho_frame
+        self._pendiente.extend(datos)
+
+        self._procesar_hasta(self._bins_disponibles())
+        self._descartar_consumido()
+
+    def _bins_disponibles(self):
+        """
+        Primer bin que aún no puede procesarse. Se deja un bin de margen:
+        así ningún bin procesado queda fuera de len(audio), que solo se conoce al final
+        """
+        k = max(self._bin_siguiente, int(self.frames_totales / (self.frame_rate / 1000.0)) - 3)
+        while k > self._bin_siguiente and self._frame(k + 1) > self.frames_totales:
+            k -= 1
+        while self._frame(k + 2) <= self.frames_totales:
+            k += 1
+        return k
+
+    def _procesar_hasta(self, limite):
+        while self._bin_siguiente < limite:
+            self._procesar_bin()
+
+    def _procesar_bin(self):
+        k = self._bin_siguiente
+        inicio, fin = self._frame(k), self._frame(k + 1)
+        a = (inicio - self._frame_pendiente) * self.ancho_frame
+        b = (fin - self._frame_pendiente) * self.ancho_frame
+        datos = bytes(self._pendiente[a:b])
+
+        muestras = array(self._tipo_array, datos)
+        if sys.byteorder == "big":
+            muestras.byteswap()
+        suma_cuadrados = sum(map(mul, muestras, muestras))
+        maximo = audioop.max(datos, self.ancho_muestra) if datos else 0
+
+        # Chunk de 10 s en curso
+        self._max_chunk = max(self._max_chunk, maximo)
+        self._bins_chunk += 1
+        if self._bins_chunk == self.chunk_ms:
+            self._cerrar_chunk(k + 1)
+
+        # Ventana de silencio [k - min_silencio_ms + 1, k]
+        self._ventana.append((suma_cuadrados, len(muestras)))
+        self._suma_ventana += suma_cuadrados
+        self._muestras_ventana += len(muestras)
+        if len(self._ventana) == self.min_silencio_ms:
+            # Igual que audioop.rms: raíz truncada a entero
+            rms = int(math.sqrt(self._suma_ventana / self._muestras_ventana)) if self._muestras_ventana else 0
+            if rms <= self.umbral_silencio:
+                self._registrar_silencio(k - self.min_silencio_ms + 1)
+            suma_vieja, muestras_viejas = self._ventana.popleft()
+            self._suma_ventana -= suma_vieja
+            self._muestras_ventana -= muestras_viejas
+
+        self._bin_siguiente += 1
+
+    def _descartar_consumido(self):
+        consumido = self._frame(self._bin_siguiente) - self._frame_pendiente
+        if consumido > 0:
+            del self._pendiente[:consumido * self.ancho_frame]
+            self._frame_pendiente += consumido
+
+    def _cerrar_chunk(self, fin_ms):
+        inicio_ms = fin_ms - self._bins_chunk
+        self._chunks.append((self._max_chunk, self._frame(fin_ms) - self._frame(inicio_ms)))
+        self._max_chunk = 0
+        self._bins_chunk = 0
+
+    def _registrar_silencio(self, inicio):
+        if self._prev_silencio is None:
+            self._inicio_rango = inicio
+            if self.primer_silencio_ms is None:
+                self.primer_silencio_ms = inicio
+        else:
+            continuo = inicio == self._prev_silencio + 1
+            hay_hueco = inicio > self._prev_silencio + self.min_silencio_ms
+            if not continuo and hay_hueco:
+                self._cerrar_rango_silencio()
+                self._inicio_rango = inicio
+        self._prev_silencio = inicio
+
+    def _cerrar_rango_silencio(self):
+        fin = self._prev_silencio + self.min_silencio_ms
+        self.cantidad_silencios += 1
+        self.duracion_silencios_ms += fin - self._inicio_rango
+
+    def finalizar(self):
+        """Cerrar el análisis y devolver las mismas medidas que el modo completo"""
+        from pydub.utils import ratio_to_db
+
+        duracion_ms = round(1000 * (float(self.frames_totales) / self.frame_rate))
+
+        # PyDub rellena con silencio los slices que pasan del final de los datos
+        faltantes = self._frame(duracion_ms) - self.frames_totales
+        if faltantes > 0:
+            self._pendiente.extend(bytes(faltantes * self.ancho_frame))
+        self._procesar_hasta(duracion_ms)
+        self._descartar_consumido()
+
+        if self._bins_chunk:
+            self._cerrar_chunk(self._bin_siguiente)
+        if self._prev_silencio is not None:
+            self._cerrar_rango_silencio()
+            self._prev_silencio = None
+
+        segmentos = [
+            ratio_to_db(maximo, self.max_amplitud_posible)
+            for maximo, frames in self._chunks
+            if round(1000 * (float(frames) / self.frame_rate)) > 1000
+        ]
+
+        return {
+            "duracion_total": duracion_ms / 1000,
+            "max_volumen": ratio_to_db(self.max_absoluto, self.max_amplitud_posible),
+            "segmentos": segmentos,
+            "cantidad_silencios": self.cantidad_silencios,
+            "duracion_silencios": self.duracion_silencios_ms / 1000
+        }
+
+
+class AnalizadorAudioNumpy(AnalizadorAudioIncremental):
+    """
+    Mismo análisis que AnalizadorAudioIncremental, vectorizado con NumPy:
+    RMS/pico por ms, ventanas de silencio y chunks se calculan por lotes sobre el PCM
+    """
+
+    def __init__(self, *args, **kwargs):
+        import numpy as np
+
+        super().__init__(*args, **kwargs)
+        self._np = np
+        self._dtype = {1: np.int8, 2: '<i2', 4: '<i4'}[self.ancho_muestra]
+        # Con 8 y 16 bits las sumas de cuadrados caben exactas en int64; con 32 bits un solo cuadrado
+        # llega a 2^62 y la suma desborda, así que se acumula en float64 (como audioop.rms)
+        self._tipo_suma = np.float64 if self.ancho_muestra == 4 else np.int64
+        # Últimos (min_silencio_ms - 1) bins: las ventanas que cruzan de un lote al siguiente
+        self._hist_cuadrados = np.zeros(0, dtype=self._tipo_suma)
+        self._hist_muestras = np.zeros(0, dtype=np.int64)
+
+    def _procesar_hasta(self, limite):
+        np = self._np
+        inicio = self._bin_siguiente
+        if limite <= inicio:
+            return
+
+        # Fronteras de cada bin de 1 ms, con la misma conversión que _frame()
+        fronteras = (np.arange(inicio, limite + 1, dtype=np.int64) * (self.frame_rate / 1000.0)).astype(np.int64)
+        locales = fronteras - fronteras[0]
+        desde = (fronteras[0] - self._frame_pendiente) * self.ancho_frame
+        hasta = (fronteras[-1] - self._frame_pendiente) * self.ancho_frame
+        muestras = np.frombuffer(bytes(self._pendiente[desde:hasta]), dtype=self._dtype)
+        muestras = muestras.astype(np.int64).reshape(-1, self.canales)
+
+        # Suma de cuadrados y pico absoluto por bin
+        valores = muestras.astype(self._tipo_suma)
+        acumulado = np.concatenate((np.zeros(1, dtype=self._tipo_suma), np.cumsum((valores * valores).sum(axis=1))))
+        cuadrados = acumulado[locales[1:]] - acumulado[locales[:-1]]
+        muestras_bin = np.diff(locales) * self.canales
+        picos_frame = np.abs(muestras).max(axis=1) if len(muestras) else np.zeros(1, dtype=np.int64)
+        indices = np.minimum(locales[:-1], len(picos_frame) - 1)
+        picos = np.where(muestras_bin > 0, np.maximum.reduceat(picos_frame, indices), 0)
+
+        self._procesar_chunks(inicio, picos)
+        self._procesar_ventanas(inicio, cuadrados, muestras_bin)
+        self._bin_siguiente = limite
+
+    def _procesar_chunks(self, inicio, picos):
+        pos = 0
+        while pos < len(picos):
+            tramo = min(len(picos) - pos, self.chunk_ms - self._bins_chunk)
+            self._max_chunk = max(self._max_chunk, int(picos[pos:pos + tramo].max()))
+            self._bins_chunk += tramo
+            pos += tramo
+            if self._bins_chunk == self.chunk_ms:
+                self._cerrar_chunk(inicio + pos)
+
+    def _procesar_ventanas(self, inicio, cuadrados, muestras_bin):
+        np = self._np
+        n = self.min_silencio_ms
+        todos_cuadrados = np.concatenate((self._hist_cuadrados, cuadrados))
+        todas_muestras = np.concatenate((self._hist_muestras, muestras_bin))
+        base = inicio - len(self._hist_cuadrados)
+        corte = max(0, len(todos_cuadrados) - (n - 1))
+        self._hist_cuadrados = todos_cuadrados[corte:]
+        self._hist_muestras = todas_muestras[corte:]
+        if len(todos_cuadrados) < n:
+            return
+
+        acum_cuadrados = np.concatenate((np.zeros(1, dtype=self._tipo_suma), np.cumsum(todos_cuadrados)))
+        acum_muestras = np.concatenate(([0], np.cumsum(todas_muestras)))
+        suma_ventana = (acum_cuadrados[n:] - acum_cuadrados[:-n]).astype(np.float64)
+        muestras_ventana = acum_muestras[n:] - acum_muestras[:-n]
+
+        # Igual que audioop.rms: raíz truncada a entero, 0 si la ventana está vacía
+        rms = np.zeros(len(suma_ventana))
+        np.sqrt(np.divide(suma_ventana, muestras_ventana, out=rms, where=muestras_ventana > 0), out=rms)
+        silencios = np.flatnonzero(np.trunc(rms) <= self.umbral_silencio) + base
+        if not len(silencios):
+            return
+
+        # Misma fusión de rangos que detect_silence, continuando el estado del lote anterior
+        if self._prev_silencio is None:
+            self._inicio_rango = int(silencios[0])
+            if self.primer_silencio_ms is None:
+                self.primer_silencio_ms = self._inicio_rango
+        elif silencios[0] > self._prev_silencio + n:
+            self._cerrar_rango_silencio()
+            self._inicio_rango = int(silencios[0])
+
+        cortes = np.flatnonzero(np.diff(silencios) > n)
+        if len(cortes):
+            inicios = np.concatenate(([self._inicio_rango], silencios[cortes + 1]))
+            finales = silencios[cortes] + n
+            self.cantidad_silencios += len(cortes)
+            self.duracion_silencios_ms += int((finales - inicios[:-1]).sum())
+            self._inicio_rango = int(inicios[-1])
+        self._prev_silencio = int(silencios[-1])
+
+
+ArchivoCurso = namedtuple("ArchivoCurso", ["ruta", "relativa", "modulo", "carpeta", "tipo", "tamaño", "mtime_ns"])
+
+
+class InventarioCurso:
+    """
+    Inventario de todos los archivos del curso, construido con UN solo recorrido del árbol.
+    Las etapas de la auditoría lo consultan en lugar de volver a listar o hacer stat en la carpeta
+    """
+
+    def __init__(self, ruta_base, archivos, carpetas, generado=None):
+        self.ruta_base = Path(ruta_base)
+        self.archivos = archivos
+        self.carpetas = set(carpetas)
+        self.generado = generado or datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self._por_ruta = {str(a.ruta): a for a in archivos}
+
+    # Carpetas conocidas por su nombre sin mayúsculas: "Videos" o "Material de estudio" también valen
+    CARPETAS_CANONICAS = {CARPETA_DOCUMENTOS.casefold(): CARPETA_DOCUMENTOS, CARPETA_VIDEOS.casefold(): CARPETA_VIDEOS}
+
+    @classmethod
+    def escanear(cls, ruta_base):
+        """
+        Recorrer MODULO N/MATERIAL DE ESTUDIO y MODULO N/VIDEOS una única vez.
+        Como en Windows (donde se sincroniza el curso), los nombres de carpeta no distinguen mayúsculas:
+        "Modulo 1/Videos" queda en el inventario como "MODULO 1/VIDEOS"
+        """
+        ruta_base = Path(ruta_base)
+        archivos = []
+        carpetas = []
+        
+        with os.scandir(ruta_base) as entradas:
+            modulos = [e for e in entradas if e.is_dir() and e.name.casefold().startswith("modulo ")]
+        
+        for entrada_modulo in sorted(modulos, key=lambda e: e.name):
+            modulo = "MODULO " + entrada_modulo.name[len("MODULO "):]
+            carpetas.append(modulo)
+            with os.scandir(entrada_modulo.path) as entradas:
+                subcarpetas = [e for e in entradas if e.is_dir()]
+            
+            for entrada_carpeta in sorted(subcarpetas, key=lambda e: e.name):
+                carpeta = cls.CARPETAS_CANONICAS.get(entrada_carpeta.name.casefold(), entrada_carpeta.name)
+                carpetas.append(f"{modulo}/{carpeta}")
+                with os.scandir(entrada_carpeta.path) as entradas:
+                    ficheros = [e for e in entradas if e.is_file()]
+                
+                for entrada in sorted(ficheros, key=lambda e: e.name):
+                    # En Windows scandir ya trae el stat del listado: no hay llamada extra por archivo
+                    st = entrada.stat()
+                    extension = os.path.splitext(entrada.name)[1].lower()
+                    if extension == ".docx":
+                        tipo = "documento"
+                    elif extension in EXTENSIONES_VIDEO:
+                        tipo = "video"
+                    else:
+                        tipo = "otro"
+                    
+                    archivos.append(ArchivoCurso(
+                        ruta=Path(entrada.path),
+                        relativa=f"{entrada_modulo.name}/{entrada_carpeta.name}/{entrada.name}",
+                        modulo=modulo,
+                        carpeta=carpeta,
+                        tipo=tipo,
+                        tamaño=st.st_size,
+                        mtime_ns=st.st_mtime_ns
+                    ))
+        
+        return cls(ruta_base, archivos, carpetas)
+
+    def existe_carpeta(self, modulo, carpeta=None):
+        return (f"{modulo}/{carpeta}" if carpeta else modulo) in self.carpetas
+
+    def filtrar(self, modulo=None, carpeta=None, tipo=None):
+        """Archivos del inventario, en orden de módulo, carpeta y nombre"""
+        return [a for a in self.archivos
+                if (modulo is None or a.modulo == modulo)
+                and (carpeta is None or a.carpeta == carpeta)
+                and (tipo is None or a.tipo == tipo)]
+
+    def documentos(self, modulo):
+        return self.filtrar(modulo, CARPETA_DOCUMENTOS, "documento")
+
+    def videos(self, modulo):
+        return self.filtrar(modulo, CARPETA_VIDEOS, "video")
+
+    def buscar(self, ruta):
+        return self._por_ruta.get(str(ruta))
+
+    def a_dict(self):
+        return {
+            "ruta_base": str(self.ruta_base),
+            "generado": self.generado,
+            "carpetas": sorted(self.carpetas),
+            "archivos": [
+                {"ruta": a.relativa, "modulo": a.modulo, "carpeta": a.carpeta, "tipo": a.tipo,
+                 "tamaño": a.tamaño, "mtime_ns": a.mtime_ns}
+                for a in self.archivos
+            ]
+        }
+
+    def exportar(self, ruta_json):
+        with open(ruta_json, 'w', encoding='utf-8') as f:
+            json.dump(self.a_dict(), f, ensure_ascii=False, indent=2)
+        return ruta_json
+
+    @classmethod
+    def cargar(cls, ruta_json):
+        """Leer un inventario exportado (para comparar ejecuciones)"""
+        with open(ruta_json, 'r', encoding='utf-8') as f:
+            datos = json.load(f)
+        ruta_base = Path(datos["ruta_base"])
+        archivos = [
+            ArchivoCurso(ruta=ruta_base / a["ruta"], relativa=a["ruta"], modulo=a["modulo"],
+                         carpeta=a["carpeta"], tipo=a["tipo"], tamaño=a["tamaño"], mtime_ns=a["mtime_ns"])
+            for a in datos["archivos"]
+        ]
+        return cls(ruta_base, archivos, datos["carpetas"], datos.get("generado"))
+
+    def comparar(self, anterior):
+        """Archivos nuevos, eliminados y modificados respecto de un inventario anterior"""
+        actuales = {a.relativa: a for a in self.archivos}
+        previos = {a.relativa: a for a in anterior.archivos}
+        return {
+            "nuevos": sorted(set(actuales) - set(previos)),
+            "eliminados": sorted(set(previos) - set(actuales)),
+            "modificados": sorted(
+                r for r in set(actuales) & set(previos)
+                if (actuales[r].tamaño, actuales[r].mtime_ns) != (previos[r].tamaño, previos[r].mtime_ns)
+            )
+        }
+
+
+class SondaContenedor:
+    """
+    Lectura de solo la cabecera del contenedor de un video (átomos MP4/MOV, chunks RIFF de AVI),
+    sin decodificar nada: duración, pistas con su códec, bitrate y si el índice está completo.
+    Lee unos pocos KB (más el átomo moov), así que un archivo dañado o sin audio se detecta en milisegundos
+    """
+
+    # Átomos MP4/MOV que contienen otros átomos (los que hace falta recorrer)
+    CONTENEDORES_MP4 = {b"moov", b"trak", b"mdia", b"minf", b"stbl", b"mvex"}
+    TIPOS_PISTA = {b"vide": "video", b"soun": "audio"}
+    TIPOS_AVI = {b"vids": "video", b"auds": "audio"}
+    CODECS_AUDIO_AVI = {0x0001: "pcm", 0x0003: "pcm_float", 0x0055: "mp3", 0x00FF: "aac", 0x1610: "aac", 0x2000: "ac3"}
+    MAX_MOOV = 64 * 1024 * 1024
+
+    def __init__(self, ruta):
+        self.ruta = ruta
+
+    def sondear(self):
+        """
+        Dict con formato, duracion (s), pistas [{tipo, codec}], bitrate_kbps, indice_intacto y problema
+        (texto o None). Si el formato no se reconoce, o el moov supera MAX_MOOV, devuelve None: el video se analiza como siempre
+        """
+        with open(self.ruta, 'rb') as f:
+            tamaño = os.fstat(f.fileno()).st_size
+            inicio = f.read(12)
+            f.seek(0)
+            if inicio[:4] == b"RIFF" and inicio[8:12] == b"AVI ":
+                info = self._sondear_avi(f, tamaño)
+            elif inicio[4:8] in (b"ftyp", b"moov", b"mdat", b"wide", b"free", b"skip"):
+                info = self._sondear_mp4(f, tamaño)
+            else:
+                return None
+        
+        if info is None:
+            return None
+        if info["duracion"]:
+            info["bitrate_kbps"] = round(tamaño * 8 / info["duracion"] / 1000)
+        if info["problema"] is None and not info["indice_intacto"]:
+            info["problema"] = "Índice del contenedor incompleto"
+        return info
+
+    @staticmethod
+    def _tamaño_legible(bytes_faltantes):
+        if bytes_faltantes >= 1024 * 1024:
+            return f"{bytes_faltantes / (1024 * 1024):.1f} MB"
+        return f"{bytes_faltantes / 1024:.1f} KB"
+
+    @staticmethod
+    def _info(formato):
+        return {"formato": formato, "duracion": None, "pistas": [], "bitrate_kbps": None,
+                "indice_intacto": False, "problema": None}
+
+    # ---------------------------------------------------------------- MP4 / MOV
+
+    def _sondear_mp4(self, f, tamaño):
+        info = self._info("mp4")
+        moov = None
+        moov_excedido = False
+        fragmentado = False
+        posicion = 0
+        while posicion + 8 <= tamaño:
+            f.seek(posicion)
+            cabecera = f.read(16)
+            largo, tipo = struct.unpack(">I4s", cabecera[:8])
+            cabecera_largo = 8
+            if largo == 1 and len(cabecera) == 16:
+                largo = struct.unpack(">Q", cabecera[8:16])[0]
+                cabecera_largo = 16
+            elif largo == 0:
+                largo = tamaño - posicion
+            if largo < cabecera_largo:
+                info["problema"] = f"Átomo '{tipo.decode('latin-1')}' inválido en el byte {posicion}"
+                return info
+            if posicion + largo > tamaño:
+                faltan = self._tamaño_legible(posicion + largo - tamaño)
+                info["problema"] = f"Archivo truncado (al átomo '{tipo.decode('latin-1')}' le faltan {faltan})"
+                break
+            
+            if tipo == b"ftyp" and cabecera[8:12] == b"qt  ":
+                info["formato"] = "mov"
+            elif tipo == b"moov":
+                if largo - cabecera_largo <= self.MAX_MOOV:
+                    f.seek(posicion + cabecera_largo)
+                    moov = f.read(largo - cabecera_largo)
+                else:
+                    moov_excedido = True
+            elif tipo == b"moof":
+                fragmentado = True
+            posicion += largo
+        
+        if moov is None and moov_excedido and info["problema"] is None:
+            # El índice existe pero es demasiado grande para leerlo aquí: no se sabe, no es un daño
+            return None
+        if moov is None:
+            info["problema"] = info["problema"] or "Contenedor sin índice (falta el átomo moov)"
+            return info
+        
+        estado = {"duracion": None, "fragmentado": False, "pistas": []}
+        self._leer_mp4(memoryview(moov), estado)
+        pistas = estado["pistas"]
+        info["duracion"] = estado["duracion"] or max((p["duracion"] or 0 for p in pistas), default=0) or None
+        info["pistas"] = [{"tipo": p["tipo"], "codec": p["codec"]} for p in pistas]
+        
+        if estado["fragmentado"]:
+            # MP4 fragmentado: cada moof trae el índice de sus muestras
+            info["indice_intacto"] = fragmentado
+        elif any(p["ultimo_chunk"] is not None and p["ultimo_chunk"] >= tamaño for p in pistas):
+            info["problema"] = info["problema"] or "Archivo truncado (el índice apunta más allá del final)"
+        else:
+            info["indice_intacto"] = bool(pistas) and all(p["muestras"] > 0 and p["ultimo_chunk"] is not None for p in pistas)
+        return info
+
+    def _leer_mp4(self, datos, estado, pista=None):
+        """Recorrer los átomos de datos anotando en estado la duración, las pistas y si hay mvex"""
+        posicion = 0
+        while posicion + 8 <= len(datos):
+            largo, tipo = struct.unpack_from(">I4s", datos, posicion)
+            cabecera_largo = 8
+            if largo == 1 and posicion + 16 <= len(datos):
+                largo = struct.unpack_from(">Q", datos, posicion + 8)[0]
+                cabecera_largo = 16
+            elif largo == 0:
+                largo = len(datos) - posicion
+            if largo < cabecera_largo or posicion + largo > len(datos):
+                break
+            cuerpo = datos[posicion + cabecera_largo:posicion + largo]
+            
+            if tipo == b"trak":
+                nueva = {"tipo": "otro", "codec": None, "duracion": None, "muestras": 0, "ultimo_chunk": None}
+                self._leer_mp4(cuerpo, estado, nueva)
+                estado["pistas"].append(nueva)
+            elif tipo in self.CONTENEDORES_MP4:
+                if tipo == b"mvex":
+                    estado["fragmentado"] = True
+                self._leer_mp4(cuerpo, estado, pista)
+            elif tipo in (b"mvhd", b"mdhd") and len(cuerpo) >= 24:
+                if cuerpo[0] == 1:
+                    escala, valor = struct.unpack_from(">IQ", cuerpo, 20)
+                else:
+                    escala, valor = struct.unpack_from(">II", cuerpo, 12)
+                segundos = valor / escala if escala else None
+                if tipo == b"mvhd":
+                    estado["duracion"] = segundos
+                elif pista is not None:
+                    pista["duracion"] = segundos
+            elif pista is not None and tipo == b"hdlr" and len(cuerpo) >= 12:
+                # En MOV también hay un hdlr de datos ('alis', 'url ') dentro de minf: no pisa el de medios
+                pista["tipo"] = self.TIPOS_PISTA.get(bytes(cuerpo[8:12]), pista["tipo"])
+            elif pista is not None and tipo == b"stsd" and len(cuerpo) >= 16:
+                pista["codec"] = bytes(cuerpo[12:16]).decode('latin-1').strip()
+            elif pista is not None and tipo in (b"stsz", b"stz2") and len(cuerpo) >= 12:
+                pista["muestras"] = struct.unpack_from(">I", cuerpo, 8)[0]
+            elif pista is not None and tipo in (b"stco", b"co64") and len(cuerpo) >= 8:
+                entradas = struct.unpack_from(">I", cuerpo, 4)[0]
+                ancho = 4 if tipo == b"stco" else 8
+                if entradas and len(cuerpo) >= 8 + entradas * ancho:
+                    formato = ">I" if ancho == 4 else ">Q"
+                    pista["ultimo_chunk"] = struct.unpack_from(formato, cuerpo, 8 + (entradas - 1) * ancho)[0]
+            posicion += largo
+
+    # ---------------------------------------------------------------- AVI
+
+    def _sondear_avi(self, f, tamaño):
+        info = self._info("avi")
+        f.seek(4)
+        riff_largo = struct.unpack("<I", f.read(4))[0]
+        if riff_largo + 8 > tamaño:
+            faltan = self._tamaño_legible(riff_largo + 8 - tamaño)
+            info["problema"] = f"Archivo truncado (a la lista RIFF le faltan {faltan})"
+        
+        microsegundos_por_cuadro = cuadros = 0
+        tiene_indice = False
+        posicion = 12
+        fin = min(tamaño, riff_largo + 8)
+        while posicion + 8 <= fin:
+            f.seek(posicion)
+            identificador, largo = struct.unpack("<4sI", f.read(8))
+            if identificador == b"LIST":
+                if largo < 4:
+                    info["problema"] = f"Lista 'LIST' inválida en el byte {posicion}"
+                    break
+                tipo_lista = f.read(4)
+                if tipo_lista == b"hdrl":
+                    datos = memoryview(f.read(max(0, min(largo - 4, self.MAX_MOOV))))
+                    microsegundos_por_cuadro, cuadros, tiene_indice_odml = self._leer_hdrl(datos, info)
+                    tiene_indice = tiene_indice or tiene_indice_odml
+            elif identificador == b"idx1" and largo > 0:
+                tiene_indice = True
+            posicion += 8 + largo + (largo & 1)
+        
+        if info["duracion"] is None and microsegundos_por_cuadro and cuadros:
+            info["duracion"] = microsegundos_por_cuadro * cuadros / 1_000_000
+        info["indice_intacto"] = tiene_indice and info["problema"] is None
+        return info
+
+    def _leer_hdrl(self, datos, info):
+        """Cabecera principal y de cada stream; devuelve (µs por cuadro, cuadros, hay índice OpenDML)"""
+        microsegundos_por_cuadro = cuadros = 0
+        indice_odml = False
+        pista = None
+        posicion = 0
+        while posicion + 8 <= len(datos):
+            identificador, largo = struct.unpack_from("<4sI", datos, posicion)
+            cuerpo = datos[posicion + 8:posicion + 8 + largo]
+            if identificador == b"avih" and len(cuerpo) >= 20:
+                microsegundos_por_cuadro = struct.unpack_from("<I", cuerpo, 0)[0]
+                cuadros = struct.unpack_from("<I", cuerpo, 16)[0]
+            elif identificador == b"LIST" and bytes(cuerpo[:4]) == b"strl":
+                # Los chunks del stream van dentro de la lista: se sigue recorriendo desde ahí
+                posicion += 12
+                continue
+            elif identificador == b"strh" and len(cuerpo) >= 36:
+                tipo = self.TIPOS_AVI.get(bytes(cuerpo[:4]), "otro")
+                pista = {"tipo": tipo, "codec": bytes(cuerpo[4:8]).decode('latin-1').strip("\0 ") or None}
+                info["pistas"].append(pista)
+                escala, tasa, _, longitud = struct.unpack_from("<IIII", cuerpo, 20)
+                if tipo == "video" and tasa and longitud and info["duracion"] is None:
+                    info["duracion"] = longitud * escala / tasa
+            elif identificador == b"strf" and pista is not None and pista["tipo"] == "audio" and len(cuerpo) >= 2:
+                formato = struct.unpack_from("<H", cuerpo, 0)[0]
+                pista["codec"] = self.CODECS_AUDIO_AVI.get(formato, f"0x{formato:04x}")
+            elif identificador == b"indx":
+                indice_odml = True
+            posicion += 8 + largo + (largo & 1)
+        return microsegundos_por_cuadro, cuadros, indice_odml
+
+
+class ServidorLanguageTool:
+    """
+    Servidor HTTP de LanguageTool de larga duración, compartido entre auditorías.
+    Si no está escuchando en el puerto se arranca desacoplado del proceso actual,
+    así la JVM y las reglas en español quedan calientes para las siguientes ejecuciones
+    """
+
+    def __init__(self, host="127.0.0.1", puerto=8081, ruta_jar=None, timeout_arranque=90):
+        self.host = host
+        self.puerto = int(puerto)
+        self.ruta_jar = ruta_jar
+        self.timeout_arranque = timeout_arranque
+        self.ruta_lock = Path(tempfile.gettempdir()) / f"auditor_okr_languagetool_{self.puerto}.lock"
+
+    @classmethod
+    def desde_direccion(cls, direccion):
+        """Aceptar "PUERTO", "HOST:PUERTO" o "http://HOST:PUERTO" """
+        direccion = str(direccion).replace("http://", "").rstrip("/")
+        if ":" in direccion:
+            host, puerto = direccion.rsplit(":", 1)
+            return cls(host or "127.0.0.1", puerto)
+        return cls(puerto=direccion)
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.puerto}"
+
+    def esta_vivo(self):
+        """Health check: el servidor responde a /v2/languages"""
+        try:
+            with urllib.request.urlopen(f"{self.url}/v2/languages", timeout=3) as respuesta:
+                return respuesta.status == 200
+        except Exception:
+            return False
+
+    def _comando(self):
+        from language_tool_python import utils as lt_utils
+        
+        ruta_jar = self.ruta_jar
+        if not ruta_jar:
+            try:
+                # Descarga LanguageTool la primera vez, igual que LanguageTool('es')
+                from language_tool_python.download_lt import download_lt
+                download_lt()
+            except Exception:
+                pass
+            ruta_jar = Path(lt_utils.get_language_tool_directory()) / "languagetool-server.jar"
+        
+        java = shutil.which("java") or "java"
+        return [java, "-cp", str(ruta_jar), "org.languagetool.server.HTTPServer", "--port", str(self.puerto)]
+
+    def es_local(self):
+        """Solo un servidor en esta máquina se puede arrancar; uno remoto caído es un error"""
+        return self.host in ("127.0.0.1", "localhost", "::1") or self.host.startswith("127.")
+
+    def asegurar(self):
+        """Dejar el servidor escuchando: reutilizarlo si ya vive o arrancarlo (una sola vez entre procesos)"""
+        if self.esta_vivo():
+            return True
+        if not self.es_local():
+            raise RuntimeError(f"El servidor LanguageTool remoto {self.url} no responde")
+        
+        # Lock entre procesos: si varios auditores arrancan a la vez, solo uno lanza la JVM
+        if self.ruta_lock.exists() and time.time() - self.ruta_lock.stat().st_mtime > self.timeout_arranque:
+            self.ruta_lock.unlink(missing_ok=True)
+        try:
+            descriptor = os.open(self.ruta_lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            print(f"⏳ Otro auditor está arrancando LanguageTool en {self.url}, esperando...")
+            return self._esperar()
+        
+        try:
+            os.write(descriptor, str(os.getpid()).encode())
+            os.close(descriptor)
+            print(f"🚀 Arrancando servidor LanguageTool en {self.url}...")
+            opciones = {"stdout": subprocess.DEVNULL, "stderr": subprocess.DEVNULL, "stdin": subprocess.DEVNULL}
+            if os.name == "nt":
+                opciones["creationflags"] = subprocess.CREATE_NEW_PROCESS_GROUP | subprocess.DETACHED_PROCESS
+            else:
+                opciones["start_new_session"] = True
+            subprocess.Popen(self._comando(), **opciones)
+            return self._esperar()
+        finally:
+            self.ruta_lock.unlink(missing_ok=True)
+
+    def _esperar(self):
+        limite = time.time() + self.timeout_arranque
+        while time.time() < limite:
+            if self.esta_vivo():
+                return True
+            time.sleep(1)
+        raise RuntimeError(f"El servidor LanguageTool no respondió en {self.url} tras {self.timeout_arranque}s")
+
+
+class CorrectorSupervisado:
+    """
+    Cliente de un ServidorLanguageTool con la misma interfaz check() que LanguageTool.
+    Si el servidor muere a mitad de la auditoría, lo reinicia y reintenta la consulta
+    """
+
+    def __init__(self, servidor, idioma='es', reintentos=2):
+        self.servidor = servidor
+        self.idioma = idioma
+        self.reintentos = reintentos
+        self._cliente = None
+        self._conectar()
+
+    def _conectar(self):
+        self.servidor.asegurar()
+        self._cliente = language_tool_python.LanguageTool(self.idioma, remote_server=self.servidor.url)
+
+    def check(self, texto):
+        for intento in range(self.reintentos + 1):
+            try:
+                return self._cliente.check(texto)
+            except Exception as e:
+                if intento == self.reintentos or self.servidor.esta_vivo():
+                    raise
+                print(f"⚠️ Servidor LanguageTool caído ({e}), reiniciando...")
+                self._conectar()
+
+    def close(self):
+        # El servidor es compartido: solo se cierra el cliente
+        if self._cliente is not None:
+            self._cliente.close()
+
+
+LEXICO_VERSION = 1
+
+
+def carpeta_cache_usuario():
+    """Caché del usuario para artefactos generados (el script puede estar instalado en solo lectura)"""
+    if os.name == "nt":
+        base = os.environ.get("LOCALAPPDATA") or Path.home() / "AppData" / "Local"
+    elif sys.platform == "darwin":
+        base = Path.home() / "Library" / "Caches"
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "auditor_okr"
+
+
+RUTA_LEXICO_INGLES = carpeta_cache_usuario() / f"lexico_ingles_v{LEXICO_VERSION}.lex"
+
+
+def huella_corpus_ingles():
+    """Huella del corpus NLTK words (tamaño y fecha de sus archivos, sin leerlo); None si no está instalado"""
+    try:
+        partes = []
+        for archivo in words.fileids():
+            puntero = words.abspath(archivo)
+            ruta = puntero.zipfile.filename if hasattr(puntero, "zipfile") else puntero.path
+            st = os.stat(ruta)
+            partes.append(f"{archivo}:{st.st_size}:{st.st_mtime_ns}")
+    except (LookupError, OSError, AttributeError):
+        return None
+    return hashlib.sha256("|".join(partes).encode('utf-8')).hexdigest()[:16]
+
+
+def abrir_lexico_ingles():
+    """Lexicón inglés del filtro de falsos positivos, regenerado si el corpus NLTK cambió"""
+    return LexicoCompacto.abrir_o_generar(RUTA_LEXICO_INGLES, words.words, huella_corpus_ingles())
+
+
+class LexicoCompacto:
+    """
+    Lexicón de solo lectura precompilado: palabras ordenadas por bytes, una por línea,
+    en un archivo mapeado en memoria. La pertenencia se resuelve por búsqueda binaria,
+    sin construir un set de Python al arrancar. La cabecera guarda la huella del corpus del que salió
+    """
+
+    CABECERA = b"LEXICO-OKR"
+
+    def __init__(self, ruta):
+        self.ruta = Path(ruta)
+        with open(self.ruta, 'rb') as f:
+            cabecera = f.readline()
+        partes = cabecera.rstrip(b"\n").split(b"\t")
+        if len(partes) < 3 or partes[0] != self.CABECERA or int(partes[1]) != LEXICO_VERSION:
+            raise ValueError(f"Lexicón con formato o versión incompatible: {self.ruta}")
+        self.cantidad = int(partes[2])
+        self.huella = partes[3].decode('ascii') if len(partes) > 3 and partes[3] != b"-" else None
+        self._inicio = len(cabecera)
+        self._archivo = None
+        self._mapa = None
+
+    @classmethod
+    def generar(cls, ruta, palabras, huella=None):
+        """Escribir el artefacto (una sola vez) a partir de cualquier iterable de palabras"""
+        claves = sorted({p.lower().encode('utf-8') for p in palabras if p and "\n" not in p})
+        Path(ruta).parent.mkdir(parents=True, exist_ok=True)
+        temporal = Path(ruta).with_name(Path(ruta).name + ".tmp")
+        with open(temporal, 'wb') as f:
+            f.write(b"\t".join([cls.CABECERA, str(LEXICO_VERSION).encode(), str(len(claves)).encode(),
+                                (huella or "-").encode('ascii')]) + b"\n")
+            f.write(b"\n".join(claves))
+        os.replace(temporal, ruta)
+        return cls(ruta)
+
+    @classmethod
+    def abrir_o_generar(cls, ruta, obtener_palabras, huella=None):
+        """
+        Abrir el lexicón precompilado; si falta, es de otra versión o de otro corpus (huella), generarlo con
+        obtener_palabras(). Si no se puede escribir, las palabras quedan en un frozenset en memoria
+        """
+        try:
+            lexico = cls(ruta)
+            if huella is None or lexico.huella == huella:
+                return lexico
+        except (OSError, ValueError):
+            pass
+        print(f"🔧 Generando lexicón compacto (una sola vez): {ruta}")
+        palabras = obtener_palabras()
+        try:
+            return cls.generar(ruta, palabras, huella)
+        except OSError as e:
+            print(f"⚠️ No se pudo guardar el lexicón ({e}), se usa en memoria")
+            return frozenset(p.lower() for p in palabras if p)
+
+    def _mapear(self):
+        self._archivo = open(self.ruta, 'rb')
+        self._mapa = mmap.mmap(self._archivo.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __contains__(self, palabra):
+        try:
+            clave = palabra.encode('utf-8')
+        except (AttributeError, UnicodeEncodeError):
+            return False
+        if self._mapa is None:
+            if self.cantidad == 0:
+                return False
+            self._mapear()
+        
+        mapa = self._mapa
+        bajo, alto = self._inicio, len(mapa)
+        while bajo < alto:
+            medio = (bajo + alto) // 2
+            salto = mapa.rfind(b"\n", bajo, medio)
+            inicio = bajo if salto < 0 else salto + 1
+            fin = mapa.find(b"\n", inicio)
+            if fin < 0:
+                fin = len(mapa)
+            linea = mapa[inicio:fin]
+            if linea == clave:
+                return True
+            if linea < clave:
+                bajo = fin + 1
+            else:
+                alto = inicio
+        return False
+
+    def __len__(self):
+        return self.cantidad
+
+    def __bool__(self):
+        return self.cantidad > 0
+
+    def close(self):
+        if self._mapa is not None:
+            self._mapa.close()
+            self._archivo.close()
+            self._mapa = None
+
+
+class FiltroFalsosPositivos:
+    """
+    Filtro de falsos positivos de LanguageTool, compilado una vez por auditor.
+    Mismas reglas que el filtro original, pero con patrones precompilados, búsquedas
+    en frozenset y los descartes ordenados del más barato al más costoso
+    """
+
+    # Errores tipográficos evidentes: SIEMPRE se muestran
+    ERRORES_TIPOGRAFICOS = frozenset({
+        'herrmientas',     # herramientas mal escrito
+        'anlaisis',        # análisis mal escrito
+        'implementacion',  # implementación sin tilde
+        'organizacion',    # organización sin tilde
+        'evaluacion',      # evaluación sin tilde
+        'administracion',  # administración sin tilde
+        'informacion',     # información sin tilde
+        'solucion',        # solución sin tilde
+        'direccion',       # dirección sin tilde
+        'gestion',         # gestión sin tilde
+        'comunicacion',    # comunicación sin tilde
+        'documentacion',   # documentación sin tilde
+        'planificacion',   # planificación sin tilde
+        'capacitacion',    # capacitación sin tilde
+    })
+
+    # Errores realmente evidentes en el contexto
+    ERRORES_EN_CONTEXTO = (
+        'este cursos', 'esta cursos', 'estos curso', 'estas curso',
+        'la la práctica', 'el el sistema', 'malentendidos mejora'
+    )
+
+    # Palabras comunes: solo se mantienen si hay un problema de puntuación claro
+    PALABRAS_COMUNES_VALIDAS = frozenset({
+        'pero', 'sino', 'tanto', 'adicionalmente', 'estimada',
+        'objetivo', 'proyecto', 'mejora', 'logro', 'valida'
+    })
+    PUNTUACION_COMUNES = (' pero ', ' sino ', ' tanto ')
+
+    FRAGMENTOS_URL = ('http', 'www', '@', '.com', '.org')
+
+    PATRON_NUMERO_PURO = re.compile(r'^[\d\.\-\+\(\)\s:]+$')
+    PATRON_REFERENCIAS = re.compile(r'\d+\.\d+\s+\d+\.\d+')
+    PATRON_TITULOS = re.compile(r'^[A-ZÁÉÍÓÚ][a-záéíóú]+\s+[A-ZÁÉÍÓÚ][a-záéíóú]+')
+
+    def __init__(self, palabras_validas, lexico_ingles=None):
+        # Referencia (no copia): las ampliaciones posteriores del set siguen aplicando
+        self.palabras_validas = palabras_validas
+        self.lexico_ingles = lexico_ingles if lexico_ingles else None
+
+    def es_error_real(self, palabra_limpia, contexto):
+        """Decidir si un hallazgo es un error real a partir de la palabra limpia y su contexto"""
+        # Si es un error tipográfico claro, SIEMPRE mostrarlo
+        if palabra_limpia in self.ERRORES_TIPOGRAFICOS:
+            print(f"        ✅ ERROR TIPOGRÁFICO DETECTADO: '{palabra_limpia}'")
+            return True
+        
+        # Descartes sobre la palabra (baratos): longitud, nombres propios, números, códigos y URLs
+        largo = len(palabra_limpia)
+        if largo < 3 or largo > 25:
+            return False
+        if largo > 3 and palabra_limpia[0].isupper():
+            return False
+        if self.PATRON_NUMERO_PURO.match(palabra_limpia):
+            return False
+        if largo < 8 and any(char.isdigit() for char in palabra_limpia):
+            return False
+        if any(x in palabra_limpia for x in self.FRAGMENTOS_URL):
+            return False
+        
+        # Listas de palabras: términos protegidos (set) y lexicón inglés (búsqueda binaria)
+        if palabra_limpia in self.palabras_validas:
+            return False
+        if self.lexico_ingles is not None and palabra_limpia in self.lexico_ingles:
+            return False
+        
+        # Descartes sobre el contexto (los más costosos)
+        contexto = contexto.lower()
+        if self.PATRON_REFERENCIAS.search(contexto):
+            return False
+        if self.PATRON_TITULOS.search(contexto.strip()):
+            return False
+        
+        # SOLO MANTENER errores realmente evidentes
+        if any(real in contexto for real in self.ERRORES_EN_CONTEXTO):
+            return True
+        
+        # Para otros casos, ser muy conservador con palabras comunes
+        if palabra_limpia in self.PALABRAS_COMUNES_VALIDAS:
+            return any(punct in contexto for punct in self.PUNTUACION_COMUNES)
+        
+        # Si llegó aquí, probablemente es un error real
+        return True
+
+    def filtrar(self, candidatos):
+        """Filtrar en lote una lista de (palabra_limpia, contexto); devuelve los índices de errores reales"""
+        es_error_real = self.es_error_real
+        return [i for i, (palabra, contexto) in enumerate(candidatos) if es_error_real(palabra, contexto)]
+
+
+NS_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+NS_R = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+NS_MC = "{http://schemas.openxmlformats.org/markup-compatibility/2006}"
+NS_RELACIONES = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+
+class LectorDocx:
+    """
+    Texto de un .docx leído en streaming directamente del zip, sin armar el modelo de python-docx.
+    document.xml y las partes relacionadas se recorren con iterparse y cada elemento se descarta
+    al cerrarse: en memoria solo queda el texto de los párrafos
+    """
+
+    # Texto de un run, igual que python-docx (los saltos de página y columna no aportan texto)
+    TABULACIONES = {NS_W + "tab", NS_W + "ptab"}
+    # Contenido que el alumno no ve: el respaldo VML repetido de los cuadros de texto y el texto movido
+    OMITIDOS = {NS_MC + "Fallback", NS_W + "moveFrom"}
+    NOTAS_SEPARADOR = {"separator", "continuationSeparator", "continuationNotice"}
+
+    def __init__(self, ruta):
+        self.ruta = ruta
+
+    def parrafos(self, completo=False):
+        """
+        (texto, origen) de cada párrafo. Siempre el cuerpo del documento, en orden. Con completo=True
+        además, a continuación: celdas de tablas, encabezados y pies de cada sección, cuadros de
+        texto, encabezados y pies de primera página y de páginas pares, notas al pie y notas al final
+        """
+        with zipfile.ZipFile(self.ruta) as paquete:
+            secciones = []
+            tablas = []
+            cuadros = []
+            numero = 0
+            with paquete.open("word/document.xml") as flujo:
+                for texto, lugar in self._recorrer(flujo, secciones):
+                    if lugar[0] == "cuerpo":
+                        numero += 1
+                        yield texto, f"Párrafo {numero}"
+                    elif not completo:
+                        continue
+                    elif lugar[0] == "tabla":
+                        tablas.append((texto, f"Tabla {lugar[1]}, fila {lugar[2]}, columna {lugar[3]}"))
+                    else:
+                        cuadros.append((texto, f"Cuadro de texto junto al párrafo {numero + 1}"))
+            if not completo:
+                return
+            
+            yield from tablas
+            relaciones = self._relaciones(paquete, "word/_rels/document.xml.rels")
+            otros = []
+            for n, referencias in enumerate(secciones, 1):
+                for tipo, nombre in (("default", None), ("first", "de primera página"), ("even", "de páginas pares")):
+                    for parte, titulo in (("header", "Encabezado"), ("footer", "Pie de página")):
+                        objetivo = relaciones.get(referencias.get((parte, tipo)))
+                        if objetivo is None:
+                            continue  # Vinculado a la sección anterior
+                        origen = f"{titulo} {nombre} (sección {n})" if nombre else f"{titulo} (sección {n})"
+                        parrafos = ((texto, origen) for texto, _ in self._leer_parte(paquete, objetivo))
+                        if tipo == "default":
+                            yield from parrafos
+                        else:
+                            otros.extend(parrafos)
+            yield from cuadros
+            yield from otros
+            for nombre_parte, titulo in (("word/footnotes.xml", "Nota al pie"), ("word/endnotes.xml", "Nota al final")):
+                for texto, lugar in self._leer_parte(paquete, nombre_parte):
+                    if lugar[0] == "nota":
+                        yield texto, f"{titulo} {lugar[1]}"
+
+    def _leer_parte(self, paquete, nombre_parte):
+        try:
+            flujo = paquete.open(nombre_parte)
+        except KeyError:
+            return
+        with flujo:
+            yield from self._recorrer(flujo)
+
+    @staticmethod
+    def _relaciones(paquete, nombre_parte):
+        """Id de relación -> nombre de la parte dentro del zip"""
+        try:
+            with paquete.open(nombre_parte) as flujo:
+                raiz = ET.parse(flujo).getroot()
+        except KeyError:
+            return {}
+        carpeta = nombre_parte.split("_rels/")[0]
+        return {r.get("Id"): r.get("Target").lstrip("/") if r.get("Target").startswith("/") else carpeta + r.get("Target")
+                for r in raiz.iter(NS_RELACIONES + "Relationship")}
+
+    def _recorrer(self, flujo, secciones=None):
+        """
+        Párrafos de una parte XML en orden de documento, como (texto, lugar): ("cuerpo",),
+        ("tabla", tabla, fila, columna), ("cuadro",) o ("nota", id). Las celdas combinadas
+        se entregan una sola vez, en su primera columna, como las deduplica python-docx
+        """
+        W = NS_W
+        pila = []       # Elementos abiertos: cada uno se quita de su padre al cerrarse
+        textos = []     # Texto de los párrafos abiertos (un cuadro de texto anida párrafos)
+        tablas = []     # [número, fila, última columna ocupada] de cada tabla abierta
+        celdas = []     # [columna, celdas que abarca, continuación vertical] de cada celda abierta
+        referencias = {}
+        nota = None
+        numero_tabla = 0
+        runs = cuadros = omitidos = 0
+        
+        for evento, elem in ET.iterparse(flujo, events=("start", "end")):
+            etiqueta = elem.tag
+            if evento == "start":
+                pila.append(elem)
+                if omitidos or etiqueta in self.OMITIDOS:
+                    omitidos += 1
+                elif etiqueta == W + "p":
+                    textos.append([])
+                elif etiqueta == W + "r":
+                    runs += 1
+                elif etiqueta == W + "tbl":
+                    if not tablas:
+                        numero_tabla += 1
+                    tablas.append([numero_tabla, 0, 0])
+                elif etiqueta == W + "tr":
+                    tablas[-1][1] += 1
+                    tablas[-1][2] = 0
+                elif etiqueta == W + "tc":
+                    celdas.append([tablas[-1][2] + 1, 1, False])
+                elif etiqueta == W + "txbxContent":
+                    cuadros += 1
+                elif etiqueta in (W + "footnote", W + "endnote"):
+                    nota = None if elem.get(W + "type") in self.NOTAS_SEPARADOR else elem.get(W + "id")
+                continue
+            
+            pila.pop()
+            if pila:
+                pila[-1].remove(elem)
+            if omitidos:
+                omitidos -= 1
+                continue
+            
+            if runs and etiqueta == W + "t":
+                textos[-1].append(elem.text or "")
+            elif runs and etiqueta in self.TABULACIONES:
+                textos[-1].append("\t")
+            elif runs and etiqueta == W + "br":
+                if elem.get(W + "type", "textWrapping") == "textWrapping":
+                    textos[-1].append("\n")
+            elif runs and etiqueta == W + "cr":
+                textos[-1].append("\n")
+            elif runs and etiqueta == W + "noBreakHyphen":
+                textos[-1].append("-")
+            elif etiqueta == W + "r":
+                runs -= 1
+            elif etiqueta == W + "p":
+                texto = "".join(textos.pop())
+                if cuadros:
+                    yield texto, ("cuadro",)
+                elif celdas:
+                    if not any(celda[2] for celda in celdas):
+                        yield texto, ("tabla", tablas[0][0], tablas[0][1], celdas[0][0])
+                elif nota is not None:
+                    yield texto, ("nota", nota)
+                else:
+                    yield texto, ("cuerpo",)
+            elif etiqueta == W + "gridSpan" and celdas:
+                celdas[-1][1] = int(elem.get(W + "val", 1))
+            elif etiqueta == W + "vMerge" and celdas:
+                celdas[-1][2] = elem.get(W + "val") != "restart"
+            elif etiqueta == W + "tc":
+                columna, abarca, _ = celdas.pop()
+                tablas[-1][2] = columna + abarca - 1
+            elif etiqueta == W + "tbl":
+                tablas.pop()
+            elif etiqueta == W + "txbxContent":
+                cuadros -= 1
+            elif etiqueta in (W + "footnote", W + "endnote"):
+                nota = None
+            elif etiqueta in (W + "headerReference", W + "footerReference"):
+                parte = "header" if etiqueta == W + "headerReference" else "footer"
+                referencias[(parte, elem.get(W + "type", "default"))] = elem.get(NS_R + "id")
+            elif etiqueta == W + "sectPr" and secciones is not None:
+                secciones.append(referencias)
+                referencias = {}
+
+
+class IndiceParrafos:
+    """
+    Texto completo de un documento armado una sola vez, con el desplazamiento inicial de cada
+    párrafo (y su origen: cuerpo, celda de tabla, encabezado o pie) para ubicar cada error
+    de LanguageTool por búsqueda binaria
+    """
+
+    def __init__(self):
+        self.partes = []
+        self.inicios = []
+        self.origenes = []
+        self.largo = 0
+        self._texto = None
+
+    @classmethod
+    def desde_docx(cls, ruta, incluir_tablas_y_encabezados=False):
+        indice = cls()
+        for texto, origen in LectorDocx(ruta).parrafos(incluir_tablas_y_encabezados):
+            indice.agregar(texto, origen)
+        return indice
+
+    def agregar(self, texto, origen):
+        self.inicios.append(self.largo)
+        self.origenes.append(origen)
+        self.partes.append(texto + "\n")
+        self.largo += len(texto) + 1
+        self._texto = None
+
+    @property
+    def texto(self):
+        if self._texto is None:
+            self._texto = "".join(self.partes)
+        return self._texto
+
+    def ubicar(self, offset):
+        """(número de párrafo desde 1, origen, posición dentro del párrafo desde 1) de un desplazamiento del texto"""
+        i = bisect_right(self.inicios, offset) - 1
+        if i < 0:
+            return None
+        return i + 1, self.origenes[i], offset - self.inicios[i] + 1
+
+
+CACHE_VERSION = 4
+
+
+class CacheAuditoria:
+    """
+    Caché persistente de resultados por archivo, direccionada por contenido.
+    Cada archivo se identifica por ruta, tamaño, mtime y SHA-256; si ruta, tamaño y mtime
+    no cambiaron se reutiliza el hash guardado sin volver a leer el archivo
+    """
+
+    def __init__(self, ruta_cache, firma_config):
+        self.ruta_cache = Path(ruta_cache)
+        self.firma_config = firma_config
+        self.huellas = {}
+        self.resultados = {}
+        self.aciertos = 0
+        self.fallos = 0
+        # Las etapas concurrentes consultan la caché desde varios hilos
+        self._lock = threading.Lock()
+        self._cargar()
+
+    def _cargar(self):
+        if not self.ruta_cache.exists():
+            return
+        try:
+            with open(self.ruta_cache, 'r', encoding='utf-8') as f:
+                datos = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Caché ilegible, se reconstruirá: {e}")
+            return
+        
+        if datos.get("version") != CACHE_VERSION:
+            return
+        self.huellas = datos.get("huellas", {})
+        # Si cambió la configuración (palabras válidas, etc.) los resultados ya no sirven
+        if datos.get("firma_config") == self.firma_config:
+            self.resultados = datos.get("resultados", {})
+
+    def huella(self, ruta, tamaño=None, mtime_ns=None):
+        """SHA-256 del contenido; solo se recalcula si cambió el tamaño o el mtime"""
+        if tamaño is None or mtime_ns is None:
+            st = os.stat(ruta)
+            tamaño, mtime_ns = st.st_size, st.st_mtime_ns
+        clave = str(Path(ruta).resolve())
+        with self._lock:
+            previa = self.huellas.get(clave)
+        if previa and previa["tamaño"] == tamaño and previa["mtime_ns"] == mtime_ns:
+            return previa["sha256"]
+        
+        # El hash se calcula fuera del lock: los demás hilos siguen con sus archivos
+        sha = hashlib.sha256()
+        with open(ruta, 'rb') as f:
+            for bloque in iter(lambda: f.read(1024 * 1024), b""):
+                sha.update(bloque)
+        
+        with self._lock:
+            self.huellas[clave] = {
+                "tamaño": tamaño,
+                "mtime_ns": mtime_ns,
+                "sha256": sha.hexdigest()
+            }
+        return sha.hexdigest()
+
+    def obtener(self, tipo, ruta, tamaño=None, mtime_ns=None):
+        clave = f"{tipo}:{self.huella(ruta, tamaño, mtime_ns)}"
+        with self._lock:
+            resultado = self.resultados.get(clave)
+            if resultado is None:
+                self.fallos += 1
+                return None
+            self.aciertos += 1
+        return copy.deepcopy(resultado)
+
+    def guardar(self, tipo, ruta, resultado, tamaño=None, mtime_ns=None):
+        clave = f"{tipo}:{self.huella(ruta, tamaño, mtime_ns)}"
+        with self._lock:
+            self.resultados[clave] = copy.deepcopy(resultado)
+
+    def persistir(self):
+        """Escribir la caché a disco, descartando archivos que ya no existen"""
+        self.huellas = {r: h for r, h in self.huellas.items() if Path(r).exists()}
+        vigentes = {h["sha256"] for h in self.huellas.values()}
+        self.resultados = {k: v for k, v in self.resultados.items() if k.split(":", 1)[1] in vigentes}
+        
+        datos = {
+            "version": CACHE_VERSION,
+            "firma_config": self.firma_config,
+            "huellas": self.huellas,
+            "resultados": self.resultados
+        }
+        temporal = self.ruta_cache.with_name(self.ruta_cache.name + ".tmp")
+        with open(temporal, 'w', encoding='utf-8') as f:
+            json.dump(datos, f, ensure_ascii=False)
+        os.replace(temporal, self.ruta_cache)
+
+
+PARRAFOS_VERSION = 1
+
+# Coincidencia del corrector guardada por párrafo (offset relativo al párrafo al guardarla)
+CoincidenciaCorrector = namedtuple("CoincidenciaCorrector", ["offset", "errorLength", "replacements", "context", "ruleIssueType"])
+
+
+class CacheParrafos:
+    """
+    Caché persistente de lo que devolvió el corrector para cada párrafo, direccionada por el hash
+    del texto del párrafo. Al editar un documento solo se vuelven a enviar los párrafos que cambiaron;
+    las coincidencias guardadas se reubican en los offsets del documento nuevo
+    """
+
+    MAX_PARRAFOS = 200_000
+
+    def __init__(self, ruta, firma_corrector):
+        self.ruta = Path(ruta)
+        self.firma_corrector = firma_corrector
+        self.parrafos = {}
+        self.reutilizados = 0
+        self.revisados = 0
+        self._lock = threading.Lock()
+        self._cargar()
+
+    def _cargar(self):
+        if not self.ruta.exists():
+            return
+        try:
+            with open(self.ruta, 'r', encoding='utf-8') as f:
+                datos = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Caché de párrafos ilegible, se reconstruirá: {e}")
+            return
+        if datos.get("version") == PARRAFOS_VERSION and datos.get("firma_corrector") == self.firma_corrector:
+            self.parrafos = datos.get("parrafos", {})
+
+    @staticmethod
+    def clave(parrafo):
+        return hashlib.blake2b(parrafo.encode('utf-8'), digest_size=16).hexdigest()
+
+    def obtener(self, clave):
+        with self._lock:
+            coincidencias = self.parrafos.pop(clave, None)
+            if coincidencias is not None:
+                # Al final del dict: los menos usados son los primeros en descartarse
+                self.parrafos[clave] = coincidencias
+        return coincidencias
+
+    def guardar(self, clave, coincidencias):
+        with self._lock:
+            self.parrafos.pop(clave, None)
+            self.parrafos[clave] = coincidencias
+
+    def contar(self, reutilizados, revisados):
+        with self._lock:
+            self.reutilizados += reutilizados
+            self.revisados += revisados
+
+    def persistir(self):
+        with self._lock:
+            sobrantes = len(self.parrafos) - self.MAX_PARRAFOS
+            if sobrantes > 0:
+                for clave in list(self.parrafos)[:sobrantes]:
+                    del self.parrafos[clave]
+            datos = {
+                "version": PARRAFOS_VERSION,
+                "firma_corrector": self.firma_corrector,
+                "parrafos": self.parrafos
+            }
+            temporal = self.ruta.with_name(self.ruta.name + ".tmp")
+            with open(temporal, 'w', encoding='utf-8') as f:
+                json.dump(datos, f, ensure_ascii=False)
+            os.replace(temporal, self.ruta)
+
+
+HISTORIAL_VERSION = 1
+
+# Métricas de audio que se guardan como columnas (las mismas de evaluar_problemas_audio)
+METRICAS_HISTORIAL = ("duracion", "volumen_max", "volumen_promedio", "volumen_minimo", "volumen_desviacion",
+                      "porcentaje_silencio", "cantidad_silencios", "duracion_silencios")
+
+
+class HistorialMetricas:
+    """
+    Historial local (SQLite) de las métricas de audio de cada video en cada ejecución.
+    Las filas se identifican por la huella SHA-256 del contenido y la ejecución: un video sin cambios
+    se sirve desde aquí sin decodificarlo, y por nombre de archivo se obtiene su evolución entre ejecuciones
+    """
+
+    ESQUEMA = """
+        CREATE TABLE IF NOT EXISTS ejecuciones (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            fecha TEXT NOT NULL,
+            curso TEXT NOT NULL,
+            firma_audio TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS huellas (
+            ruta TEXT PRIMARY KEY,
+            tamaño INTEGER NOT NULL,
+            mtime_ns INTEGER NOT NULL,
+            sha256 TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS metricas_audio (
+            ejecucion INTEGER NOT NULL REFERENCES ejecuciones(id),
+            huella TEXT NOT NULL,
+            modulo TEXT NOT NULL,
+            archivo TEXT NOT NULL,
+            duracion REAL,
+            volumen_max REAL,
+            volumen_promedio REAL,
+            volumen_minimo REAL,
+            volumen_desviacion REAL,
+            porcentaje_silencio REAL,
+            cantidad_silencios INTEGER,
+            duracion_silencios REAL,
+            resultado TEXT NOT NULL,
+            PRIMARY KEY (ejecucion, modulo, archivo)
+        );
+        CREATE INDEX IF NOT EXISTS idx_metricas_huella ON metricas_audio (huella);
+        CREATE INDEX IF NOT EXISTS idx_metricas_modulo ON metricas_audio (modulo);
+        CREATE INDEX IF NOT EXISTS idx_metricas_archivo ON metricas_audio (archivo, modulo);
+    """
+
+    def __init__(self, ruta):
+        self.ruta = Path(ruta)
+        # La etapa de audio puede correr en otro hilo (etapas concurrentes): un lock serializa el acceso
+        self._conexion = sqlite3.connect(str(self.ruta), check_same_thread=False)
+        self._lock = threading.Lock()
+        self.ejecucion = None
+        self.servidos = 0
+        with self._lock, self._conexion:
+            version = self._conexion.execute("PRAGMA user_version").fetchone()[0]
+            if version not in (0, HISTORIAL_VERSION):
+                raise ValueError(f"Historial {self.ruta} con versión {version}, se esperaba {HISTORIAL_VERSION}")
+            self._conexion.executescript(self.ESQUEMA)
+            self._conexion.execute(f"PRAGMA user_version = {HISTORIAL_VERSION}")
+
+    def huella(self, ruta, tamaño=None, mtime_ns=None):
+        """SHA-256 del contenido; solo se recalcula si cambió el tamaño o el mtime"""
+        if tamaño is None or mtime_ns is None:
+            st = os.stat(ruta)
+            tamaño, mtime_ns = st.st_size, st.st_mtime_ns
+        clave = str(Path(ruta).resolve())
+        with self._lock:
+            previa = self._conexion.execute(
+                "SELECT sha256 FROM huellas WHERE ruta = ? AND tamaño = ? AND mtime_ns = ?",
+                (clave, tamaño, mtime_ns)).fetchone()
+        if previa:
+            return previa[0]
+        
+        sha = hashlib.sha256()
+        with open(ruta, 'rb') as f:
+            for bloque in iter(lambda: f.read(1024 * 1024), b""):
+                sha.update(bloque)
+        with self._lock:
+            self._conexion.execute("INSERT OR REPLACE INTO huellas VALUES (?, ?, ?, ?)",
+                                   (clave, tamaño, mtime_ns, sha.hexdigest()))
+        return sha.hexdigest()
+
+    def iniciar_ejecucion(self, curso, firma_audio):
+        """Registrar una ejecución nueva; las métricas que se guarden quedan asociadas a ella"""
+        with self._lock:
+            cursor = self._conexion.execute(
+                "INSERT INTO ejecuciones (fecha, curso, firma_audio) VALUES (?, ?, ?)",
+                (datetime.now().strftime("%Y-%m-%d %H:%M:%S"), str(curso), firma_audio))
+            self.ejecucion = cursor.lastrowid
+            self.curso = str(curso)
+            self.firma_audio = firma_audio
+        return self.ejecucion
+
+    def obtener(self, huella):
+        """Último resultado de audio de este contenido con la misma configuración de audio (o None)"""
+        with self._lock:
+            fila = self._conexion.execute(
+                """SELECT m.resultado FROM metricas_audio m JOIN ejecuciones e ON e.id = m.ejecucion
+                   WHERE m.huella = ? AND e.firma_audio = ? ORDER BY m.ejecucion DESC LIMIT 1""",
+                (huella, self.firma_audio)).fetchone()
+        if fila is None:
+            return None
+        self.servidos += 1
+        return json.loads(fila[0])
+
+    def guardar(self, huella, modulo, archivo, resultado):
+        metricas = resultado.get("metricas", {})
+        valores = [metricas.get(metrica) for metrica in METRICAS_HISTORIAL]
+        with self._lock:
+            self._conexion.execute(
+                f"INSERT OR REPLACE INTO metricas_audio VALUES (?, ?, ?, ?, {', '.join('?' * len(METRICAS_HISTORIAL))}, ?)",
+                (self.ejecucion, huella, modulo, archivo, *valores, json.dumps(resultado, ensure_ascii=False)))
+
+    def evolucion(self, modulo, archivo, limite=5):
+        """Métricas del mismo archivo en las ejecuciones anteriores, de la más antigua a la más reciente"""
+        with self._lock:
+            filas = self._conexion.execute(
+                """SELECT e.fecha, m.duracion, m.volumen_promedio, m.porcentaje_silencio, m.huella
+                   FROM metricas_audio m JOIN ejecuciones e ON e.id = m.ejecucion
+                   WHERE m.archivo = ? AND m.modulo = ? AND e.curso = ? AND m.ejecucion < ?
+                   ORDER BY m.ejecucion DESC LIMIT ?""",
+                (archivo, modulo, self.curso, self.ejecucion, limite)).fetchall()
+        return [{"fecha": fecha, "duracion": duracion, "volumen_promedio": volumen,
+                 "porcentaje_silencio": silencio, "huella": huella[:12]}
+                for fecha, duracion, volumen, silencio, huella in reversed(filas)]
+
+    def confirmar(self):
+        """Escribir a disco lo registrado en esta ejecución (una sola transacción)"""
+        with self._lock:
+            self._conexion.commit()
+
+    def cerrar(self):
+        with self._lock:
+            self._conexion.commit()
+            self._conexion.close()
+
+
+class AlmacenReporte:
+    """
+    Base SQLite temporal donde las listas del reporte (ListaEnDisco) escriben sus filas a medida
+    que se producen. Con nombre vacío SQLite la crea en un archivo temporal privado que borra al
+    cerrarla; en memoria solo queda su caché de páginas, no las filas
+    """
+
+    LOTE = 500
+
+    def __init__(self):
+        # Sin transacción abierta: cada lote se confirma y SQLite puede bajar sus páginas a disco
+        self._conexion = sqlite3.connect("", check_same_thread=False, isolation_level=None)
+        # Las etapas concurrentes escriben cada una en sus listas desde su hilo
+        self._lock = threading.Lock()
+        self._listas = 0
+        with self._lock:
+            self._conexion.executescript("""
+                PRAGMA journal_mode = OFF;
+                PRAGMA synchronous = OFF;
+                CREATE TABLE filas (
+                    id INTEGER PRIMARY KEY,
+                    lista INTEGER NOT NULL,
+                    modulo TEXT,
+                    fila TEXT NOT NULL
+                );
+                -- Cada índice devuelve sus filas ya en orden de id: ni la lista completa ni un módulo se ordenan
+                CREATE INDEX idx_filas_lista ON filas (lista);
+                CREATE INDEX idx_filas_modulo ON filas (lista, modulo);
+            """)
+
+    def nueva_lista(self):
+        with self._lock:
+            self._listas += 1
+            return ListaEnDisco(self, self._listas)
+
+    def insertar(self, registros):
+        with self._lock:
+            self._conexion.executemany("INSERT INTO filas (lista, modulo, fila) VALUES (?, ?, ?)", registros)
+
+    def mover(self, origen, destino):
+        """Pasar todas las filas de una lista al final de otra, dentro de SQLite y en orden"""
+        with self._lock:
+            self._conexion.execute(
+                "INSERT INTO filas (lista, modulo, fila) SELECT ?, modulo, fila FROM filas WHERE lista = ? ORDER BY id",
+                (destino.numero, origen.numero))
+            self._conexion.execute("DELETE FROM filas WHERE lista = ?", (origen.numero,))
+
+    def descartar(self, lista):
+        with self._lock:
+            self._conexion.execute("DELETE FROM filas WHERE lista = ?", (lista.numero,))
+
+    def leer(self, numero, *modulo):
+        """Filas de una lista (o solo las de un módulo) en orden, leídas de a LOTE con un cursor"""
+        consulta = "SELECT fila FROM filas WHERE lista = ?" + (" AND modulo IS ?" if modulo else "") + " ORDER BY id"
+        with self._lock:
+            cursor = self._conexion.execute(consulta, (numero, *modulo))
+        try:
+            while True:
+                with self._lock:
+                    lote = cursor.fetchmany(self.LOTE)
+                if not lote:
+                    return
+                for (fila,) in lote:
+                    yield json.loads(fila)
+        finally:
+            cursor.close()
+
+    def cerrar(self):
+        with self._lock:
+            self._conexion.close()
+
+
+class ListaEnDisco:
+    """
+    Lista del reporte respaldada por un AlmacenReporte: append/extend guardan cada fila (JSON) en disco,
+    len() y la cantidad de filas por módulo se llevan al día en memoria, y recorrerla lee con un cursor.
+    Admite lo que el auditor hace con las listas del reporte: agregar, contar y recorrer
+    """
+
+    def __init__(self, almacen, numero):
+        self.almacen = almacen
+        self.numero = numero
+        self.cantidad = 0
+        # Filas por módulo, en orden de primera aparición
+        self.por_modulo = {}
+        # Las filas sueltas (append) se insertan de a LOTE; antes de leer o mover se vuelca lo pendiente
+        self._pendientes = []
+
+    def append(self, fila):
+        modulo = fila.get("modulo")
+        self._pendientes.append((self.numero, modulo, json.dumps(fila, ensure_ascii=False)))
+        self._contar(((modulo, 1),))
+        if len(self._pendientes) >= self.almacen.LOTE:
+            self._volcar()
+
+    def extend(self, filas):
+        if isinstance(filas, ListaEnDisco):
+            self._volcar()
+            filas._volcar()
+            self.almacen.mover(filas, self)
+            self._contar(filas.por_modulo.items())
+            filas.cantidad = 0
+            filas.por_modulo = {}
+            return
+        for fila in filas:
+            self.append(fila)
+
+    def _volcar(self):
+        if self._pendientes:
+            self.almacen.insertar(self._pendientes)
+            self._pendientes = []
+
+    def _contar(self, cantidades):
+        for modulo, cantidad in cantidades:
+            self.por_modulo[modulo] = self.por_modulo.get(modulo, 0) + cantidad
+            self.cantidad += cantidad
+
+    def filas(self, modulo):
+        """Filas de un módulo, en orden"""
+        self._volcar()
+        return self.almacen.leer(self.numero, modulo)
+
+    def descartar(self):
+        self._pendientes = []
+        self.almacen.descartar(self)
+        self.cantidad = 0
+        self.por_modulo = {}
+
+    def __iter__(self):
+        self._volcar()
+        return self.almacen.leer(self.numero)
+
+    def __len__(self):
+        return self.cantidad
+
+    def __bool__(self):
+        return self.cantidad > 0
+
+
+PUERTO_COLA = 8765
+# Cada cuánto da señales un trabajador ocupado; tres latidos perdidos = trabajador caído
+LATIDO_TRABAJADOR_S = 5
+
+
+def direccion_cola(direccion, host_defecto="127.0.0.1"):
+    """Aceptar "PUERTO" o "HOST:PUERTO" como dirección de la cola distribuida"""
+    direccion = str(direccion)
+    if ":" in direccion:
+        host, puerto = direccion.rsplit(":", 1)
+        return (host or host_defecto, int(puerto))
+    return (host_defecto, int(direccion))
+
+
+class TareaDistribuida:
+    """Un archivo a procesar en un trabajador y el Future donde el coordinador deja (resultado, medida)"""
+
+    def __init__(self, numero, tipo, ruta, modulo):
+        self.numero = numero
+        self.tipo = tipo
+        self.ruta = Path(ruta)
+        self.modulo = modulo
+        self.intentos = 0
+        self.futuro = Future()
+
+    def mensaje(self):
+        return ("tarea", self.numero, self.tipo, str(self.ruta), self.modulo)
+
+
+class CoordinadorAuditoria:
+    """
+    Cola de tareas por socket para repartir una auditoría entre varias máquinas.
+    El auditor entrega cada archivo con enviar() ("ortografia": revisar un documento, "audio": analizar
+    el audio de un video) y recibe un Future como los de los pools locales; los trabajadores
+    (TrabajadorAuditoria, en este u otros hosts) se conectan, reciben la configuración del auditor y
+    devuelven el mismo (resultado, medida) que la auditoría local. Si un trabajador se desconecta o deja
+    de dar latidos, su tarea vuelve a la cola, hasta `reintentos` veces
+    """
+
+    def __init__(self, direccion=("0.0.0.0", PUERTO_COLA), clave=None, reintentos=2, espera_trabajadores=120):
+        if not clave:
+            raise ValueError("La cola distribuida necesita una clave compartida con los trabajadores")
+        self.clave = clave if isinstance(clave, bytes) else clave.encode("utf-8")
+        self.reintentos = reintentos
+        self.espera_trabajadores = espera_trabajadores
+        self.trabajadores = 0
+        self._cola = queue.Queue()
+        self._lock = threading.Lock()
+        self._cerrado = threading.Event()
+        self._configuracion = None
+        self._version = 0
+        self._tareas = 0
+        # Con clave, multiprocessing autentica cada conexión (HMAC) antes de aceptar mensajes
+        self._listener = Listener(direccion, authkey=self.clave)
+        self.direccion = self._listener.address
+        threading.Thread(target=self._aceptar, daemon=True).start()
+        threading.Thread(target=self._vigilar, daemon=True).start()
+        print(f"🌐 Coordinador esperando trabajadores en {self.direccion[0]}:{self.direccion[1]}")
+
+    def configurar(self, auditor):
+        """Auditor (copia ligera) que cada trabajador recibe antes de su próxima tarea; una vez por ejecución"""
+        datos = pickle.dumps(auditor)
+        with self._lock:
+            self._configuracion = datos
+            self._version += 1
+
+    def enviar(self, tipo, ruta, modulo):
+        with self._lock:
+            self._tareas += 1
+            tarea = TareaDistribuida(self._tareas, tipo, ruta, modulo)
+        self._cola.put(tarea)
+        return tarea.futuro
+
+    def _aceptar(self):
+        while not self._cerrado.is_set():
+            try:
+                conexion = self._listener.accept()
+            except AuthenticationError:
+                print("⚠️ Conexión rechazada: el trabajador no tiene la clave de la cola")
+                continue
+            except (OSError, EOFError):
+                if self._cerrado.is_set():
+                    return
+                continue
+            threading.Thread(target=self._atender, args=(conexion,), daemon=True).start()
+
+    def _atender(self, conexion):
+        """Un hilo por trabajador: le pasa las tareas de a una y espera su respuesta o su caída"""
+        try:
+            nombre = conexion.recv()[1]
+        except (EOFError, OSError):
+            conexion.close()
+            return
+        with self._lock:
+            self.trabajadores += 1
+        print(f"🌐 Trabajador conectado: {nombre} ({self.trabajadores} activos)")
+        version = 0
+        tarea = None
+        try:
+            while not self._cerrado.is_set():
+                try:
+                    tarea = self._cola.get(timeout=1)
+                except queue.Empty:
+                    # Sin tareas: se descartan los latidos (y se nota si el trabajador se cayó)
+                    while conexion.poll():
+                        conexion.recv()
+                    continue
+                if not tarea.futuro.running() and not tarea.futuro.set_running_or_notify_cancel():
+                    tarea = None  # El auditor ya no la espera
+                    continue
+                with self._lock:
+                    configuracion, version_actual = self._configuracion, self._version
+                if version != version_actual:
+                    conexion.send(("configuracion", configuracion))
+                    version = version_actual
+                conexion.send(tarea.mensaje())
+                respuesta = self._esperar_respuesta(conexion)
+                if respuesta[0] == "resultado":
+                    tarea.futuro.set_result(respuesta[2])
+                else:
+                    tarea.futuro.set_exception(respuesta[2])
+                tarea = None
+        except (EOFError, OSError) as e:
+            print(f"⚠️ Trabajador perdido: {nombre} ({str(e) or 'conexión cerrada'})")
+            if tarea is not None:
+                self._reintentar(tarea)
+        finally:
+            with self._lock:
+                self.trabajadores -= 1
+            conexion.close()
+
+    def _esperar_respuesta(self, conexion):
+        while True:
+            if not conexion.poll(LATIDO_TRABAJADOR_S * 3):
+                raise TimeoutError(f"sin latidos en {LATIDO_TRABAJADOR_S * 3}s")
+            mensaje = conexion.recv()
+            if mensaje[0] != "latido":
+                return mensaje
+
+    def _reintentar(self, tarea):
+        # El límite evita que un archivo que tumba trabajadores (p. ej. sin memoria) los derribe a todos
+        tarea.intentos += 1
+        if tarea.intentos > self.reintentos:
+            tarea.futuro.set_exception(RuntimeError(
+                f"Se perdieron {tarea.intentos} trabajadores procesando {tarea.ruta.name}"))
+            return
+        print(f"🔁 {tarea.ruta.name} vuelve a la cola (intento {tarea.intentos + 1} de {self.reintentos + 1})")
+        self._cola.put(tarea)
+
+    def _vigilar(self):
+        """Si hay tareas y ningún trabajador durante espera_trabajadores, fallarlas en lugar de esperar para siempre"""
+        desde = None
+        while not self._cerrado.wait(1):
+            if self.trabajadores or self._cola.empty():
+                desde = None
+            elif desde is None:
+                desde = time.monotonic()
+                print(f"⏳ {self._cola.qsize()} tareas esperando trabajadores en {self.direccion[0]}:{self.direccion[1]}...")
+            elif time.monotonic() - desde > self.espera_trabajadores:
+                self._vaciar(RuntimeError(f"Ningún trabajador conectado en {self.espera_trabajadores}s"))
+                desde = None
+
+    def _vaciar(self, error):
+        while True:
+            try:
+                tarea = self._cola.get_nowait()
+            except queue.Empty:
+                return
+            if tarea.futuro.running() or tarea.futuro.set_running_or_notify_cancel():
+                tarea.futuro.set_exception(error)
+
+    def cerrar(self):
+        self._cerrado.set()
+        self._listener.close()
+        self._vaciar(RuntimeError("Coordinador cerrado"))
+
+
+class TrabajadorAuditoria:
+    """
+    Proceso trabajador del modo distribuido: se conecta a un CoordinadorAuditoria y resuelve sus tareas
+    con los mismos métodos que la auditoría local (revisar_documento, detectar_problemas_audio_optimizado)
+    sobre el auditor que recibe del coordinador, al que suma su propio corrector y lexicón.
+    Mientras trabaja manda latidos, así el coordinador distingue un video largo de un host caído.
+    montaje: (prefijo en el coordinador, prefijo local) si el curso está montado en otra ruta en este host
+    """
+
+    def __init__(self, direccion, clave, servidor_languagetool=None, corrector=None, montaje=None, reconectar=True):
+        self.direccion = direccion
+        self.clave = clave if isinstance(clave, bytes) else clave.encode("utf-8")
+        self.servidor_languagetool = servidor_languagetool
+        self.corrector = corrector
+        self.montaje = montaje
+        self.reconectar = reconectar
+        self.nombre = f"{socket.gethostname()}:{os.getpid()}"
+        self.auditor = None
+        self.english_words = None
+        self.lexico_intentado = False
+        self.tareas = 0
+        self._lock = threading.Lock()
+
+    def ejecutar(self):
+        """Atender coordinadores: con reconectar, al terminar uno se queda esperando el siguiente"""
+        avisado = False
+        while True:
+            try:
+                conexion = Client(self.direccion, authkey=self.clave)
+            except ConnectionRefusedError:
+                if not self.reconectar:
+                    raise
+                if not avisado:
+                    print(f"⏳ Esperando al coordinador en {self.direccion[0]}:{self.direccion[1]}...")
+                    avisado = True
+                time.sleep(2)
+                continue
+            print(f"🛠️ Trabajador {self.nombre} conectado a {self.direccion[0]}:{self.direccion[1]}")
+            try:
+                self.atender(conexion)
+            finally:
+                conexion.close()
+            print(f"🔌 Coordinador desconectado ({self.tareas} tareas resueltas)")
+            if not self.reconectar:
+                return
+            avisado = False
+
+    def atender(self, conexion):
+        conexion.send(("hola", self.nombre))
+        detener = threading.Event()
+        threading.Thread(target=self._latir, args=(conexion, detener), daemon=True).start()
+        try:
+            while True:
+                try:
+                    mensaje = conexion.recv()
+                except (EOFError, OSError):
+                    return
+                if mensaje[0] == "configuracion":
+                    self.configurar(pickle.loads(mensaje[1]))
+                elif mensaje[0] == "tarea":
+                    respuesta = self.resolver(*mensaje[1:])
+                    try:
+                        with self._lock:
+                            conexion.send(respuesta)
+                    except (EOFError, OSError):
+                        return
+        finally:
+            detener.set()
+
+    def _latir(self, conexion, detener):
+        while not detener.wait(LATIDO_TRABAJADOR_S):
+            try:
+                with self._lock:
+                    conexion.send(("latido",))
+            except (OSError, ValueError):
+                return
+
+    def configurar(self, auditor):
+        """Auditor del coordinador, sin corrector ni lexicón (se agregan en la primera revisión ortográfica)"""
+        auditor.sondeos = {}
+        if auditor.motor_audio == "numpy" and importlib.util.find_spec("numpy") is None:
+            print("⚠️ NumPy no disponible en este trabajador, se usa el motor PyDub")
+            auditor.motor_audio = "pydub"
+        self.auditor = auditor
+
+    def preparar_ortografia(self):
+        auditor = self.auditor
+        if auditor.spell_checker is not None:
+            return
+        if self.corrector is None:
+            if self.servidor_languagetool:
+                self.corrector = CorrectorSupervisado(ServidorLanguageTool.desde_direccion(self.servidor_languagetool), 'es')
+            else:
+                self.corrector = language_tool_python.LanguageTool('es')
+        if not self.lexico_intentado:
+            # Igual que en el auditor: sin lexicón se sigue revisando, solo sin el filtro de palabras en inglés
+            self.lexico_intentado = True
+            try:
+                self.english_words = abrir_lexico_ingles()
+            except Exception as e:
+                print(f"❌ Error cargando palabras en inglés: {e}")
+                self.english_words = None
+        auditor.spell_checker = self.corrector
+        auditor.english_words = self.english_words
+        auditor.filtro_errores = FiltroFalsosPositivos(auditor.palabras_validas, self.english_words)
+
+    def traducir_ruta(self, ruta):
+        if not self.montaje or not ruta.startswith(self.montaje[0]):
+            return Path(ruta)
+        resto = ruta[len(self.montaje[0]):]
+        if "\\" in self.montaje[0]:
+            resto = resto.replace("\\", "/")  # Coordinador en Windows
+        return Path(self.montaje[1], resto.lstrip("/"))
+
+    def resolver(self, numero, tipo, ruta, modulo):
+        """Respuesta a una tarea: ("resultado", numero, (resultado, medida)) o ("error", numero, excepción)"""
+        auditor = self.auditor
+        ruta = self.traducir_ruta(ruta)
+        print(f"   🛠️ {tipo}: {ruta.name}")
+        try:
+            if tipo == "ortografia":
+                self.preparar_ortografia()
+                resultado, medida = auditor._medir(auditor.revisar_documento, ruta, modulo, medida={})
+            elif tipo == "audio":
+                resultado, medida = auditor._medir(auditor.detectar_problemas_audio_optimizado, ruta, False)
+            else:
+                raise ValueError(f"Tarea desconocida: {tipo}")
+        except Exception as e:
+            try:
+                pickle.dumps(e)
+            except Exception:
+                e = RuntimeError(str(e))
+            return ("error", numero, e)
+        self.tareas += 1
+        medida["trabajador"] = self.nombre
+        return ("resultado", numero, (resultado, medida))
+
+
+TIEMPOS_VERSION = 2
+
+# Estilos adicionales del reporte paginado (barra de navegación entre páginas)
+ESTILOS_PAGINACION = """
+        /* ===== PAGINACIÓN ===== */
+        .paginacion {
+            display: flex;
+            flex-wrap: wrap;
+            gap: 8px;
+            align-items: center;
+            margin: 20px 0;
+        }
+        
+        .paginacion a, .paginacion span {
+            padding: 6px 12px;
+            border-radius: 4px;
+            border: 1px solid var(--azul-electrico);
+            color: var(--azul-electrico);
+            text-decoration: none;
+            font-size: 0.9rem;
+        }
+        
+        .paginacion .actual {
+            background: var(--azul-electrico);
+            color: var(--blanco);
+        }
+        
+        .paginacion .hueco {
+            border: none;
+        }
+        
+        @media print {
+            .paginacion { display: none; }
+        }
+"""
+
+
+def memoria_pico_kb():
+    """
+    Memoria residente pico (KB) de este proceso y de sus hijos ya terminados (None si no se puede medir).
+    Es el máximo desde que arrancó el proceso: solo sube, así que por sí solo no describe una etapa
+    """
+    if resource is None:
+        return None, None
+    escala = 1024 if sys.platform == "darwin" else 1  # macOS informa bytes, Linux KB
+    return (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss // escala,
+            resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss // escala)
+
+
+class MedicionEtapa:
+    """
+    Medición de una etapa (usar con `with`): tiempo real, CPU propia y de procesos hijos, cuánto subió
+    la memoria pico del proceso durante la etapa (y el heap Python pico de la etapa, con tracemalloc),
+    y los ítems/bytes de cada archivo registrado dentro de la etapa
+    """
+
+    def __init__(self, medidor, nombre, fija=False):
+        self.medidor = medidor
+        self.nombre = nombre
+        self.fija = fija
+        self.items = 0
+        self.bytes = 0
+        self.archivos = []
+
+    def registrar_archivo(self, ruta, bytes_archivo=0, tiempo_s=0.0, cpu_s=0.0, origen="procesado", **detalle):
+        """Registrar un archivo procesado (o reutilizado de la caché) dentro de la etapa"""
+        self.items += 1
+        self.bytes += bytes_archivo or 0
+        registro = {
+            "archivo": str(ruta),
+            "origen": origen,
+            "bytes": bytes_archivo or 0,
+            "tiempo_s": round(tiempo_s, 4),
+            "cpu_s": round(cpu_s, 4)
+        }
+        registro.update({clave: round(valor, 4) if isinstance(valor, float) else valor
+                         for clave, valor in detalle.items()})
+        self.archivos.append(registro)
+
+    def __enter__(self):
+        self.medidor.actual = self
+        # Con etapas solapadas el pico de tracemalloc es del proceso: reiniciarlo pisaría el de las otras
+        if tracemalloc.is_tracing() and not self.medidor.compartido:
+            tracemalloc.reset_peak()
+        self._pico_inicio = memoria_pico_kb()
+        self._cpu_inicio = os.times()
+        self._inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, tipo, valor, traza):
+        tiempo = time.perf_counter() - self._inicio
+        cpu_fin = os.times()
+        pico, pico_hijos = memoria_pico_kb()
+        compartido = self.medidor.compartido
+        registro = {
+            "etapa": self.nombre,
+            "fija": self.fija,
+            "tiempo_s": round(tiempo, 4),
+            "cpu_s": round((cpu_fin.user - self._cpu_inicio.user) + (cpu_fin.system - self._cpu_inicio.system), 4),
+            "cpu_hijos_s": round((cpu_fin.children_user - self._cpu_inicio.children_user)
+                                 + (cpu_fin.children_system - self._cpu_inicio.children_system), 4),
+            # Pico del proceso hasta el final de la etapa (acumulado) y cuánto lo subió esta etapa
+            "memoria_pico_kb": pico,
+            "memoria_pico_hijos_kb": pico_hijos,
+            # Si la etapa corrió junto a otras, el aumento y el heap pico no se le pueden atribuir solo a ella
+            "aumento_pico_kb": pico - self._pico_inicio[0] if pico is not None and not compartido else None,
+            "aumento_pico_hijos_kb": (pico_hijos - self._pico_inicio[1]
+                                      if pico_hijos is not None and not compartido else None),
+            "heap_python_pico_kb": (tracemalloc.get_traced_memory()[1] // 1024
+                                    if tracemalloc.is_tracing() and not compartido else None),
+            # La CPU sale de os.times(), que es de todo el proceso: compartida incluye la de las etapas solapadas
+            "cpu_compartida": compartido,
+            "items": self.items,
+            "bytes": self.bytes,
+            "items_por_s": round(self.items / tiempo, 2) if tiempo > 0 else None,
+            "mb_por_s": round(self.bytes / (1024 * 1024) / tiempo, 2) if tiempo > 0 else None,
+            "error": tipo.__name__ if tipo else None,
+            "archivos": self.archivos
+        }
+        self.medidor.etapas.append(registro)
+        self.medidor.actual = None
+        return False
+
+
+class MedidorEtapas:
+    """
+    Instrumentación de una auditoría: una medición por etapa, con el detalle por archivo.
+    compartido: las etapas corren a la vez que otras (etapas concurrentes), así que la CPU y la memoria
+    del proceso no son solo suyas; se marca la CPU como compartida y no se mide la memoria por etapa
+    """
+
+    def __init__(self, compartido=False):
+        self.etapas = []
+        self.actual = None
+        self.compartido = compartido
+
+    def etapa(self, nombre, fija=False):
+        """Nueva medición; las etapas fijas (inicialización) sobreviven a reiniciar()"""
+        return MedicionEtapa(self, nombre, fija)
+
+    def reiniciar(self):
+        self.etapas = [etapa for etapa in self.etapas if etapa["fija"]]
+
+    def a_dict(self):
+        return {
+            "version": TIEMPOS_VERSION,
+            "generado": datetime.now().isoformat(timespec="seconds"),
+            "plataforma": sys.platform,
+            "python": sys.version.split()[0],
+            "cpus": os.cpu_count(),
+            # Las etapas que corrieron solapadas ya están contadas en la etapa que las agrupa
+            "tiempo_total_s": round(sum(etapa["tiempo_s"] for etapa in self.etapas if not etapa.get("dentro_de")), 4),
+            "etapas": copy.deepcopy(self.etapas)
+        }
+
+    def exportar(self, ruta):
+        """Guardar las mediciones en JSON (escritura atómica)"""
+        ruta = Path(ruta)
+        temporal = ruta.with_name(ruta.name + ".tmp")
+        with open(temporal, 'w', encoding='utf-8') as f:
+            json.dump(self.a_dict(), f, ensure_ascii=False, indent=2)
+        os.replace(temporal, ruta)
+
+    def imprimir_resumen(self):
+        print(f"{'Etapa':<24} {'Real(s)':>9} {'CPU(s)':>9} {'CPU hijos':>10} {'+Pico MB':>9} {'Heap MB':>8} {'Ítems':>7} {'Ítems/s':>9}")
+        for etapa in self.etapas:
+            aumento = f"{etapa['aumento_pico_kb'] / 1024:.0f}" if etapa["aumento_pico_kb"] is not None else "N/A"
+            heap = f"{etapa['heap_python_pico_kb'] / 1024:.1f}" if etapa["heap_python_pico_kb"] is not None else "N/A"
+            velocidad = f"{etapa['items_por_s']:.1f}" if etapa["items_por_s"] is not None else "N/A"
+            cpu = f"{etapa['cpu_s']:.2f}{'*' if etapa.get('cpu_compartida') else ''}"
+            print(f"{etapa['etapa']:<24} {etapa['tiempo_s']:>9.2f} {cpu:>9} "
+                  f"{etapa['cpu_hijos_s']:>10.2f} {aumento:>9} {heap:>8} {etapa['items']:>7} {velocidad:>9}")
+        picos = [etapa["memoria_pico_kb"] for etapa in self.etapas if etapa["memoria_pico_kb"] is not None]
+        if picos:
+            print(f"Pico del proceso: {max(picos) / 1024:.0f} MB "
+                  f"(+Pico MB = cuánto lo subió cada etapa; Heap MB = pico Python de la etapa, con --perfil-memoria)")
+        if any(etapa.get("cpu_compartida") for etapa in self.etapas):
+            print("* Etapas concurrentes: su CPU es la de todo el proceso mientras corrían (incluye las demás) "
+                  "y su memoria se cuenta solo en 'etapas_concurrentes'")
+
+
+class ConsolaEtapas:
+    """
+    Reemplazo de sys.stdout mientras corren las etapas concurrentes: junta lo que escribe cada hilo
+    hasta completar la línea y la escribe de una vez, con el nombre de la etapa del hilo delante.
+    Así las líneas de una etapa (la tabla de audio, los "Analizando" de ortografía) no se mezclan
+    a mitad de línea con las de otra
+    """
+
+    def __init__(self, destino):
+        self.destino = destino
+        self._lock = threading.Lock()
+        self._etapas = {}      # hilo -> etapa que corre en él
+        self._pendientes = {}  # hilo -> texto escrito sin salto de línea todavía
+
+    def asignar_etapa(self, nombre):
+        """Las líneas que escriba el hilo actual llevan el nombre de la etapa"""
+        with self._lock:
+            self._etapas[threading.get_ident()] = nombre
+
+    def write(self, texto):
+        hilo = threading.get_ident()
+        with self._lock:
+            *lineas, resto = (self._pendientes.pop(hilo, "") + texto).split("\n")
+            if resto:
+                self._pendientes[hilo] = resto
+            etapa = self._etapas.get(hilo)
+            for linea in lineas:
+                self.destino.write(f"[{etapa}] {linea}\n" if etapa else linea + "\n")
+        return len(texto)
+
+    def flush(self):
+        # Las líneas a medias (print(..., end=" ")) esperan a completarse
+        with self._lock:
+            self.destino.flush()
+
+    def __getattr__(self, nombre):
+        # encoding, isatty, fileno...: los del destino
+        return getattr(self.destino, nombre)
+
+    def cerrar(self):
+        """Escribir lo que quedó sin salto de línea y devolver el destino original"""
+        with self._lock:
+            for hilo, resto in self._pendientes.items():
+                etapa = self._etapas.get(hilo)
+                self.destino.write(f"[{etapa}] {resto}\n" if etapa else resto + "\n")
+            self._pendientes.clear()
+            self.destino.flush()
+        return self.destino
+
+
+# Ficha del curso OKR original (se usa si el curso no trae su propia especificación)
+CURSO_OKR = {
+    "nombre": "OKR",
+    "modulos": {
+        "MODULO 1": {
+            "nombre": "Introducción a los OKR I",
+            "subtemas": [
+                "1.1 Origen y evolución de la gestión de metas okr",
+                "1.2 Concepto, estructura y empresas que los utilizan", 
+                "1.3 Diferencia entre objetivos y resultados clave",
+                "1.4 Tipos de OKR: comprometidos vs. aspiracionales",
+                "1.5 Jerarquía y alineación de los OKR"
+            ]
+        },
+        "MODULO 2": {
+            "nombre": "Introducción a los OKR II",
+            "subtemas": [
+                "2.1 Comparación entre MBO, SMART, KPIs y OKR",
+                "2.2 Integración de OKR con modelos estratégicos (BSC, Hoshin Kanri)",
+                "2.3 Cultura organizacional y alineación con la misión y visión",
+                "2.4 Liderazgo ágil y su impacto en los OKR",
+                "2.5 Beneficios y desafíos de implementar OKR"
+            ]
+        },
+        "MODULO 3": {
+            "nombre": "Gestión con los OKR",
+            "subtemas": [
+                "3.1 Roles clave, OKR Champion y OKR Owner",
+                "3.2 Relación entre OKR y gestión del desempeño (CFR)",
+                "3.3 Uso de herramientas y tableros Kanban para OKR",
+                "3.4 Implementación de OKR en la mejora continua",
+                "3.5 Principales errores y cómo evitarlos"
+            ]
+        },
+        "MODULO 4": {
+            "nombre": "Ajustes de los OKR I",
+            "subtemas": [
+                "4.1 Proceso de implementación de OKR en la organización",
+                "4.2 Ciclo de planeación y cronograma de seguimiento",
+                "4.3 Pasos clave para definir OKR efectivos",
+                "4.4 Evaluación y ajuste de OKR en equipos",
+                "4.5 Buenas prácticas para la ejecución exitosa"
+            ]
+        },
+        "MODULO 5": {
+            "nombre": "Ajustando los OKR II",
+            "subtemas": [
+                "5.1 Creación y estructuración de un OKR efectivo",
+                "5.2 Métodos y herramientas para idear OKR (Brainwriting, Canvas)",
+                "5.3 Ejemplos prácticos de aplicación en empresas",
+                "5.4 Diseño de plantillas y formatos de trabajo",
+                "5.5 Análisis de un caso de estudio real"
+            ]
+        },
+        "MODULO 6": {
+            "nombre": "Alineando los OKR",
+            "subtemas": [
+                "6.1 Estrategias para lograr alineación organizacional",
+                "6.2 Alineación vertical y horizontal de objetivos",
+                "6.3 Importancia de la cadencia y revisión de OKR",
+                "6.4 Métodos de evaluación y calificación de OKR",
+                "6.5 Beneficios de los chequeos y revisiones periódicas"
+            ]
+        }
+    }
+}
+
+ARCHIVO_ESPECIFICACION = "especificacion_curso.json"
+
+
+class EspecificacionCurso:
+    """
+    Ficha de un curso: módulos con nombre y subtemas, y cuántos documentos y videos se esperan.
+    Se carga desde JSON con el mismo formato que CURSO_OKR; cada módulo puede indicar
+    "documentos_esperados" (por defecto uno por subtema) y "videos_esperados"
+    """
+
+    def __init__(self, nombre, modulos, videos_esperados=5, minimo_parcial=3, palabras_validas=()):
+        self.nombre = nombre
+        self.modulos = modulos
+        self.videos_por_modulo = videos_esperados
+        self.minimo_parcial = minimo_parcial
+        self.palabras_validas = {p.lower() for p in palabras_validas}
+
+    @classmethod
+    def desde_dict(cls, datos):
+        # Solo ValueError: main y auditar_portafolio marcan el curso como fallido y siguen con los demás
+        if not isinstance(datos, dict):
+            raise ValueError("La especificación del curso debe ser un objeto JSON")
+        modulos = datos.get("modulos")
+        if not isinstance(modulos, dict) or not modulos:
+            raise ValueError("La especificación del curso necesita un diccionario 'modulos' no vacío")
+        for clave, modulo in modulos.items():
+            if not clave.startswith("MODULO "):
+                raise ValueError(f"Módulo '{clave}': las carpetas de módulo se llaman 'MODULO N'")
+            if not isinstance(modulo, dict):
+                raise ValueError(f"Módulo '{clave}': debe ser un diccionario con 'nombre' y 'subtemas'")
+            if not isinstance(modulo.get("nombre"), str):
+                raise ValueError(f"Módulo '{clave}': falta el texto 'nombre'")
+            if not isinstance(modulo.get("subtemas"), list):
+                raise ValueError(f"Módulo '{clave}': falta la lista 'subtemas'")
+        palabras = datos.get("palabras_validas", ())
+        if not isinstance(palabras, (list, tuple)) or not all(isinstance(p, str) for p in palabras):
+            raise ValueError("'palabras_validas' debe ser una lista de textos")
+        return cls(datos.get("nombre", "OKR"), modulos,
+                   videos_esperados=datos.get("videos_esperados", 5),
+                   minimo_parcial=datos.get("minimo_parcial", 3),
+                   palabras_validas=palabras)
+
+    @classmethod
+    def cargar(cls, ruta_json):
+        with open(ruta_json, 'r', encoding='utf-8') as f:
+            return cls.desde_dict(json.load(f))
+
+    @classmethod
+    def para_curso(cls, ruta_base, por_defecto=None):
+        """La del propio curso (especificacion_curso.json en su carpeta), la indicada o la del curso OKR"""
+        ruta = Path(ruta_base) / ARCHIVO_ESPECIFICACION
+        if ruta.exists():
+            return cls.cargar(ruta)
+        return por_defecto or cls.desde_dict(CURSO_OKR)
+
+    def documentos_esperados(self, modulo):
+        return self.modulos[modulo].get("documentos_esperados", len(self.modulos[modulo]["subtemas"]))
+
+    def videos_esperados(self, modulo):
+        return self.modulos[modulo].get("videos_esperados", self.videos_por_modulo)
+
+    def a_dict(self):
+        return {
+            "nombre": self.nombre,
+            "modulos": self.modulos,
+            "videos_esperados": self.videos_por_modulo,
+            "minimo_parcial": self.minimo_parcial,
+            "palabras_validas": sorted(self.palabras_validas)
+        }
+
+
 class AuditorOKROptimizado:
-    def __init__(self, ruta_sharepoint):
+    def __init__(self, ruta_sharepoint, modo_audio="completo", bloque_pcm_bytes=1024 * 1024,
+                 trabajadores_audio=1, usar_cache=False, ruta_cache=None, motor_audio="pydub",
+                 ruta_inventario=None, servidor_languagetool=None, concurrencia_ortografia=1,
+                 ruta_tiempos=None, corrector=None, filas_por_pagina=None, revisar_tablas=False,
+                 especificacion=None, etapas_concurrentes=False, ventanas_muestreo=12, segundos_ventana=10,
+                 veredicto_rapido=False, historial=False, ruta_historial=None, reporte_en_disco=False,
+                 coordinador=None):
         """
         Auditor OKR OPTIMIZADO - Corrige problemas raíz del código original + Análisis de Audio Completo
+
+        modo_audio: "completo" (AudioSegment en memoria), "streaming" (bloques PCM desde ffmpeg)
+                    o "muestreo" (solo algunas ventanas del video; completo si queda cerca de un umbral)
+        bloque_pcm_bytes: tamaño de cada lectura del decodificador en modo streaming
+        trabajadores_audio: procesos para analizar videos en paralelo (1 = secuencial, 0 = todos los núcleos)
+        usar_cache: reutilizar resultados de archivos sin cambios entre ejecuciones
+        ruta_cache: archivo de la caché (por defecto .auditoria_okr_cache.json en la ruta del curso)
+        motor_audio: "pydub" (criterios originales en Python puro) o "numpy" (vectorizado; con audio de 32 bits el redondeo puede diferir en el umbral)
+        ruta_inventario: si se indica, exportar ahí (JSON) el inventario de archivos de cada ejecución
+        servidor_languagetool: "HOST:PUERTO" de un servidor LanguageTool persistente (se arranca si no existe)
+        concurrencia_ortografia: documentos revisados a la vez (consultas simultáneas a LanguageTool)
+        ruta_tiempos: JSON con los tiempos por etapa (por defecto junto al reporte, *_tiempos.json)
+        corrector: objeto con check(texto) a usar en lugar de LanguageTool (p. ej. un sustituto local)
+        filas_por_pagina: si se indica, el reporte se divide en un índice y páginas por módulo con esa cantidad de filas
+        revisar_tablas: revisar también tablas, encabezados, pies de página, cuadros de texto y notas de los .docx
+        especificacion: EspecificacionCurso para cursos sin su propio especificacion_curso.json (por defecto, el curso OKR)
+        etapas_concurrentes: ejecutar estructura, ortografía, videos y audio solapadas en lugar de una tras otra
+        ventanas_muestreo, segundos_ventana: ventanas repartidas por el video que se decodifican en modo muestreo
+        veredicto_rapido: control aprobado/rechazado; se deja de decodificar un video en cuanto es crítico con seguridad
+        historial: guardar las métricas de audio de cada ejecución en SQLite (y reutilizarlas si el video no cambió)
+        ruta_historial: base SQLite del historial (por defecto .auditoria_okr_historial.sqlite3 en la ruta del curso)
+        reporte_en_disco: guardar las filas del reporte en una base temporal en disco a medida que se producen,
+                          así la memoria no crece con la cantidad de hallazgos (auditorías de portafolio muy grandes)
+        coordinador: CoordinadorAuditoria que reparte la revisión de documentos y el audio de videos entre
+                     trabajadores de otros procesos o hosts, en lugar de resolverlos en esta máquina
         """
+        if modo_audio not in MODOS_AUDIO:
+            raise ValueError(f"modo_audio debe ser uno de {MODOS_AUDIO}, no '{modo_audio}'")
+        if motor_audio not in MOTORES_AUDIO:
+            raise ValueError(f"motor_audio debe ser uno de {MOTORES_AUDIO}, no '{motor_audio}'")
+        if ventanas_muestreo < 2 or segundos_ventana <= 0:
+            raise ValueError("El muestreo de audio necesita al menos 2 ventanas de duración positiva")
+        if filas_por_pagina is not None and filas_por_pagina < 1:
+            raise ValueError(f"filas_por_pagina debe ser al menos 1, no {filas_por_pagina}")
+
         self.ruta_base = Path(ruta_sharepoint)
+        self.modo_audio = modo_audio
+        self.motor_audio = motor_audio
+        self.ventanas_muestreo = ventanas_muestreo
+        self.segundos_ventana = segundos_ventana
+        self.veredicto_rapido = veredicto_rapido
+        self.almacen_reporte = AlmacenReporte() if reporte_en_disco else None
+        self.ruta_inventario = ruta_inventario
+        self.concurrencia_ortografia = max(1, concurrencia_ortografia)
+        self.bloque_pcm_bytes = bloque_pcm_bytes
+        self.trabajadores_audio = trabajadores_audio or os.cpu_count() or 1
+        self.ruta_tiempos = ruta_tiempos
+        self.filas_por_pagina = filas_por_pagina
+        self.revisar_tablas = revisar_tablas
+        self.ruta_cache = ruta_cache
+        self.ruta_historial = ruta_historial
+        self.especificacion_defecto = especificacion
+        self.etapas_concurrentes = etapas_concurrentes
+        # En modo vigilancia cada ciclo reescribe el mismo reporte en lugar de sumar uno nuevo a la carpeta
+        self.reporte_fijo = False
+        self.coordinador = coordinador
+        self.medidor = MedidorEtapas()
+        self._pool_audio = None
         
         # Inicializar LanguageTool
         print("🔧 Inicializando LanguageTool...")
-        try:
-            self.spell_checker = language_tool_python.LanguageTool('es')
-            print("✅ LanguageTool cargado correctamente")
-        except Exception as e:
-            print(f"❌ Error cargando LanguageTool: {e}")
-            self.spell_checker = None
+        with self.medidor.etapa("inicio_languagetool", fija=True):
+            try:
+                self.firma_corrector = "LanguageTool-es"
+                if corrector is not None:
+                    self.spell_checker = corrector
+                    self.firma_corrector = type(corrector).__name__
+                    print(f"✅ Corrector externo: {type(corrector).__name__}")
+                elif servidor_languagetool:
+                    # Servidor caliente compartido entre auditorías (se arranca si no está vivo)
+                    servidor = ServidorLanguageTool.desde_direccion(servidor_languagetool)
+                    self.spell_checker = CorrectorSupervisado(servidor, 'es')
+                    print(f"✅ LanguageTool conectado al servidor {servidor.url}")
+                else:
+                    self.spell_checker = language_tool_python.LanguageTool('es')
+                    print("✅ LanguageTool cargado correctamente")
+            except Exception as e:
+                print(f"❌ Error cargando LanguageTool: {e}")
+                self.spell_checker = None
 
         # Inicializar lista de palabras en inglés
         print("🔧 Inicializando lista de palabras en inglés...")
-        try:
-            self.english_words = set(w.lower() for w in words.words())
-            print("✅ Creando lista de palabras en inglés")
-        except Exception as e:
-            print(f"❌ Error cargando palabras en inglés: {e}")
-            self.english_words = None
+        with self.medidor.etapa("inicio_lexico_ingles", fija=True):
+            try:
+                # Lexicón precompilado y mapeado en memoria (se genera desde NLTK solo la primera vez)
+                self.english_words = abrir_lexico_ingles()
+                print(f"✅ Lista de palabras en inglés: {len(self.english_words)} palabras "
+                      f"({'lexicón compacto' if isinstance(self.english_words, LexicoCompacto) else 'en memoria'})")
+            except Exception as e:
+                print(f"❌ Error cargando palabras en inglés: {e}")
+                self.english_words = None
 
-        self.reporte = {
-            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            "resumen_ejecutivo": {
-                "archivos_revisados": 0,
-                "problemas_criticos": 0,
-                "problemas_menores": 0,
-                "archivos_ok": 0,
-                "porcentaje_completitud": 0
-            },
-            "estructura_modulos": {},
-            "errores_ortograficos": [],
-            "videos_problematicos": [],
-            "problemas_audio": [],  # ✅ AGREGADO: Sección para audio
-            "archivos_faltantes": [],
-            "problemas_criticos": [],
-            "problemas_menores": [],
-            "recomendaciones": []
-        }
-        
-        # Contenido esperado (igual que tu original)
-        self.contenido_esperado = {
-            "MODULO 1": {
-                "nombre": "Introducción a los OKR I",
-                "subtemas": [
-                    "1.1 Origen y evolución de la gestión de metas okr",
-                    "1.2 Concepto, estructura y empresas que los utilizan", 
-                    "1.3 Diferencia entre objetivos y resultados clave",
-                    "1.4 Tipos de OKR: comprometidos vs. aspiracionales",
-                    "1.5 Jerarquía y alineación de los OKR"
-                ]
-            },
-            "MODULO 2": {
-                "nombre": "Introducción a los OKR II",
-                "subtemas": [
-                    "2.1 Comparación entre MBO, SMART, KPIs y OKR",
-                    "2.2 Integración de OKR con modelos estratégicos (BSC, Hoshin Kanri)",
-                    "2.3 Cultura organizacional y alineación con la misión y visión",
-                    "2.4 Liderazgo ágil y su impacto en los OKR",
-                    "2.5 Beneficios y desafíos de implementar OKR"
-                ]
-            },
-            "MODULO 3": {
-                "nombre": "Gestión con los OKR",
-                "subtemas": [
-                    "3.1 Roles clave, OKR Champion y OKR Owner",
-                    "3.2 Relación entre OKR y gestión del desempeño (CFR)",
-                    "3.3 Uso de herramientas y tableros Kanban para OKR",
-                    "3.4 Implementación de OKR en la mejora continua",
-                    "3.5 Principales errores y cómo evitarlos"
-                ]
-            },
-            "MODULO 4": {
-                "nombre": "Ajustes de los OKR I",
-                "subtemas": [
-                    "4.1 Proceso de implementación de OKR en la organización",
-                    "4.2 Ciclo de planeación y cronograma de seguimiento",
-                    "4.3 Pasos clave para definir OKR efectivos",
-                    "4.4 Evaluación y ajuste de OKR en equipos",
-                    "4.5 Buenas prácticas para la ejecución exitosa"
-                ]
-            },
-            "MODULO 5": {
-                "nombre": "Ajustando los OKR II",
-                "subtemas": [
-                    "5.1 Creación y estructuración de un OKR efectivo",
-                    "5.2 Métodos y herramientas para idear OKR (Brainwriting, Canvas)",
-                    "5.3 Ejemplos prácticos de aplicación en empresas",
-                    "5.4 Diseño de plantillas y formatos de trabajo",
-                    "5.5 Análisis de un caso de estudio real"
-                ]
-            },
-            "MODULO 6": {
-                "nombre": "Alineando los OKR",
-                "subtemas": [
-                    "6.1 Estrategias para lograr alineación organizacional",
-                    "6.2 Alineación vertical y horizontal de objetivos",
-                    "6.3 Importancia de la cadencia y revisión de OKR",
-                    "6.4 Métodos de evaluación y calificación de OKR",
-                    "6.5 Beneficios de los chequeos y revisiones periódicas"
-                ]
-            }
-        }
+        self.reporte = self.reporte_vacio()
         
         # ✅ LISTA COMPLETA Y OPTIMIZADA DE PALABRAS VÁLIDAS
         self.palabras_validas = {
@@ -191,15 +2610,237 @@ class AuditorOKROptimizado:
         self.palabras_validas.update(palabras_de_tu_reporte)
         print(f"✅ EXPANDIDO: +{len(palabras_de_tu_reporte)} palabras de tu reporte")
 
+        # Palabras válidas comunes a todos los cursos; cada especificación puede sumar las suyas
+        self.palabras_base = set(self.palabras_validas)
+        self.especificacion = None
+        self.usar_especificacion(EspecificacionCurso.para_curso(self.ruta_base, especificacion))
+
+        # Inventario del árbol del curso (un único escaneo por ejecución)
+        self.inventario = None
+        # Cabeceras de contenedor ya leídas en esta ejecución (videos y audio las comparten, también
+        # desde hilos distintos con etapas concurrentes)
+        self.sondeos = {}
+        self._lock_sondeos = threading.Lock()
+
+        # Caché incremental de resultados por archivo
+        self.cache = None
+        self.cache_parrafos = None
+        if usar_cache:
+            self.activar_cache(ruta_cache)
+
+        # Historial de métricas de audio entre ejecuciones
+        self.historial = None
+        if historial:
+            self.activar_historial(ruta_historial)
+
+    def usar_especificacion(self, especificacion):
+        """Ficha del curso a auditar; el filtro se recompila solo si cambian las palabras válidas"""
+        palabras = self.palabras_base | especificacion.palabras_validas
+        if self.especificacion is None or palabras != self.palabras_validas:
+            self.palabras_validas = palabras
+            # Filtro de falsos positivos compilado una sola vez por conjunto de palabras
+            self.filtro_errores = FiltroFalsosPositivos(self.palabras_validas, self.english_words)
+        self.especificacion = especificacion
+        self.contenido_esperado = especificacion.modulos
+        print(f"📋 Especificación: curso {especificacion.nombre} ({len(especificacion.modulos)} módulos)")
+
+    def cambiar_curso(self, ruta_sharepoint, especificacion=None):
+        """Apuntar el auditor a otro curso conservando LanguageTool, lexicones y procesos de audio"""
+        self.ruta_base = Path(ruta_sharepoint)
+        self.usar_especificacion(especificacion or EspecificacionCurso.para_curso(self.ruta_base, self.especificacion_defecto))
+        self.inventario = None
+        self.reiniciar_reporte()
+        if self.cache:
+            self.activar_cache(self.ruta_cache)
+        if self.historial and not self.ruta_historial:
+            # Sin una ruta común, cada curso lleva su propio historial
+            self.activar_historial()
+
+    def activar_historial(self, ruta_historial=None):
+        ruta_historial = Path(ruta_historial) if ruta_historial else self.ruta_base / ".auditoria_okr_historial.sqlite3"
+        if self.historial:
+            self.historial.cerrar()
+        self.historial = HistorialMetricas(ruta_historial)
+        print(f"✅ Historial de métricas: {ruta_historial}")
+        return self.historial
+
+    def firma_audio(self):
+        """Hash de la configuración que influye en las métricas de audio"""
+        # "completo" y "streaming" dan las mismas métricas
+        config = {
+            "muestreo_audio": [self.ventanas_muestreo, self.segundos_ventana] if self.modo_audio == "muestreo" else None,
+            "veredicto_rapido": self.veredicto_rapido
+        }
+        if self.motor_audio != "pydub":
+            # Con 32 bits ambos suman en float64 pero en otro orden: justo en el umbral el redondeo puede diferir
+            config["motor_audio"] = self.motor_audio
+        return hashlib.sha256(json.dumps(config).encode('utf-8')).hexdigest()
+
+    def activar_cache(self, ruta_cache=None):
+        ruta_cache = Path(ruta_cache) if ruta_cache else self.ruta_base / ".auditoria_okr_cache.json"
+        self.cache = CacheAuditoria(ruta_cache, self.firma_configuracion())
+        # Los documentos modificados solo reenvían a LanguageTool los párrafos que cambiaron
+        self.cache_parrafos = CacheParrafos(ruta_cache.with_name(ruta_cache.stem + "_parrafos.json"), self.firma_corrector)
+        print(f"✅ Caché incremental: {ruta_cache}")
+        return self.cache
+
+    def firma_configuracion(self):
+        """Hash de todo lo que influye en los resultados por archivo"""
+        config = {
+            "palabras_validas": sorted(self.palabras_validas),
+            "palabras_ingles": len(self.english_words) if self.english_words else 0,
+            "revisar_tablas": self.revisar_tablas
+        }
+        if self.modo_audio == "muestreo":
+            # Las métricas estimadas no valen como resultado de un análisis completo
+            config["muestreo_audio"] = [self.ventanas_muestreo, self.segundos_ventana]
+        if self.veredicto_rapido:
+            # Los videos cortados a mitad guardan métricas parciales
+            config["veredicto_rapido"] = True
+        if self.motor_audio != "pydub":
+            # Mismo criterio que firma_audio: las métricas de un motor no se sirven al otro
+            config["motor_audio"] = self.motor_audio
+        return hashlib.sha256(json.dumps(config, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+    def reporte_vacio(self):
+        """Estructura del reporte antes de auditar (también al repetir la auditoría en modo vigilancia)"""
+        # Con reporte_en_disco las listas de hallazgos escriben sus filas en el almacén temporal
+        lista = self.almacen_reporte.nueva_lista if self.almacen_reporte else list
+        return {
+            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "resumen_ejecutivo": {
+                "archivos_revisados": 0,
+                "problemas_criticos": 0,
+                "problemas_menores": 0,
+                "archivos_ok": 0,
+                "porcentaje_completitud": 0,
+                # Se cuenta al incorporar cada video: así no hace falta recorrer problemas_audio (puede estar en disco)
+                "videos_audio_con_problemas": 0
+            },
+            "estructura_modulos": {},
+            "errores_ortograficos": lista(),
+            "videos_problematicos": lista(),
+            "problemas_audio": lista(),  # ✅ AGREGADO: Sección para audio
+            "archivos_faltantes": lista(),
+            "problemas_criticos": lista(),
+            "problemas_menores": lista(),
+            "recomendaciones": lista()
+        }
+
+    def reiniciar_reporte(self):
+        """Reporte vacío para una nueva ejecución; las filas en disco del anterior se descartan"""
+        for valor in (self.reporte or {}).values():
+            if isinstance(valor, ListaEnDisco):
+                valor.descartar()
+        self.reporte = self.reporte_vacio()
+
+    def obtener_de_cache(self, tipo, archivo, modulo):
+        """Resultado guardado para un archivo sin cambios, reetiquetado con su nombre y módulo actuales"""
+        if not self.cache:
+            return None
+        resultado = self.cache.obtener(tipo, archivo, *self._stat_inventario(archivo))
+        if resultado is None:
+            return None
+        
+        # La caché es por contenido: el mismo archivo pudo moverse o renombrarse
+        for valor in resultado.values():
+            for entrada in (valor if isinstance(valor, list) else [valor]):
+                if isinstance(entrada, dict):
+                    if "archivo" in entrada:
+                        entrada["archivo"] = archivo.name
+                    if "modulo" in entrada:
+                        entrada["modulo"] = modulo
+        return resultado
+
+    def guardar_en_cache(self, tipo, archivo, resultado):
+        if self.cache:
+            self.cache.guardar(tipo, archivo, resultado, *self._stat_inventario(archivo))
+
+    def obtener_inventario(self):
+        """Inventario del curso; se escanea una sola vez por ejecución"""
+        if self.inventario is None:
+            print("📂 Escaneando árbol del curso...")
+            self.inventario = InventarioCurso.escanear(self.ruta_base)
+            print(f"✅ Inventario: {len(self.inventario.archivos)} archivos en {len(self.inventario.carpetas)} carpetas")
+        return self.inventario
+
+    def _stat_inventario(self, archivo):
+        """(tamaño, mtime_ns) ya conocidos por el inventario, sin volver a hacer stat"""
+        entrada = self.inventario.buscar(archivo) if self.inventario else None
+        return (entrada.tamaño, entrada.mtime_ns) if entrada else (None, None)
+
+    def __getstate__(self):
+        """Copia ligera para los procesos de trabajo: sin LanguageTool, lexicón ni reporte"""
+        estado = self.__dict__.copy()
+        estado["spell_checker"] = None
+        estado["english_words"] = None
+        estado["filtro_errores"] = None
+        estado["reporte"] = None
+        estado["cache"] = None
+        estado["cache_parrafos"] = None
+        estado["historial"] = None
+        estado["almacen_reporte"] = None
+        estado["coordinador"] = None
+        estado["inventario"] = None
+        estado["medidor"] = None
+        estado["_pool_audio"] = None
+        estado["_lock_sondeos"] = None
+        return estado
+
+    def __setstate__(self, estado):
+        self.__dict__.update(estado)
+        self._lock_sondeos = threading.Lock()
+
+    def pool_audio(self):
+        """Procesos de análisis de audio, creados una vez y reutilizados entre ejecuciones y cursos"""
+        if self._pool_audio is None:
+            from concurrent.futures import ProcessPoolExecutor
+            self._pool_audio = ProcessPoolExecutor(max_workers=self.trabajadores_audio)
+        return self._pool_audio
+
+    def cerrar(self):
+        """Terminar los procesos de audio y cerrar historial, almacén del reporte y cola distribuida (al salir)"""
+        if self._pool_audio is not None:
+            self._pool_audio.shutdown(cancel_futures=True)
+            self._pool_audio = None
+        if self.coordinador is not None:
+            self.coordinador.cerrar()
+            self.coordinador = None
+        if self.historial is not None:
+            self.historial.cerrar()
+            self.historial = None
+        if self.almacen_reporte is not None:
+            self.almacen_reporte.cerrar()
+            self.almacen_reporte = None
+
+    def _medir(self, funcion, *args, **kwargs):
+        """
+        Ejecutar funcion(*args, **kwargs) y devolver (resultado, medida) con el tiempo real y la CPU
+        del hilo que la ejecutó; si se pasa medida={...}, se agregan las fases que registre la función
+        """
+        inicio = time.perf_counter()
+        cpu_inicio = time.thread_time()
+        resultado = funcion(*args, **kwargs)
+        medida = {"tiempo_s": time.perf_counter() - inicio, "cpu_s": time.thread_time() - cpu_inicio}
+        medida.update(kwargs.get("medida") or {})
+        return resultado, medida
+
+    def registrar_medida(self, ruta, bytes_archivo=0, medida=None, origen="procesado", **detalle):
+        """Anotar un archivo en la etapa que se está midiendo (si la hay)"""
+        if self.medidor is None or self.medidor.actual is None:
+            return
+        detalle.update(medida or {})
+        self.medidor.actual.registrar_archivo(ruta, bytes_archivo, origen=origen, **detalle)
+
     # ✅ FUNCIÓN MEJORADA PARA VERIFICAR Y COPIAR LOGO
-    def verificar_logo_existe(self):
+    def verificar_logo_existe(self, carpeta_destino=None):
         """Verificar si existe el logo y copiarlo al directorio del reporte si es necesario"""
         import shutil
         
         # Buscar logo en la carpeta del proyecto (donde está el .py)
         logo_proyecto = Path("logo-3it.png")
         # Ubicación donde se guardará el reporte HTML
-        logo_destino = self.ruta_base / "logo-3it.png"
+        logo_destino = Path(carpeta_destino or self.ruta_base) / "logo-3it.png"
         
         if logo_proyecto.exists():
             try:
@@ -233,100 +2874,40 @@ class AuditorOKROptimizado:
                 print(f"❌ Error instalando PyDub: {e}")
                 return False
 
-    def detectar_problemas_audio_optimizado(self, ruta_video):
+    def detectar_problemas_audio_optimizado(self, ruta_video, mostrar_progreso=True):
         """MÉTODO COMPLETO: Análisis de TODO EL VIDEO"""
         try:
-            from pydub import AudioSegment
-            from pydub.silence import detect_silence
+            if mostrar_progreso:
+                if self.modo_audio == "muestreo":
+                    print("📊 Analizando audio por muestreo...", end=" ", flush=True)
+                else:
+                    modo = " (streaming)" if self.modo_audio == "streaming" else ""
+                    print(f"📊 Analizando audio completo{modo}...", end=" ", flush=True)
             
-            print(f"📊 Analizando audio completo...", end=" ", flush=True)
-            
-            # Extraer audio del video COMPLETO
-            audio = AudioSegment.from_file(str(ruta_video))
-            
-            # Métricas básicas del video COMPLETO
-            duracion_total = len(audio) / 1000
-            max_volumen = audio.max_dBFS
-            
-            # Análisis COMPLETO de silencios
-            silencios = detect_silence(audio, min_silence_len=2000, silence_thresh=-50)
-            duracion_silencios = sum(end - start for start, end in silencios) / 1000
-            porcentaje_silencio = (duracion_silencios / duracion_total) * 100 if duracion_total > 0 else 100
-            
-            # Análisis de consistencia de volumen
-            segmentos = []
-            chunk_size = 10000
-            for i in range(0, len(audio), chunk_size):
-                chunk = audio[i:i+chunk_size]
-                if len(chunk) > 1000:
-                    segmentos.append(chunk.max_dBFS)
-            
-            if len(segmentos) > 1:
-                import statistics
-                volumen_promedio = statistics.mean(segmentos)
-                volumen_desviacion = statistics.stdev(segmentos) if len(segmentos) > 1 else 0
-                volumen_minimo = min(segmentos)
+            if self.modo_audio == "muestreo":
+                medidas = self.medir_audio_muestreo(ruta_video)
+            elif self.modo_audio == "streaming" or self.veredicto_rapido:
+                # El veredicto rápido necesita ir viendo el audio por bloques
+                medidas = self.medir_audio_streaming(ruta_video)
             else:
-                volumen_promedio = max_volumen
-                volumen_desviacion = 0
-                volumen_minimo = max_volumen
-            
-            # Evaluar problemas específicos
-            problemas = []
-            nivel_critico = False
-            
-            # 1. SIN AUDIO (crítico)
-            if max_volumen < -60:
-                problemas.append("SIN AUDIO AUDIBLE")
-                nivel_critico = True
-            
-            # 2. AUDIO SATURADO (crítico)
-            elif max_volumen > -1:
-                problemas.append("AUDIO SATURADO/DISTORSIONADO")
-                nivel_critico = True
-            
-            # 3. DEMASIADO SILENCIO (crítico para cursos)
-            elif porcentaje_silencio > 40:
-                problemas.append(f"EXCESO DE SILENCIO ({porcentaje_silencio:.1f}%)")
-                nivel_critico = True
-            
-            # 4. VIDEO MUY CORTO (crítico para cursos)
-            elif duracion_total < 30:
-                problemas.append(f"VIDEO MUY CORTO ({duracion_total:.1f}s)")
-                nivel_critico = True
-            
-            # 5. PROBLEMAS MENORES
-            elif porcentaje_silencio > 25:
-                problemas.append(f"BASTANTE SILENCIO ({porcentaje_silencio:.1f}%)")
-            elif max_volumen < -40:
-                problemas.append("AUDIO MUY BAJO")
-            elif len(silencios) > 15:
-                problemas.append(f"MUCHOS CORTES ({len(silencios)} silencios)")
-            elif volumen_desviacion > 10:
-                problemas.append(f"VOLUMEN INCONSISTENTE (±{volumen_desviacion:.1f}dB)")
-            elif volumen_minimo < -50 and max_volumen > -20:
-                problemas.append("AUDIO CON PICOS Y VALLES")
-            
-            print("✅")
+                medidas = self.medir_audio_completo(ruta_video)
             
-            return {
-                "tiene_problemas": len(problemas) > 0,
-                "es_critico": nivel_critico,
-                "problemas": problemas,
-                "metricas": {
-                    "duracion": duracion_total,
-                    "volumen_max": max_volumen,
-                    "volumen_promedio": volumen_promedio,
-                    "volumen_minimo": volumen_minimo,
-                    "volumen_desviacion": volumen_desviacion,
-                    "porcentaje_silencio": porcentaje_silencio,
-                    "cantidad_silencios": len(silencios),
-                    "duracion_silencios": duracion_silencios
-                }
-            }
+            resultado = self.evaluar_problemas_audio(medidas)
+            if "muestreo" in medidas:
+                resultado["muestreo"] = medidas["muestreo"]
+            if "veredicto_anticipado" in medidas:
+                # Crítico con seguridad: las métricas son solo del tramo decodificado
+                anticipado = medidas["veredicto_anticipado"]
+                resultado.update(tiene_problemas=True, es_critico=True, problemas=[anticipado["problema"]])
+                resultado["metricas"]["duracion"] = anticipado["duracion_s"]
+                resultado["veredicto_anticipado"] = anticipado
+            if mostrar_progreso:
+                print("✅")
+            return resultado
             
         except Exception as e:
-            print(f"❌")
+            if mostrar_progreso:
+                print(f"❌")
             # ✅ CORRECCIÓN: Desde línea 320 en adelante
 
             return {
@@ -345,29 +2926,352 @@ class AuditorOKROptimizado:
                 }
             }
 
+    def medir_audio_completo(self, ruta_video):
+        """Medidas de audio decodificando el video COMPLETO en memoria con PyDub"""
+        from pydub import AudioSegment
+        from pydub.silence import detect_silence
+        
+        # Extraer audio del video COMPLETO
+        audio = AudioSegment.from_file(str(ruta_video))
+        
+        if self.motor_audio == "numpy":
+            # Mismo cálculo vectorizado, por lotes sobre el PCM ya decodificado
+            analizador = AnalizadorAudioNumpy(audio.frame_rate, audio.channels, audio.sample_width)
+            datos = memoryview(audio.raw_data)
+            tamaño_bloque = max(analizador.ancho_frame, self.bloque_pcm_bytes - self.bloque_pcm_bytes % analizador.ancho_frame)
+            for inicio in range(0, len(datos), tamaño_bloque):
+                analizador.alimentar(datos[inicio:inicio + tamaño_bloque])
+            return analizador.finalizar()
+        
+        # Análisis COMPLETO de silencios
+        silencios = detect_silence(audio, min_silence_len=2000, silence_thresh=-50)
+        
+        # Análisis de consistencia de volumen
+        segmentos = []
+        chunk_size = 10000
+        for i in range(0, len(audio), chunk_size):
+            chunk = audio[i:i+chunk_size]
+            if len(chunk) > 1000:
+                segmentos.append(chunk.max_dBFS)
+        
+        return {
+            "duracion_total": len(audio) / 1000,
+            "max_volumen": audio.max_dBFS,
+            "segmentos": segmentos,
+            "cantidad_silencios": len(silencios),
+            "duracion_silencios": sum(end - start for start, end in silencios) / 1000
+        }
+
+    def medir_audio_streaming(self, ruta_video):
+        """
+        Medidas de audio leyendo bloques PCM de tamaño fijo desde un pipe de ffmpeg.
+        La memoria no depende de la duración del video; el resultado es el mismo que medir_audio_completo
+        """
+        info, pista, formato, ancho = self._formato_pcm(ruta_video)
+        analizador = self._nuevo_analizador(pista, ancho)
+        if not self.veredicto_rapido:
+            self._decodificar_pcm(ruta_video, formato, ancho, analizador)
+            return analizador.finalizar()
+        
+        # Tras cada bloque se revisa si el video ya es crítico con seguridad
+        duracion = self._duracion_video(ruta_video, info)
+        detener = lambda: self.veredicto_critico_seguro(analizador, duracion) is not None
+        if not self._decodificar_pcm(ruta_video, formato, ancho, analizador, detener=detener):
+            return analizador.finalizar()
+        
+        motivo = self.veredicto_critico_seguro(analizador, duracion)
+        decodificado_s = analizador.frames_totales / analizador.frame_rate
+        medidas = analizador.finalizar()
+        medidas["veredicto_anticipado"] = {
+            "problema": motivo,
+            "decodificado_s": round(decodificado_s, 1),
+            "duracion_s": round(duracion, 1)
+        }
+        return medidas
+
+    @staticmethod
+    def veredicto_critico_seguro(analizador, duracion):
+        """
+        Problema crítico que ya no puede cambiar por más audio que falte decodificar (o None).
+        Sirve para un control aprobado/rechazado: siempre es crítico, aunque si el video
+        tiene varios problemas críticos el que se informa puede no ser el primero de la lista
+        """
+        from pydub.utils import ratio_to_db
+        
+        # El pico solo puede subir: por encima de -1 dBFS el veredicto completo también es SATURADO
+        if analizador.max_absoluto and ratio_to_db(analizador.max_absoluto, analizador.max_amplitud_posible) > -1:
+            return "AUDIO SATURADO/DISTORSIONADO"
+        if not duracion:
+            return None
+        # Duración del contenedor, con 1 s de tolerancia frente a la decodificada
+        if duracion + 1 < 30:
+            return f"VIDEO MUY CORTO ({duracion:.1f}s)"
+        silencio = analizador.silencio_confirmado_ms() / 1000
+        if silencio > 0.4 * (duracion + 1):
+            return f"EXCESO DE SILENCIO (≥{100 * silencio / duracion:.1f}%)"
+        return None
+
+    def _duracion_video(self, ruta_video, info):
+        """Duración por la cabecera del contenedor o, si no se reconoce, la que informa ffprobe"""
+        sondeo = self.sondear_video(Path(ruta_video))
+        return (sondeo or {}).get("duracion") or float(info.get("format", {}).get("duration") or 0)
+
+    def medir_audio_muestreo(self, ruta_video):
+        """
+        Medidas ESTIMADAS decodificando solo ventanas_muestreo ventanas de segundos_ventana, una en el
+        centro de cada tramo igual del video (ffmpeg salta hasta ellas con -ss). Cada estimación lleva
+        su intervalo de ~95 %; si alguno contiene un umbral de evaluar_problemas_audio, el video se
+        analiza completo (en streaming) porque el veredicto podría ser otro
+        """
+        info, pista, formato, ancho = self._formato_pcm(ruta_video)
+        duracion = self._duracion_video(ruta_video, info)
+        n, largo = self.ventanas_muestreo, self.segundos_ventana
+        
+        # Si las ventanas cubren la mitad del video o más, decodificarlo entero cuesta casi lo mismo
+        if duracion <= 2 * n * largo:
+            return self.medir_audio_streaming(ruta_video)
+        
+        # Cada ventana empieza en la frontera de un chunk de 10 s, así sus segmentos son
+        # exactamente chunks del análisis completo (una muestra de ellos, no otra medida)
+        tramo = duracion / n
+        ventanas = []
+        for i in range(n):
+            inicio = (i * tramo + (tramo - largo) / 2) // 10 * 10
+            analizador = self._nuevo_analizador(pista, ancho)
+            self._decodificar_pcm(ruta_video, formato, ancho, analizador, inicio_s=inicio, duracion_s=largo)
+            medidas_ventana = analizador.finalizar()
+            medidas_ventana["continua_silencio"] = analizador.primer_silencio_ms == 0
+            ventanas.append(medidas_ventana)
+        
+        medidas, intervalos = self.estimar_medidas_audio(ventanas, duracion)
+        cerca = [metrica for metrica, (inferior, superior) in intervalos.items()
+                 if any(inferior <= umbral <= superior for umbral in UMBRALES_AUDIO.get(metrica, ()))]
+        muestreo = {
+            "ventanas": n,
+            "segundos_ventana": largo,
+            "cobertura": round(100 * n * largo / duracion, 1),
+            "intervalos": {metrica: [round(inferior, 2), round(superior, 2)] for metrica, (inferior, superior) in intervalos.items()},
+            "escalado": bool(cerca),
+            "motivo": f"cerca del umbral: {', '.join(cerca)}" if cerca else None
+        }
+        if cerca:
+            medidas = self.medir_audio_streaming(ruta_video)
+        medidas["muestreo"] = muestreo
+        return medidas
+
+    @staticmethod
+    def estimar_medidas_audio(ventanas, duracion):
+        """
+        Medidas del video completo a partir de las ventanas, con el mismo formato que finalizar(),
+        y el intervalo (inferior, superior) de cada métrica que usa evaluar_problemas_audio
+        """
+        import statistics
+        
+        n = len(ventanas)
+        muestreado = sum(v["duracion_total"] for v in ventanas)
+        # Corrección por población finita: con más cobertura, menos incertidumbre
+        correccion = math.sqrt(max(0.0, 1 - muestreado / duracion))
+        
+        fracciones = [v["duracion_silencios"] / v["duracion_total"] if v["duracion_total"] > 0 else 1.0 for v in ventanas]
+        fraccion = statistics.mean(fracciones)
+        margen = Z_CONFIANZA * statistics.stdev(fracciones) / math.sqrt(n) * correccion
+        intervalos = {"porcentaje_silencio": (100 * max(0.0, fraccion - margen), 100 * min(1.0, fraccion + margen))}
+        
+        # El pico muestreado es una cota inferior del pico real (y el mínimo, una superior)
+        maximo = max(v["max_volumen"] for v in ventanas)
+        intervalos["volumen_max"] = (maximo, maximo + MARGEN_MUESTREO_DB)
+        segmentos = [s for v in ventanas for s in v["segmentos"]]
+        finitos = [s for s in segmentos if math.isfinite(s)]
+        if len(finitos) > 1:
+            intervalos["volumen_minimo"] = (min(segmentos) - MARGEN_MUESTREO_DB, min(segmentos))
+            desviacion = statistics.stdev(finitos)
+            margen = Z_CONFIANZA * desviacion / math.sqrt(2 * (len(finitos) - 1))
+            intervalos["volumen_desviacion"] = (max(0.0, desviacion - margen), desviacion + margen)
+        
+        # Cortes: silencios que empiezan dentro de las ventanas (conteo de Poisson), escalados a la duración total.
+        # Un silencio solo se detecta si le caben 2 s antes del final de la ventana
+        observado = sum(max(0.0, v["duracion_total"] - 2) for v in ventanas)
+        escala = duracion / observado if observado > 0 else 1.0
+        cortes = sum(v["cantidad_silencios"] - v.get("continua_silencio", False) for v in ventanas)
+        margen = Z_CONFIANZA * math.sqrt(max(cortes, 1))
+        intervalos["cantidad_silencios"] = (max(0.0, cortes - margen) * escala, (cortes + margen) * escala)
+        
+        medidas = {
+            "duracion_total": duracion,
+            "max_volumen": maximo,
+            "segmentos": segmentos,
+            "cantidad_silencios": round(cortes * escala),
+            "duracion_silencios": fraccion * duracion
+        }
+        return medidas, intervalos
+
+    def _formato_pcm(self, ruta_video):
+        """(info de ffprobe, primera pista de audio, formato y ancho de muestra) que elegiría AudioSegment.from_file"""
+        from pydub.utils import mediainfo_json
+        
+        info = mediainfo_json(str(ruta_video))
+        pistas_audio = [x for x in info.get("streams", []) if x.get("codec_type") == "audio"]
+        if not pistas_audio:
+            raise ValueError("El video no contiene pista de audio")
+        pista = pistas_audio[0]
+        
+        if (pista.get("sample_fmt") == "fltp" and
+                pista.get("codec_name") in ["mp3", "mp4", "aac", "webm", "ogg"]):
+            bits = 16
+        else:
+            bits = int(pista.get("bits_per_sample") or 16)
+        
+        if bits == 8:
+            return info, pista, "u8", 1
+        elif bits <= 16:
+            return info, pista, "s16le", 2
+        # PyDub también convierte 24 bits a 32 bits
+        return info, pista, "s32le", 4
+
+    def _nuevo_analizador(self, pista, ancho):
+        clase_analizador = AnalizadorAudioNumpy if self.motor_audio == "numpy" else AnalizadorAudioIncremental
+        return clase_analizador(int(pista["sample_rate"]), int(pista["channels"]), ancho)
+
+    def _decodificar_pcm(self, ruta_video, formato, ancho, analizador, inicio_s=None, duracion_s=None, detener=None):
+        """
+        Pasar al analizador el PCM que entrega ffmpeg, por bloques; con inicio_s solo esa ventana.
+        Si detener() devuelve True tras un bloque, se corta ffmpeg y se devuelve True
+        """
+        from pydub import AudioSegment
+        
+        tamaño_bloque = max(analizador.ancho_frame, self.bloque_pcm_bytes - self.bloque_pcm_bytes % analizador.ancho_frame)
+        comando = [AudioSegment.converter, "-v", "error"]
+        if inicio_s is not None:
+            # -ss/-t antes de -i: el demuxer salta directamente a la ventana, sin decodificar lo anterior
+            comando += ["-ss", f"{inicio_s:.3f}", "-t", f"{duracion_s:.3f}"]
+        comando += ["-i", str(ruta_video), "-vn", "-acodec", f"pcm_{formato}", "-f", formato, "-"]
+        
+        detenido = False
+        with tempfile.TemporaryFile() as errores_ffmpeg:
+            proceso = subprocess.Popen(comando, stdout=subprocess.PIPE, stderr=errores_ffmpeg)
+            try:
+                bloque = proceso.stdout.read(tamaño_bloque)
+                while bloque:
+                    if ancho == 1:
+                        # PCM de 8 bits sin signo, igual que AudioSegment
+                        bloque = audioop.bias(bloque, 1, -128)
+                    analizador.alimentar(bloque)
+                    bloque = proceso.stdout.read(tamaño_bloque)
+                    # Solo se corta si aún queda audio: con el archivo completo el veredicto es el exacto
+                    if bloque and detener is not None and detener():
+                        detenido = True
+                        break
+            finally:
+                if detenido:
+                    proceso.kill()
+                proceso.stdout.close()
+                codigo = proceso.wait()
+            
+            if detenido:
+                return True
+            if codigo != 0 or analizador.frames_totales == 0:
+                errores_ffmpeg.seek(0)
+                detalle = errores_ffmpeg.read().decode(errors="ignore").strip()
+                raise RuntimeError(f"ffmpeg no pudo decodificar el audio (código {codigo}): {detalle[:200]}")
+        return False
+
+    def evaluar_problemas_audio(self, medidas):
+        """Aplicar los umbrales de calidad de audio a las medidas de un video"""
+        duracion_total = medidas["duracion_total"]
+        max_volumen = medidas["max_volumen"]
+        segmentos = medidas["segmentos"]
+        cantidad_silencios = medidas["cantidad_silencios"]
+        duracion_silencios = medidas["duracion_silencios"]
+        
+        porcentaje_silencio = (duracion_silencios / duracion_total) * 100 if duracion_total > 0 else 100
+        
+        # Un chunk de silencio digital mide -inf dBFS y statistics.stdev falla con infinitos: antes todo el
+        # video salía como "ERROR ANÁLISIS AUDIO"; con el piso se evalúa como cualquier otro (también en completo)
+        segmentos = [max(segmento, PISO_DBFS) for segmento in segmentos]
+        
+        if len(segmentos) > 1:
+            import statistics
+            volumen_promedio = statistics.mean(segmentos)
+            volumen_desviacion = statistics.stdev(segmentos) if len(segmentos) > 1 else 0
+            volumen_minimo = min(segmentos)
+        else:
+            volumen_promedio = max_volumen
+            volumen_desviacion = 0
+            volumen_minimo = max_volumen
+        
+        # Evaluar problemas específicos
+        problemas = []
+        nivel_critico = False
+        
+        # 1. SIN AUDIO (crítico)
+        if max_volumen < -60:
+            problemas.append("SIN AUDIO AUDIBLE")
+            nivel_critico = True
+        
+        # 2. AUDIO SATURADO (crítico)
+        elif max_volumen > -1:
+            problemas.append("AUDIO SATURADO/DISTORSIONADO")
+            nivel_critico = True
+        
+        # 3. DEMASIADO SILENCIO (crítico para cursos)
+        elif porcentaje_silencio > 40:
+            problemas.append(f"EXCESO DE SILENCIO ({porcentaje_silencio:.1f}%)")
+            nivel_critico = True
+        
+        # 4. VIDEO MUY CORTO (crítico para cursos)
+        elif duracion_total < 30:
+            problemas.append(f"VIDEO MUY CORTO ({duracion_total:.1f}s)")
+            nivel_critico = True
+        
+        # 5. PROBLEMAS MENORES
+        elif porcentaje_silencio > 25:
+            problemas.append(f"BASTANTE SILENCIO ({porcentaje_silencio:.1f}%)")
+        elif max_volumen < -40:
+            problemas.append("AUDIO MUY BAJO")
+        elif cantidad_silencios > 15:
+            problemas.append(f"MUCHOS CORTES ({cantidad_silencios} silencios)")
+        elif volumen_desviacion > 10:
+            problemas.append(f"VOLUMEN INCONSISTENTE (±{volumen_desviacion:.1f}dB)")
+        elif volumen_minimo < -50 and max_volumen > -20:
+            problemas.append("AUDIO CON PICOS Y VALLES")
+        
+        return {
+            "tiene_problemas": len(problemas) > 0,
+            "es_critico": nivel_critico,
+            "problemas": problemas,
+            "metricas": {
+                "duracion": duracion_total,
+                "volumen_max": max_volumen,
+                "volumen_promedio": volumen_promedio,
+                "volumen_minimo": volumen_minimo,
+                "volumen_desviacion": volumen_desviacion,
+                "porcentaje_silencio": porcentaje_silencio,
+                "cantidad_silencios": cantidad_silencios,
+                "duracion_silencios": duracion_silencios
+            }
+        }
+
     def verificar_estructura_modulos(self):  # ✅ CORREGIDO: 4 espacios, no 8
         """Verificar estructura completa de módulos vs ficha (IGUAL QUE TU ORIGINAL)"""
         print("🔍 Verificando estructura de módulos...")
+        inventario = self.obtener_inventario()
         
         for modulo_key, modulo_info in self.contenido_esperado.items():
-            modulo_path = self.ruta_base / modulo_key
-            
             estado_modulo = {
                 "nombre": modulo_info["nombre"],
-                "documentos_esperados": 5,
+                "documentos_esperados": self.especificacion.documentos_esperados(modulo_key),
                 "documentos_encontrados": 0,
-                "videos_esperados": 5,
+                "videos_esperados": self.especificacion.videos_esperados(modulo_key),
                 "videos_encontrados": 0,
                 "archivos_faltantes": [],
                 "estado": "INCOMPLETO"
             }
             
             
-            if modulo_path.exists():
+            if inventario.existe_carpeta(modulo_key):
                 # Verificar documentos
-                material_path = modulo_path / "MATERIAL DE ESTUDIO"
-                if material_path.exists():
-                    archivos_material = list(material_path.glob("*.docx"))
+                if inventario.existe_carpeta(modulo_key, CARPETA_DOCUMENTOS):
+                    archivos_material = inventario.documentos(modulo_key)
                     estado_modulo["documentos_encontrados"] = len(archivos_material)
                     
                     # Verificar cada subtema específico
@@ -376,7 +3280,7 @@ class AuditorOKROptimizado:
                         numero_subtema = f"{numero_modulo}.{i}"
                         archivo_esperado = f"Modulo {numero_subtema}.docx"
                         
-                        archivo_existe = any(numero_subtema in archivo.name for archivo in archivos_material)
+                        archivo_existe = any(numero_subtema in archivo.ruta.name for archivo in archivos_material)
                         if not archivo_existe:
                             estado_modulo["archivos_faltantes"].append({
                                 "tipo": "documento",
@@ -385,17 +3289,16 @@ class AuditorOKROptimizado:
                             })
                 
                 # Verificar videos
-                videos_path = modulo_path / "VIDEOS"
-                if videos_path.exists():
-                    archivos_videos = list(videos_path.glob("*.mp4")) + list(videos_path.glob("*.avi")) + list(videos_path.glob("*.mov"))
-                    estado_modulo["videos_encontrados"] = len(archivos_videos)
+                if inventario.existe_carpeta(modulo_key, CARPETA_VIDEOS):
+                    estado_modulo["videos_encontrados"] = len(inventario.videos(modulo_key))
             
             # Determinar estado del módulo
-            if (estado_modulo["documentos_encontrados"] == 5 and 
-                estado_modulo["videos_encontrados"] >= 5):
+            minimo = self.especificacion.minimo_parcial
+            if (estado_modulo["documentos_encontrados"] == estado_modulo["documentos_esperados"] and 
+                estado_modulo["videos_encontrados"] >= estado_modulo["videos_esperados"]):
                 estado_modulo["estado"] = "COMPLETO"
-            elif (estado_modulo["documentos_encontrados"] >= 3 and 
-                  estado_modulo["videos_encontrados"] >= 3):
+            elif (estado_modulo["documentos_encontrados"] >= minimo and 
+                  estado_modulo["videos_encontrados"] >= minimo):
                 estado_modulo["estado"] = "PARCIAL"
             else:
                 estado_modulo["estado"] = "CRÍTICO"
@@ -411,98 +3314,63 @@ class AuditorOKROptimizado:
         """
         print("📝 Revisando ortografía con detección optimizada...")
         
-        if not self.spell_checker:
+        # Con coordinador, cada trabajador usa su propio LanguageTool
+        if not self.spell_checker and not self.coordinador:
             print("❌ LanguageTool no disponible, saltando revisión ortográfica")
             return
         
         documentos_revisados = 0
         total_errores_encontrados = 0
         
-        for i in range(1, 7):
-            modulo_path = self.ruta_base / f"MODULO {i}" / "MATERIAL DE ESTUDIO"
-            
-            if not modulo_path.exists():
-                continue
-                
-            archivos_word = list(modulo_path.glob("*.docx"))
+        inventario = self.obtener_inventario()
+        documentos = [(modulo, a.ruta) for modulo in self.contenido_esperado for a in inventario.documentos(modulo)]
+        tamaños = {a.ruta: a.tamaño for modulo in self.contenido_esperado for a in inventario.documentos(modulo)}
+        
+        # Documentos sin cambios: desde la caché. El resto, en paralelo si hay concurrencia:
+        # cada hilo extrae el texto y consulta LanguageTool, con a lo sumo N consultas en vuelo
+        en_cache = {}
+        futuros = {}
+        pool = None
+        if self.coordinador:
+            print(f"🌐 Revisión repartida entre los trabajadores de la cola ({self.coordinador.trabajadores} conectados)")
+        elif self.concurrencia_ortografia > 1:
+            from concurrent.futures import ThreadPoolExecutor
+            pool = ThreadPoolExecutor(max_workers=self.concurrencia_ortografia)
+            print(f"⚡ Revisión en paralelo: hasta {self.concurrencia_ortografia} documentos a la vez")
+        
+        try:
+            for modulo, archivo in documentos:
+                try:
+                    resultado = self.obtener_de_cache("ortografia", archivo, modulo)
+                except OSError:
+                    resultado = None
+                if resultado is not None:
+                    en_cache[archivo] = resultado
+                elif self.coordinador:
+                    futuros[archivo] = self.coordinador.enviar("ortografia", archivo, modulo)
+                elif pool:
+                    futuros[archivo] = pool.submit(self._medir, self.revisar_documento, archivo, modulo, medida={})
             
-            for archivo in archivos_word:
-                print(f"      Analizando {archivo.name}...")
-                
+            # Los resultados se incorporan en el orden de los documentos, no en el de llegada
+            for modulo, archivo in documentos:
                 try:
-                    # Abrir documento
-                    doc = Document(archivo)
-                    texto_completo = ""
-                    
-                    # ✅ EXTRACCIÓN MEJORADA: Extraer TODO el texto
-                    for paragraph in doc.paragraphs:
-                        texto_completo += paragraph.text + "\n"
-                    
-                    # Verificar que el documento no esté vacío
-                    if len(texto_completo.strip()) < 100:
-                        self.reporte["problemas_criticos"].append({
-                            "tipo": "documento_vacio",
-                            "archivo": archivo.name,
-                            "descripcion": f"Documento muy corto o vacío ({len(texto_completo)} caracteres)"
-                        })
-                        continue
-                    
-                    # ✅ SPELL CHECK MEJORADO: Usar texto completo, no fragmentos
-                    errores = self.spell_checker.check(texto_completo)
-                    errores_reales = []
-                    
-                    # ✅ FILTRADO OPTIMIZADO DE FALSOS POSITIVOS
-                    for error in errores:
-                        try:
-                            # ✅ CORRECCIÓN CRÍTICA: Extraer palabra del TEXTO COMPLETO, no del contexto
-                            start_pos = error.offset
-                            end_pos = error.offset + error.errorLength
-                            palabra_error = texto_completo[start_pos:end_pos]
-                            palabra_limpia = palabra_error.lower().strip('.,;:!?()[]{}"\'-')
-
-                            # ✅ FILTRO INTELIGENTE MEJORADO - CAMBIO 2
-                            if self.es_error_real(palabra_limpia, error):
-                                # ✅ CONTEXTO MEJORADO: Extraer del texto completo
-                                inicio_contexto = max(0, start_pos - 30)
-                                fin_contexto = min(len(texto_completo), end_pos + 30)
-                                contexto = texto_completo[inicio_contexto:fin_contexto].strip()
-                                
-                                # ✅ RESALTAR ERROR EN CONTEXTO
-                                contexto_resaltado = self.resaltar_error_en_contexto(contexto, palabra_error)
-                                
-                                errores_reales.append({
-                                    "archivo": archivo.name,
-                                    "modulo": f"MODULO {i}",
-                                    "texto_error": contexto_resaltado,
-                                    "palabra_incorrecta": palabra_error,
-                                    "sugerencias": ", ".join(error.replacements[:3]) if error.replacements else "Sin sugerencias",
-                                    "tipo_error": self.clasificar_tipo_error(error),
-                                    "buscar_texto": palabra_error  # Para facilitar búsqueda en Word
-                                })
-                        
-                        except Exception as e:
-                            # Si hay error extrayendo, continuar con el siguiente
-                            continue
-                    
-                    # ✅ NO LIMITAR ARBITRARIAMENTE: Mostrar todos los errores reales
-                    self.reporte["errores_ortograficos"].extend(errores_reales)
-                    total_errores_encontrados += len(errores_reales)
-                    
-                    # Categorizar errores por severidad
-                    if len(errores_reales) > 10:
-                        self.reporte["problemas_criticos"].append({
-                            "tipo": "ortografia_critica",
-                            "archivo": archivo.name,
-                            "descripcion": f"{len(errores_reales)} errores ortográficos críticos detectados"
-                        })
-                    elif len(errores_reales) > 5:
-                        self.reporte["problemas_menores"].append({
-                            "tipo": "ortografia_menor",
-                            "archivo": archivo.name,
-                            "descripcion": f"{len(errores_reales)} errores ortográficos menores detectados"
-                        })
+                    if archivo in en_cache:
+                        resultado = en_cache[archivo]
+                        print(f"      ♻️ {archivo.name} sin cambios (caché)")
+                        self.registrar_medida(archivo, tamaños.get(archivo), origen="cache")
+                    else:
+                        print(f"      Analizando {archivo.name}...")
+                        if archivo in futuros:
+                            resultado, medida = futuros[archivo].result()
+                        else:
+                            resultado, medida = self._medir(self.revisar_documento, archivo, modulo, medida={})
+                        self.guardar_en_cache("ortografia", archivo, resultado)
+                        self.registrar_medida(archivo, tamaños.get(archivo), medida, errores=len(resultado["errores"]))
                     
-                    documentos_revisados += 1
+                    self.incorporar_resultado_documento(resultado)
+                    total_errores_encontrados += len(resultado["errores"])
+                    if resultado["revisado"]:
+                        documentos_revisados += 1
                     
                 except Exception as e:
                     self.reporte["problemas_criticos"].append({
@@ -510,99 +3378,176 @@ class AuditorOKROptimizado:
                         "archivo": archivo.name,
                         "descripcion": f"Error al abrir archivo: {str(e)}"
                     })
+        finally:
+            if pool:
+                pool.shutdown(cancel_futures=True)
+            for futuro in futuros.values():
+                futuro.cancel()
         
         self.reporte["resumen_ejecutivo"]["archivos_revisados"] = documentos_revisados
         print(f"✅ Documentos revisados: {documentos_revisados}")
         print(f"✅ Total errores ortográficos detectados: {total_errores_encontrados}")
 
-    def es_error_real(self, palabra_limpia, error):
+    def revisar_documento(self, archivo, modulo, medida=None):
         """
-        ✅ FILTRO MEJORADO basado en tu reporte de 76 errores - CAMBIO 2 COMPLETO
+        Revisar un .docx y devolver sus errores y problemas (sin tocar self.reporte)
+        medida: dict opcional donde se anotan los segundos de cada fase (extracción, LanguageTool, filtro)
         """
-        contexto = error.context.lower()
-        
-        # ✅ GARANTÍA: SIEMPRE MOSTRAR errores tipográficos evidentes PRIMERO
-        errores_tipograficos_comunes = [
-            'herrmientas',     # herramientas mal escrito
-            'anlaisis',        # análisis mal escrito  
-            'implementacion',  # implementación sin tilde
-            'organizacion',    # organización sin tilde
-            'evaluacion',      # evaluación sin tilde
-            'administracion',  # administración sin tilde
-            'informacion',     # información sin tilde
-            'solucion',        # solución sin tilde
-            'direccion',       # dirección sin tilde
-            'gestion',         # gestión sin tilde
-            'comunicacion',    # comunicación sin tilde
-            'documentacion',   # documentación sin tilde
-            'planificacion',   # planificación sin tilde
-            'capacitacion',    # capacitación sin tilde
-        ]
-        
-        # Si es un error tipográfico claro, SIEMPRE mostrarlo
-        if palabra_limpia in errores_tipograficos_comunes:
-            print(f"        ✅ ERROR TIPOGRÁFICO DETECTADO: '{palabra_limpia}'")
-            return True
-        
-        # 1. FILTRAR referencias numéricas como "6.1 6.1"
-        if re.search(r'\d+\.\d+\s+\d+\.\d+', contexto):
-            return False
+        if medida is None:
+            medida = {}
+        inicio = time.perf_counter()
+        resultado = {
+            "revisado": False,
+            "errores": [],
+            "problemas_criticos": [],
+            "problemas_menores": []
+        }
         
-        # 2. FILTRAR números puros
-        if re.match(r'^[\d\.\-\+\(\)\s:]+$', palabra_limpia):
-            return False
+        # ✅ EXTRACCIÓN MEJORADA: Extraer TODO el texto en streaming desde el zip, recordando dónde empieza cada párrafo
+        indice_parrafos = IndiceParrafos.desde_docx(archivo, self.revisar_tablas)
+        texto_completo = indice_parrafos.texto
+        medida["extraccion_s"] = time.perf_counter() - inicio
+        medida["caracteres"] = len(texto_completo)
         
-        # 3. USAR lista expandida (incluye las nuevas palabras de tu reporte)
-        if palabra_limpia in self.palabras_validas:
-            return False
+        # Verificar que el documento no esté vacío
+        if len(texto_completo.strip()) < 100:
+            resultado["problemas_criticos"].append({
+                "tipo": "documento_vacio",
+                "archivo": archivo.name,
+                "descripcion": f"Documento muy corto o vacío ({len(texto_completo)} caracteres)"
+            })
+            return resultado
         
-        # 4. FILTRO NLTK para palabras en inglés
-        if hasattr(self, 'english_words') and self.english_words and palabra_limpia in self.english_words:
-            return False
+        # ✅ SPELL CHECK MEJORADO: Usar texto completo, no fragmentos
+        inicio = time.perf_counter()
+        errores = self.consultar_corrector(indice_parrafos, medida)
+        medida["languagetool_s"] = time.perf_counter() - inicio
+        inicio = time.perf_counter()
+        errores_reales = []
         
-        # 5. FILTRAR títulos repetidos como "Análisis Análisis"
-        if re.search(r'^[A-ZÁÉÍÓÚ][a-záéíóú]+\s+[A-ZÁÉÍÓÚ][a-záéíóú]+', contexto.strip()):
-            return False
+        # ✅ CORRECCIÓN CRÍTICA: Extraer palabras del TEXTO COMPLETO, no del contexto
+        candidatos = []
+        hallazgos = []
+        for error in errores:
+            try:
+                palabra_error = texto_completo[error.offset:error.offset + error.errorLength]
+                candidatos.append((palabra_error.lower().strip('.,;:!?()[]{}"\'-'), error.context.lower()))
+                hallazgos.append((error, palabra_error))
+            except Exception:
+                # Si hay error extrayendo, continuar con el siguiente
+                continue
         
-        # 6. FILTRAR nombres propios
-        if len(palabra_limpia) > 3 and palabra_limpia[0].isupper():
-            return False
+        # ✅ FILTRADO OPTIMIZADO DE FALSOS POSITIVOS (en lote)
+        for indice in self.filtro_errores.filtrar(candidatos):
+            error, palabra_error = hallazgos[indice]
+            try:
+                start_pos = error.offset
+                end_pos = error.offset + error.errorLength
+                # ✅ CONTEXTO MEJORADO: Extraer del texto completo
+                inicio_contexto = max(0, start_pos - 30)
+                fin_contexto = min(len(texto_completo), end_pos + 30)
+                contexto = texto_completo[inicio_contexto:fin_contexto].strip()
+                
+                # ✅ RESALTAR ERROR EN CONTEXTO
+                contexto_resaltado = self.resaltar_error_en_contexto(contexto, palabra_error)
+                
+                # Ubicación en el documento: párrafo y posición dentro del párrafo
+                parrafo, origen, posicion = indice_parrafos.ubicar(start_pos)
+                
+                errores_reales.append({
+                    "archivo": archivo.name,
+                    "modulo": modulo,
+                    "texto_error": contexto_resaltado,
+                    "palabra_incorrecta": palabra_error,
+                    "sugerencias": ", ".join(error.replacements[:3]) if error.replacements else "Sin sugerencias",
+                    "tipo_error": self.clasificar_tipo_error(error),
+                    "buscar_texto": palabra_error,  # Para facilitar búsqueda en Word
+                    "parrafo": parrafo,
+                    "posicion_en_parrafo": posicion,
+                    "ubicacion": f"{origen}, carácter {posicion}"
+                })
+            
+            except Exception as e:
+                # Si hay error extrayendo, continuar con el siguiente
+                continue
         
-        # 7. FILTRAR palabras muy cortas o muy largas
-        if len(palabra_limpia) < 3 or len(palabra_limpia) > 25:
-            return False
+        medida["filtro_s"] = time.perf_counter() - inicio
         
-        # 8. FILTRAR URLs y emails
-        if any(x in palabra_limpia for x in ['http', 'www', '@', '.com', '.org']):
-            return False
+        # ✅ NO LIMITAR ARBITRARIAMENTE: Mostrar todos los errores reales
+        resultado["errores"] = errores_reales
         
-        # 9. FILTRAR códigos técnicos
-        if any(char.isdigit() for char in palabra_limpia) and len(palabra_limpia) < 8:
-            return False
+        # Categorizar errores por severidad
+        if len(errores_reales) > 10:
+            resultado["problemas_criticos"].append({
+                "tipo": "ortografia_critica",
+                "archivo": archivo.name,
+                "descripcion": f"{len(errores_reales)} errores ortográficos críticos detectados"
+            })
+        elif len(errores_reales) > 5:
+            resultado["problemas_menores"].append({
+                "tipo": "ortografia_menor",
+                "archivo": archivo.name,
+                "descripcion": f"{len(errores_reales)} errores ortográficos menores detectados"
+            })
         
-        # 10. SOLO MANTENER errores realmente evidentes
-        errores_reales = [
-            'este cursos', 'esta cursos', 'estos curso', 'estas curso',
-            'la la práctica', 'el el sistema', 'malentendidos mejora'
-        ]
+        resultado["revisado"] = True
+        return resultado
+
+    def consultar_corrector(self, indice_parrafos, medida=None):
+        """
+        Coincidencias del corrector sobre el texto completo del documento.
+        Con la caché de párrafos, solo se envían los párrafos cuyo hash no está guardado (todos
+        juntos, en una consulta) y las coincidencias guardadas se reubican en los offsets actuales
+        """
+        texto_completo = indice_parrafos.texto
+        if self.cache_parrafos is None:
+            return self.spell_checker.check(texto_completo)
         
-        if any(real in contexto for real in errores_reales):
-            return True
+        partes = indice_parrafos.partes
+        claves = [CacheParrafos.clave(parte) for parte in partes]
+        guardadas = [self.cache_parrafos.obtener(clave) for clave in claves]
+        pendientes = [i for i, coincidencias in enumerate(guardadas) if coincidencias is None]
         
-        # 11. Para otros casos, ser muy conservador con palabras comunes
-        palabras_comunes_validas = {
-            'pero', 'sino', 'tanto', 'adicionalmente', 'estimada', 
-            'objetivo', 'proyecto', 'mejora', 'logro', 'valida'
-        }
+        if pendientes:
+            if len(pendientes) == len(partes):
+                # Documento nuevo: se revisa entero, igual que sin caché
+                texto_lote, inicios_lote = texto_completo, indice_parrafos.inicios
+            else:
+                texto_lote = "".join(partes[i] for i in pendientes)
+                inicios_lote = list(accumulate((len(partes[i]) for i in pendientes[:-1]), initial=0))
+            
+            nuevas = {i: [] for i in pendientes}
+            for error in self.spell_checker.check(texto_lote):
+                # Cada coincidencia queda en el párrafo donde empieza, con offset relativo
+                j = bisect_right(inicios_lote, error.offset) - 1
+                i = pendientes[j] if len(pendientes) < len(partes) else j
+                nuevas[i].append([error.offset - inicios_lote[j], error.errorLength,
+                                  list(error.replacements[:3]) if error.replacements else [],
+                                  error.context, self.clasificar_tipo_error(error)])
+            for i, coincidencias in nuevas.items():
+                self.cache_parrafos.guardar(claves[i], coincidencias)
+                guardadas[i] = coincidencias
         
-        if palabra_limpia in palabras_comunes_validas:
-            # Solo mantener si hay problema de puntuación claro
-            if any(punct in contexto for punct in [' pero ', ' sino ', ' tanto ']):
-                return True  # Mantener problemas de comas importantes
-            return False
+        self.cache_parrafos.contar(len(partes) - len(pendientes), len(pendientes))
+        if medida is not None:
+            medida["parrafos_reutilizados"] = len(partes) - len(pendientes)
+            medida["parrafos_revisados"] = len(pendientes)
         
-        # Si llegó aquí, probablemente es un error real
-        return True
+        return [CoincidenciaCorrector(indice_parrafos.inicios[i] + offset, largo, reemplazos, contexto, tipo)
+                for i, coincidencias in enumerate(guardadas)
+                for offset, largo, reemplazos, contexto, tipo in coincidencias]
+
+    def incorporar_resultado_documento(self, resultado):
+        """Agregar al reporte el resultado de revisar_documento"""
+        self.reporte["errores_ortograficos"].extend(resultado["errores"])
+        self.reporte["problemas_criticos"].extend(resultado["problemas_criticos"])
+        self.reporte["problemas_menores"].extend(resultado["problemas_menores"])
+
+    def es_error_real(self, palabra_limpia, error):
+        """
+        ✅ FILTRO MEJORADO basado en tu reporte de 76 errores - CAMBIO 2 COMPLETO
+        """
+        return self.filtro_errores.es_error_real(palabra_limpia, error.context)
 
     def clasificar_tipo_error(self, error):
         """Clasificar el tipo de error ortográfico"""
@@ -626,51 +3571,23 @@ class AuditorOKROptimizado:
         print("🎥 Analizando videos...")
         
         videos_analizados = 0
+        inventario = self.obtener_inventario()
         
-        for i in range(1, 7):
-            videos_path = self.ruta_base / f"MODULO {i}" / "VIDEOS"
-            
-            if not videos_path.exists():
-                continue
-            
-            archivos_video = list(videos_path.glob("*.mp4")) + list(videos_path.glob("*.avi")) + list(videos_path.glob("*.mov"))
-            
-            for video in archivos_video:
+        for modulo in self.contenido_esperado:
+            for entrada in inventario.videos(modulo):
+                video = entrada.ruta
                 try:
-                    tamaño_bytes = video.stat().st_size
-                    tamaño_mb = tamaño_bytes / (1024 * 1024)
-                    
-                    problema_video = {
-                        "archivo": video.name,
-                        "modulo": f"MODULO {i}",
-                        "tamaño_mb": f"{tamaño_mb:.1f} MB",
-                        "problema": None
-                    }
-                    
-                    # Detectar problemas
-                    if tamaño_bytes == 0:
-                        problema_video["problema"] = "Archivo corrupto (0 bytes)"
-                        self.reporte["problemas_criticos"].append({
-                            "tipo": "video_corrupto",
-                            "archivo": video.name,
-                            "descripcion": "Video corrupto - 0 bytes"
-                        })
-                    elif tamaño_mb < 1:
-                        problema_video["problema"] = "Archivo sospechosamente pequeño"
-                        self.reporte["problemas_criticos"].append({
-                            "tipo": "video_pequeño",
-                            "archivo": video.name,
-                            "descripcion": f"Video muy pequeño ({tamaño_mb:.1f} MB)"
-                        })
-                    elif tamaño_mb > 500:
-                        problema_video["problema"] = "Archivo muy grande"
-                        self.reporte["problemas_menores"].append({
-                            "tipo": "video_grande",
-                            "archivo": video.name,
-                            "descripcion": f"Video muy grande ({tamaño_mb:.1f} MB)"
-                        })
+                    resultado = self.obtener_de_cache("video", video, modulo)
+                    if resultado is None:
+                        resultado, medida = self._medir(self.revisar_archivo_video, video, modulo, entrada.tamaño)
+                        self.guardar_en_cache("video", video, resultado)
+                        self.registrar_medida(video, entrada.tamaño, medida)
+                    else:
+                        self.registrar_medida(video, entrada.tamaño, origen="cache")
                     
-                    self.reporte["videos_problematicos"].append(problema_video)
+                    self.reporte["videos_problematicos"].append(resultado["video"])
+                    self.reporte["problemas_criticos"].extend(resultado["problemas_criticos"])
+                    self.reporte["problemas_menores"].extend(resultado["problemas_menores"])
                     videos_analizados += 1
                     
                 except Exception as e:
@@ -682,6 +3599,76 @@ class AuditorOKROptimizado:
         
         print(f"✅ Videos analizados: {videos_analizados}")
 
+    def sondear_video(self, video):
+        """Cabecera del contenedor de un video (una sola lectura por ejecución); None si no se reconoce"""
+        with self._lock_sondeos:
+            if video not in self.sondeos:
+                try:
+                    self.sondeos[video] = SondaContenedor(video).sondear()
+                except (OSError, struct.error) as e:
+                    print(f"⚠️ No se pudo leer la cabecera de {video.name}: {e}")
+                    self.sondeos[video] = None
+            return self.sondeos[video]
+
+    def revisar_archivo_video(self, video, modulo, tamaño_bytes=None):
+        """Verificar tamaño/corrupción de un video (sin tocar self.reporte)"""
+        resultado = {
+            "video": None,
+            "problemas_criticos": [],
+            "problemas_menores": []
+        }
+        
+        if tamaño_bytes is None:
+            tamaño_bytes = video.stat().st_size
+        tamaño_mb = tamaño_bytes / (1024 * 1024)
+        
+        problema_video = {
+            "archivo": video.name,
+            "modulo": modulo,
+            "tamaño_mb": f"{tamaño_mb:.1f} MB",
+            "problema": None
+        }
+        
+        # Cabecera del contenedor: duración, pistas e integridad sin decodificar
+        sondeo = self.sondear_video(video) if tamaño_bytes > 0 else None
+        if sondeo is not None:
+            problema_video["duracion_s"] = round(sondeo["duracion"], 1) if sondeo["duracion"] else None
+            problema_video["pistas"] = ", ".join(f"{p['tipo']}:{p['codec']}" for p in sondeo["pistas"]) or "ninguna"
+            problema_video["bitrate_kbps"] = sondeo["bitrate_kbps"]
+        
+        # Detectar problemas
+        if tamaño_bytes == 0:
+            problema_video["problema"] = "Archivo corrupto (0 bytes)"
+            resultado["problemas_criticos"].append({
+                "tipo": "video_corrupto",
+                "archivo": video.name,
+                "descripcion": "Video corrupto - 0 bytes"
+            })
+        elif sondeo is not None and sondeo["problema"]:
+            problema_video["problema"] = f"Contenedor dañado: {sondeo['problema']}"
+            resultado["problemas_criticos"].append({
+                "tipo": "video_dañado",
+                "archivo": video.name,
+                "descripcion": f"Video dañado - {sondeo['problema']}"
+            })
+        elif tamaño_mb < 1:
+            problema_video["problema"] = "Archivo sospechosamente pequeño"
+            resultado["problemas_criticos"].append({
+                "tipo": "video_pequeño",
+                "archivo": video.name,
+                "descripcion": f"Video muy pequeño ({tamaño_mb:.1f} MB)"
+            })
+        elif tamaño_mb > 500:
+            problema_video["problema"] = "Archivo muy grande"
+            resultado["problemas_menores"].append({
+                "tipo": "video_grande",
+                "archivo": video.name,
+                "descripcion": f"Video muy grande ({tamaño_mb:.1f} MB)"
+            })
+        
+        resultado["video"] = problema_video
+        return resultado
+
     # ✅ MÉTODO COMPLETO DE ANÁLISIS DE AUDIO INTEGRADO DESDE EL SEGUNDO CÓDIGO
     def analizar_audio_videos(self):
         """Analizar audio de TODOS los videos CON REPORTE DETALLADO"""
@@ -691,91 +3678,142 @@ class AuditorOKROptimizado:
             print("❌ No se pudo instalar PyDub, saltando análisis de audio")
             return
         
+        if self.motor_audio == "numpy":
+            if importlib.util.find_spec("numpy") is not None:
+                print("✅ Motor de audio NumPy (vectorizado)")
+            else:
+                print("⚠️ NumPy no disponible, se usa el motor PyDub")
+                self.motor_audio = "pydub"
+        
         videos_analizados = 0
         videos_con_problemas_audio = 0
         
+        # Lista ordenada de videos: el orden del reporte no depende de qué proceso termina antes
+        inventario = self.obtener_inventario()
+        videos = []
+        tamaños = {}
+        for modulo in self.contenido_esperado:
+            for entrada in inventario.videos(modulo):
+                videos.append((modulo, entrada.ruta))
+                tamaños[entrada.ruta] = entrada.tamaño
+        
         # 🎯 REPORTE DETALLADO DE CADA VIDEO
         print(f"\n{'='*100}")
         print("🎵 REPORTE DETALLADO DE AUDIO POR VIDEO (ANÁLISIS COMPLETO)")
+        if self.coordinador:
+            print(f"🌐 Análisis repartido entre los trabajadores de la cola ({self.coordinador.trabajadores} conectados)")
+        elif self.trabajadores_audio > 1:
+            print(f"⚡ Análisis en paralelo con {self.trabajadores_audio} procesos")
         print(f"{'='*100}")
         print(f"{'Video':<20} {'Duración':<12} {'Vol.Max':<10} {'Vol.Prom':<10} {'Vol.Min':<10} {'±Desv':<8} {'%Sil':<8} {'Estado':<15}")
         print(f"{'-'*100}")
         
-        for i in range(1, 7):
-            videos_path = self.ruta_base / f"MODULO {i}" / "VIDEOS"
-            
-            if not videos_path.exists():
+        # Videos sin cambios desde la última ejecución: resultado desde la caché
+        en_cache = {}
+        for modulo, video in videos:
+            try:
+                resultado_cache = self.obtener_de_cache("audio", video, modulo) if tamaños[video] > 0 else None
+            except OSError:
+                continue  # Se reporta abajo, en orden
+            if resultado_cache is not None:
+                en_cache[video] = resultado_cache
+        if en_cache:
+            print(f"♻️ {len(en_cache)} videos sin cambios, métricas de audio desde la caché")
+        
+        # Historial: cada video de esta ejecución queda registrado por su huella; si el mismo
+        # contenido ya se midió con esta configuración de audio, no se vuelve a decodificar
+        huellas = {}
+        desde_historial = set()
+        if self.historial:
+            self.historial.iniciar_ejecucion(self.ruta_base, self.firma_audio())
+            for modulo, video in videos:
+                if tamaños[video] == 0:
+                    continue
+                try:
+                    huellas[video] = self.historial.huella(video, *self._stat_inventario(video))
+                except OSError:
+                    continue  # Se reporta abajo, en orden
+                if video not in en_cache:
+                    resultado_historial = self.historial.obtener(huellas[video])
+                    if resultado_historial is not None:
+                        en_cache[video] = resultado_historial
+                        desde_historial.add(video)
+            if desde_historial:
+                print(f"🗄️ {len(desde_historial)} videos ya medidos en ejecuciones anteriores, métricas desde el historial")
+        
+        # Triaje por la cabecera del contenedor: los dañados o sin pista de audio no se decodifican
+        triaje = {}
+        for modulo, video in videos:
+            if video in en_cache or tamaños[video] == 0:
                 continue
-            
-            archivos_video = list(videos_path.glob("*.mp4")) + list(videos_path.glob("*.avi")) + list(videos_path.glob("*.mov"))
-            
-            for video in archivos_video:
+            sondeo = self.sondear_video(video)
+            if sondeo is None:
+                continue
+            if sondeo["problema"]:
+                triaje[video] = sondeo
+            elif not any(p["tipo"] == "audio" for p in sondeo["pistas"]):
+                triaje[video] = sondeo
+        if triaje:
+            print(f"🔎 {len(triaje)} videos descartados por la cabecera del contenedor, sin decodificar")
+        
+        futuros = {}
+        pendientes = [(modulo, video) for modulo, video in videos if video not in en_cache and video not in triaje]
+        if self.coordinador:
+            for modulo, video in pendientes:
+                if tamaños[video] > 0:
+                    futuros[video] = self.coordinador.enviar("audio", video, modulo)
+        elif self.trabajadores_audio > 1 and pendientes:
+            pool = self.pool_audio()
+            for modulo, video in pendientes:
+                if tamaños[video] > 0:
+                    futuros[video] = pool.submit(self._medir, self.detectar_problemas_audio_optimizado, video, False)
+        
+        try:
+            # Se imprime y fusiona en el orden de la lista, a medida que cada resultado está listo
+            for modulo, video in videos:
                 try:
-                    tamaño_bytes = video.stat().st_size
-                    if tamaño_bytes == 0:
+                    if tamaños[video] == 0:
                         print(f"{video.name:<20} {'CORRUPTO':<12} {'N/A':<10} {'N/A':<10} {'N/A':<10} {'N/A':<8} {'N/A':<8} {'❌ CORRUPTO':<15}")
                         continue
                     
-                    resultado_audio = self.detectar_problemas_audio_optimizado(video)
-                    
-                    # Extraer métricas para mostrar
-                    metricas = resultado_audio.get("metricas", {})
-                    duracion = metricas.get("duracion", 0)
-                    vol_max = metricas.get("volumen_max", 0)
-                    vol_prom = metricas.get("volumen_promedio", 0)
-                    vol_min = metricas.get("volumen_minimo", 0)
-                    vol_desv = metricas.get("volumen_desviacion", 0)
-                    silencio = metricas.get("porcentaje_silencio", 0)
+                    if video in triaje and triaje[video]["problema"]:
+                        # Ya reportado como video dañado en el análisis de archivos
+                        print(f"{video.name:<20} {'DAÑADO':<12} {'N/A':<10} {'N/A':<10} {'N/A':<10} {'N/A':<8} {'N/A':<8} {'❌ DAÑADO':<15}")
+                        self.registrar_medida(video, tamaños[video], origen="cabecera")
+                        continue
                     
-                    # Determinar estado visual
-                    if resultado_audio["tiene_problemas"]:
-                        if resultado_audio["es_critico"]:
-                            estado = "🚨 CRÍTICO"
-                            videos_con_problemas_audio += 1
-                        else:
-                            estado = "⚠️ MENOR"
-                            videos_con_problemas_audio += 1
+                    if video in desde_historial:
+                        resultado_audio = en_cache[video]
+                        self.guardar_en_cache("audio", video, resultado_audio)
+                        self.registrar_medida(video, tamaños[video], origen="historial")
+                    elif video in en_cache:
+                        resultado_audio = en_cache[video]
+                        self.registrar_medida(video, tamaños[video], origen="cache")
+                    elif video in triaje:
+                        resultado_audio = self.resultado_sin_audio(triaje[video])
+                        self.guardar_en_cache("audio", video, resultado_audio)
+                        self.registrar_medida(video, tamaños[video], origen="cabecera")
                     else:
-                        estado = "✅ PERFECTO"
-                    
-                    # Mostrar línea detallada
-                    print(f"{video.name:<20} {duracion:<11.1f}s {vol_max:<9.1f}dB {vol_prom:<9.1f}dB {vol_min:<9.1f}dB {vol_desv:<7.1f}dB {silencio:<7.1f}% {estado:<15}")
-                    
-                    # Si hay problemas, mostrar detalles
-                    if resultado_audio["tiene_problemas"]:
-                        problemas_texto = ", ".join(resultado_audio["problemas"])
-                        print(f"{'   → Problemas:':<20} {problemas_texto}")
-                    
-                    # Agregar al reporte
-                    audio_info = {
-                        "archivo": video.name,
-                        "modulo": f"MODULO {i}",
-                        "problemas_audio": resultado_audio["problemas"],
-                        "metricas_audio": resultado_audio["metricas"],
-                        "estado_audio": "PROBLEMAS" if resultado_audio["tiene_problemas"] else "OK"
-                    }
+                        if video in futuros:
+                            resultado_audio, medida = futuros[video].result()
+                        else:
+                            resultado_audio, medida = self._medir(self.detectar_problemas_audio_optimizado, video)
+                        
+                        # Los fallos de decodificación pueden ser transitorios: no se guardan
+                        if not any(p.startswith("ERROR ANÁLISIS AUDIO") for p in resultado_audio["problemas"]):
+                            self.guardar_en_cache("audio", video, resultado_audio)
+                        duracion = resultado_audio.get("metricas", {}).get("duracion", 0) or 0
+                        self.registrar_medida(video, tamaños[video], medida, duracion_audio_s=float(duracion),
+                                              audio_x_tiempo_real=duracion / medida["tiempo_s"] if medida["tiempo_s"] > 0 else None)
                     
-                    self.reporte["problemas_audio"].append(audio_info)
+                    evolucion = None
+                    if video in huellas:
+                        evolucion = self.historial.evolucion(modulo, video.name)
+                        if not any(p.startswith("ERROR ANÁLISIS AUDIO") for p in resultado_audio["problemas"]):
+                            self.historial.guardar(huellas[video], modulo, video.name, resultado_audio)
                     
-                    if resultado_audio["tiene_problemas"]:
-                        descripcion = f"Problemas de audio: {', '.join(resultado_audio['problemas'])}"
-                        
-                        if resultado_audio["es_critico"]:
-                            self.reporte["problemas_criticos"].append({
-                                "tipo": "audio_critico",
-                                "archivo": video.name,
-                                "modulo": f"MODULO {i}",
-                                "descripcion": descripcion,
-                                "detalles": resultado_audio["metricas"]
-                            })
-                        else:
-                            self.reporte["problemas_menores"].append({
-                                "tipo": "audio_menor",
-                                "archivo": video.name,
-                                "modulo": f"MODULO {i}",
-                                "descripcion": descripcion,
-                                "detalles": resultado_audio["metricas"]
-                            })
+                    if self.incorporar_resultado_audio(video.name, modulo, resultado_audio, evolucion, huellas.get(video)):
+                        videos_con_problemas_audio += 1
                     
                     videos_analizados += 1
                     
@@ -785,15 +3823,131 @@ class AuditorOKROptimizado:
                     self.reporte["problemas_criticos"].append({
                         "tipo": "error_analisis_audio",
                         "archivo": video.name,
-                        "modulo": f"MODULO {i}",
+                        "modulo": modulo,
                         "descripcion": f"Error al analizar audio: {str(e)}"
                     })
+        finally:
+            # El pool (o la cola) sigue vivo para la próxima ejecución: solo se descarta lo que quedó pendiente
+            for futuro in futuros.values():
+                futuro.cancel()
+            if self.historial:
+                self.historial.confirmar()
         
         print(f"{'-'*100}")
         print(f"✅ Audio de videos analizados: {videos_analizados}")
         print(f"⚠️ Videos con problemas de audio: {videos_con_problemas_audio}")
         print(f"{'='*100}")
 
+    @staticmethod
+    def resultado_sin_audio(sondeo):
+        """Resultado de audio de un video cuyo contenedor no trae ninguna pista de audio"""
+        return {
+            "tiene_problemas": True,
+            "es_critico": True,
+            "problemas": ["SIN PISTA DE AUDIO"],
+            "metricas": {
+                "duracion": round(sondeo["duracion"] or 0, 1),
+                "volumen_max": 0,
+                "volumen_promedio": 0,
+                "volumen_minimo": 0,
+                "volumen_desviacion": 0,
+                "porcentaje_silencio": 0,
+                "cantidad_silencios": 0,
+                "duracion_silencios": 0
+            }
+        }
+
+    def incorporar_resultado_audio(self, nombre_video, modulo, resultado_audio, evolucion=None, huella=None):
+        """
+        Mostrar la fila de un video en la tabla de consola y agregarlo al reporte.
+        evolucion: métricas del mismo archivo en ejecuciones anteriores (historial), huella: la de esta versión
+        """
+        # Extraer métricas para mostrar
+        metricas = resultado_audio.get("metricas", {})
+        duracion = metricas.get("duracion", 0)
+        vol_max = metricas.get("volumen_max", 0)
+        vol_prom = metricas.get("volumen_promedio", 0)
+        vol_min = metricas.get("volumen_minimo", 0)
+        vol_desv = metricas.get("volumen_desviacion", 0)
+        silencio = metricas.get("porcentaje_silencio", 0)
+        
+        # Determinar estado visual
+        if resultado_audio["tiene_problemas"]:
+            if resultado_audio["es_critico"]:
+                estado = "🚨 CRÍTICO"
+            else:
+                estado = "⚠️ MENOR"
+        else:
+            estado = "✅ PERFECTO"
+        
+        # Mostrar línea detallada
+        print(f"{nombre_video:<20} {duracion:<11.1f}s {vol_max:<9.1f}dB {vol_prom:<9.1f}dB {vol_min:<9.1f}dB {vol_desv:<7.1f}dB {silencio:<7.1f}% {estado:<15}")
+        
+        # Si hay problemas, mostrar detalles
+        if resultado_audio["tiene_problemas"]:
+            problemas_texto = ", ".join(resultado_audio["problemas"])
+            print(f"{'   → Problemas:':<20} {problemas_texto}")
+        
+        muestreo = resultado_audio.get("muestreo")
+        if muestreo:
+            if muestreo["escalado"]:
+                print(f"{'   → Muestreo:':<20} {muestreo['motivo']}, analizado completo")
+            else:
+                inferior, superior = muestreo["intervalos"]["porcentaje_silencio"]
+                print(f"{'   → Muestreo:':<20} {muestreo['ventanas']} ventanas ({muestreo['cobertura']:.0f}% del video), "
+                      f"silencio entre {inferior:.1f}% y {superior:.1f}%")
+        
+        anticipado = resultado_audio.get("veredicto_anticipado")
+        if anticipado:
+            print(f"{'   → Veredicto rápido:':<20} decodificados {anticipado['decodificado_s']:.1f} de {anticipado['duracion_s']:.1f}s")
+        
+        if evolucion and huella and evolucion[-1]["huella"] != huella[:12]:
+            # El video cambió desde la última ejecución registrada
+            anterior = evolucion[-1]
+            print(f"{'   → Historial:':<20} cambió desde {anterior['fecha']}: silencio "
+                  f"{anterior['porcentaje_silencio']:.1f}% → {silencio:.1f}%, vol. prom. "
+                  f"{anterior['volumen_promedio']:.1f} → {vol_prom:.1f}dB")
+        
+        # Agregar al reporte
+        audio_info = {
+            "archivo": nombre_video,
+            "modulo": modulo,
+            "problemas_audio": resultado_audio["problemas"],
+            "metricas_audio": resultado_audio["metricas"],
+            "estado_audio": "PROBLEMAS" if resultado_audio["tiene_problemas"] else "OK"
+        }
+        if muestreo:
+            audio_info["muestreo"] = muestreo
+        if anticipado:
+            audio_info["veredicto_anticipado"] = anticipado
+        if evolucion:
+            audio_info["evolucion"] = evolucion
+        
+        self.reporte["problemas_audio"].append(audio_info)
+        
+        if resultado_audio["tiene_problemas"]:
+            self.reporte["resumen_ejecutivo"]["videos_audio_con_problemas"] += 1
+            descripcion = f"Problemas de audio: {', '.join(resultado_audio['problemas'])}"
+            
+            if resultado_audio["es_critico"]:
+                self.reporte["problemas_criticos"].append({
+                    "tipo": "audio_critico",
+                    "archivo": nombre_video,
+                    "modulo": modulo,
+                    "descripcion": descripcion,
+                    "detalles": resultado_audio["metricas"]
+                })
+            else:
+                self.reporte["problemas_menores"].append({
+                    "tipo": "audio_menor",
+                    "archivo": nombre_video,
+                    "modulo": modulo,
+                    "descripcion": descripcion,
+                    "detalles": resultado_audio["metricas"]
+                })
+        
+        return resultado_audio["tiene_problemas"]
+
         # ✅ FUNCIÓN COMPLETAMENTE NUEVA CON DISEÑO 3IT Y LOGO + SECCIÓN DE AUDIO
     def generar_reporte_3it_optimizado(self):
         """Generar reporte HTML con diseño 3IT profesional y logo real + análisis de audio"""
@@ -805,7 +3959,7 @@ class AuditorOKROptimizado:
         
         # Calcular completitud (IGUAL QUE ANTES)
         modulos_completos = sum(1 for m in self.reporte["estructura_modulos"].values() if m["estado"] == "COMPLETO")
-        porcentaje_completitud = (modulos_completos / 6) * 100
+        porcentaje_completitud = (modulos_completos / len(self.contenido_esperado)) * 100
         
         self.reporte["resumen_ejecutivo"].update({
             "problemas_criticos": total_criticos,
@@ -813,18 +3967,198 @@ class AuditorOKROptimizado:
             "porcentaje_completitud": porcentaje_completitud
         })
         
-        # ✅ SIMPLIFICADO: Verificar si existe el logo
-        logo_existe = self.verificar_logo_existe()
+        # La carpeta del curso se sincroniza con todo el equipo: vigilando, un solo reporte que se sobrescribe
+        timestamp = "vigilancia" if self.reporte_fijo else datetime.now().strftime('%Y%m%d_%H%M%S')
         
-        # Función para determinar color de estado
-        def get_status_color(value, is_percentage=False):
-            if is_percentage:
-                if value >= 90: return "excellent"
-                elif value >= 70: return "warning"
-                else: return "warning"
+        if self.filas_por_pagina is not None:
+            # Reporte dividido: índice + páginas por módulo, tablas paginadas
+            carpeta = self.ruta_base / f"Reporte_Auditoria_OKR_3IT_Audio_{timestamp}"
+            if self.reporte_fijo and carpeta.is_dir():
+                # Páginas del ciclo anterior que este ciclo quizás ya no escribe
+                for pagina in carpeta.glob("*.html"):
+                    pagina.unlink()
+            ruta_reporte, paginas = self.escribir_reporte_paginado(carpeta, total_criticos, total_menores,
+                                                                   total_errores_ortografia, porcentaje_completitud)
+            print(f"📄 Reporte 3IT paginado ({paginas} páginas, {self.filas_por_pagina} filas por tabla) guardado en: {ruta_reporte}")
+            return ruta_reporte
+        
+        # Guardar reporte: se escribe sección por sección, sin armar el HTML completo en memoria
+        ruta_reporte = self.ruta_base / f"Reporte_Auditoria_OKR_3IT_Audio_{timestamp}.html"
+        self._escribir_html(ruta_reporte, self.secciones_reporte_html(total_criticos, total_menores,
+                                                                      total_errores_ortografia, porcentaje_completitud))
+        
+        print(f"📄 Reporte 3IT con audio optimizado para PDF guardado en: {ruta_reporte}")
+        return ruta_reporte
+
+    def _escribir_html(self, ruta, fragmentos):
+        # Escritura atómica: quien abre (o sincroniza) el reporte nunca ve uno a medio escribir
+        temporal = Path(ruta).with_name(Path(ruta).name + ".tmp")
+        with open(temporal, 'w', encoding='utf-8') as f:
+            for fragmento in fragmentos:
+                f.write(fragmento)
+        os.replace(temporal, ruta)
+
+    def escribir_reporte_paginado(self, carpeta, total_criticos, total_menores, total_errores_ortografia, porcentaje_completitud):
+        """
+        Reporte para conjuntos de errores muy grandes: index.html con el resumen ejecutivo y el estado
+        por módulos, y páginas por módulo para ortografía y audio con filas_por_pagina filas cada una,
+        enlazadas entre sí. Devuelve (ruta del índice, cantidad de páginas escritas)
+        """
+        carpeta = Path(carpeta)
+        carpeta.mkdir(parents=True, exist_ok=True)
+        logo_css, logo_html, logo_footer_html = self._estilos_logo(self.verificar_logo_existe(carpeta))
+        
+        # Por sección y módulo: (cantidad de filas, cómo recorrerlas). Las listas en disco ya llevan la
+        # cuenta por módulo y se leen con un cursor; las en memoria se agrupan por referencia, sin copiar filas
+        modulos = list(self.reporte["estructura_modulos"])
+        grupos = {"ortografia": {}, "audio": {}}
+        for seccion, lista in (("ortografia", self.reporte["errores_ortograficos"]),
+                               ("audio", self.reporte.get("problemas_audio", []))):
+            if isinstance(lista, ListaEnDisco):
+                for modulo, cantidad in lista.por_modulo.items():
+                    grupos[seccion][modulo] = (cantidad, partial(lista.filas, modulo))
             else:
-                return "warning" if value > 0 else "excellent"
+                agrupadas = {}
+                for fila in lista:
+                    agrupadas.setdefault(fila["modulo"], []).append(fila)
+                for modulo, filas_modulo in agrupadas.items():
+                    grupos[seccion][modulo] = (len(filas_modulo), partial(iter, filas_modulo))
+            for modulo in grupos[seccion]:
+                if modulo not in modulos:
+                    modulos.append(modulo)
+        
+        paginas_escritas = 0
+        enlaces = {}
+        for seccion, titulo in (("ortografia", "Errores Ortográficos"), ("audio", "🎵 Análisis de Audio")):
+            for modulo in modulos:
+                cantidad, recorrer = grupos[seccion].get(modulo, (0, None))
+                if not cantidad:
+                    continue
+                total_paginas = math.ceil(cantidad / self.filas_por_pagina)
+                nombres = [self._nombre_pagina(modulo, seccion, n) for n in range(1, total_paginas + 1)]
+                enlaces[(modulo, seccion)] = (nombres[0], cantidad, total_paginas)
+                # Una sola pasada por las filas del módulo: cada página toma las siguientes filas_por_pagina
+                filas_modulo = recorrer()
+                for n in range(total_paginas):
+                    self._escribir_html(carpeta / nombres[n], self._html_pagina_tabla(
+                        seccion, titulo, modulo, list(islice(filas_modulo, self.filas_por_pagina)),
+                        cantidad, nombres, n, logo_css, logo_html
+                    ))
+                    paginas_escritas += 1
+        
+        ruta_indice = carpeta / "index.html"
+        self._escribir_html(ruta_indice, self._html_indice_paginado(
+            modulos, enlaces, logo_css, logo_html, logo_footer_html,
+            total_criticos, total_menores, total_errores_ortografia, porcentaje_completitud
+        ))
+        return ruta_indice, paginas_escritas + 1
+
+    def _nombre_pagina(self, modulo, seccion, numero):
+        # \w conserva acentos y ñ: "MODULO AÑO" y "MODULO ANO" no deben compartir archivo
+        base = re.sub(r"\W+", "-", modulo.casefold()).strip("-_")
+        return f"{base}-{seccion}-{numero}.html"
+
+    def _html_indice_paginado(self, modulos, enlaces, logo_css, logo_html, logo_footer_html,
+                              total_criticos, total_menores, total_errores_ortografia, porcentaje_completitud):
+        """Índice del reporte paginado: resumen, módulos, enlaces al detalle y próximos pasos"""
+        yield from self._html_encabezado(logo_css, logo_html, total_criticos, total_menores,
+                                         porcentaje_completitud, ESTILOS_PAGINACION)
+        yield from self._html_modulos()
+        yield f"""
+
+    <!-- DETALLE POR MÓDULO -->
+    <section class="content-section page-break">
+        <h2 class="section-title">Detalle por Módulo ({total_errores_ortografia} errores ortográficos)</h2>
+        <div class="table-container">
+            <table>
+                <thead>
+                    <tr>
+                        <th>Módulo</th>
+                        <th>Errores Ortográficos</th>
+                        <th>Audio</th>
+                    </tr>
+                </thead>
+                <tbody>
+            """
+        for modulo in modulos:
+            celdas = []
+            for seccion, unidad in (("ortografia", "errores"), ("audio", "videos")):
+                if (modulo, seccion) in enlaces:
+                    pagina, total, total_paginas = enlaces[(modulo, seccion)]
+                    celdas.append(f'<a href="{pagina}">{total} {unidad}</a> <small>({total_paginas} págs.)</small>')
+                else:
+                    celdas.append("—")
+            yield f"""
+                    <tr>
+                        <td><span class="file-name">{modulo}</span></td>
+                        <td>{celdas[0]}</td>
+                        <td>{celdas[1]}</td>
+                    </tr>
+                """
+        yield self._html_tabla_fin()
+        yield """    </section>"""
+        yield from self._html_videos_problematicos()
+        yield from self._html_cierre(logo_footer_html, total_criticos, total_errores_ortografia)
+
+    def _html_pagina_tabla(self, seccion, titulo, modulo, filas, total, nombres, indice, logo_css, logo_html):
+        """Una página de detalle: tabla de errores o de audio de un módulo, con navegación"""
+        navegacion = self._html_paginacion(nombres, indice)
+        yield from self._html_documento(logo_css, f"{modulo} - {titulo} ({indice + 1}/{len(nombres)}) - 3IT", ESTILOS_PAGINACION)
+        yield from self._html_cabecera(logo_html, f"{modulo} · {titulo}")
+        yield f"""
+    <section class="content-section">
+        <h2 class="section-title">{titulo} - {modulo} ({total} total, página {indice + 1} de {len(nombres)})</h2>
+        {navegacion}"""
+        if seccion == "ortografia":
+            yield self._html_tabla_errores_inicio()
+            for error in filas:
+                yield self._html_fila_error(error)
+        else:
+            yield self._html_tabla_audio_inicio()
+            for video in filas:
+                yield self._html_fila_audio(video)
+        yield self._html_tabla_fin()
+        yield f"""        {navegacion}
+    </section>
+</body>
+</html>"""
+
+    def _html_paginacion(self, nombres, indice):
+        """Enlaces al índice, a la página anterior/siguiente y a las páginas cercanas"""
+        enlaces = ['<a href="index.html">⌂ Índice</a>']
+        if indice > 0:
+            enlaces.append(f'<a href="{nombres[indice - 1]}">« Anterior</a>')
+        visibles = sorted({0, len(nombres) - 1} | set(range(max(0, indice - 3), min(len(nombres), indice + 4))))
+        previa = None
+        for n in visibles:
+            if previa is not None and n > previa + 1:
+                enlaces.append('<span class="hueco">…</span>')
+            if n == indice:
+                enlaces.append(f'<span class="actual">{n + 1}</span>')
+            else:
+                enlaces.append(f'<a href="{nombres[n]}">{n + 1}</a>')
+            previa = n
+        if indice < len(nombres) - 1:
+            enlaces.append(f'<a href="{nombres[indice + 1]}">Siguiente »</a>')
+        return f'<nav class="paginacion">{" ".join(enlaces)}</nav>'
+
+    def secciones_reporte_html(self, total_criticos, total_menores, total_errores_ortografia, porcentaje_completitud):
+        """
+        Fragmentos del reporte HTML 3IT en orden, generados a partir de self.reporte
+        (la memoria no depende de la cantidad de filas: cada fila se produce y se escribe)
+        """
+        # ✅ SIMPLIFICADO: Verificar si existe el logo
+        logo_css, logo_html, logo_footer_html = self._estilos_logo(self.verificar_logo_existe())
         
+        yield from self._html_encabezado(logo_css, logo_html, total_criticos, total_menores, porcentaje_completitud)
+        yield from self._html_modulos()
+        yield from self._html_ortografia(total_errores_ortografia)
+        yield from self._html_videos_problematicos()
+        yield from self._html_audio()
+        yield from self._html_cierre(logo_footer_html, total_criticos, total_errores_ortografia)
+
+    def _estilos_logo(self, logo_existe):
+        """CSS y marcado del logo: imagen real si está disponible, texto '3IT' como respaldo"""
         # ✅ CSS LOGO SIN FONDO NI PADDING - SOLO LA IMAGEN MÁS GRANDE AÚN
         if logo_existe:
             logo_css = """
@@ -872,14 +4206,67 @@ class AuditorOKROptimizado:
         }"""
             logo_html = '<div class="logo-3it">3IT</div>'
             logo_footer_html = '<div class="logo-3it">3IT</div>'
+        return logo_css, logo_html, logo_footer_html
+
+    def _html_encabezado(self, logo_css, logo_html, total_criticos, total_menores, porcentaje_completitud, estilos_extra=""):
+        """Documento, estilos, encabezado y resumen ejecutivo (hasta abrir la grilla de módulos)"""
+        # Función para determinar color de estado
+        def get_status_color(value, is_percentage=False):
+            if is_percentage:
+                if value >= 90: return "excellent"
+                elif value >= 70: return "warning"
+                else: return "warning"
+            else:
+                return "warning" if value > 0 else "excellent"
         
         # ✅ HTML COMPLETO CON DISEÑO 3IT PROFESIONAL + AUDIO
-        html = f"""<!DOCTYPE html>
+        yield from self._html_documento(logo_css, estilos_extra=estilos_extra)
+        yield from self._html_cabecera(logo_html)
+        yield f"""
+    <!-- RESUMEN EJECUTIVO -->
+    <section class="executive-summary no-break">
+        <h2 class="summary-title">Resumen Ejecutivo</h2>
+        
+        <div class="summary-grid">
+            <div class="summary-card">
+                <div class="summary-number status-info">{self.reporte['resumen_ejecutivo']['archivos_revisados']}</div>
+                <div class="summary-label">Archivos Revisados</div>
+            </div>
+            <div class="summary-card">
+                <div class="summary-number status-{get_status_color(total_criticos)}">{total_criticos}</div>
+                <div class="summary-label">Problemas Críticos</div>
+            </div>
+            <div class="summary-card">
+                <div class="summary-number status-{get_status_color(total_menores)}">{total_menores}</div>
+                <div class="summary-label">Problemas Menores</div>
+            </div>
+            <div class="summary-card">
+                <div class="summary-number status-{get_status_color(porcentaje_completitud, True)}">{porcentaje_completitud:.0f}%</div>
+                <div class="summary-label">Completitud</div>
+            </div>
+        </div>
+
+        <div class="alert alert-success">
+            <strong>🎯 AUDITORÍA INTEGRAL CON TECNOLOGÍA AVANZADA + AUDIO</strong><br>
+            • <strong>Análisis inteligente:</strong> {len(self.palabras_validas)} términos técnicos protegidos automáticamente<br>
+            • <strong>Detección estructural:</strong> Verificación completa de módulos y documentos<br>
+            • <strong>Filtros ortográficos:</strong> Algoritmos avanzados para detectar solo errores reales<br>
+            • <strong>Análisis de archivos:</strong> Verificación de integridad, tamaño y corrupción<br>
+            • <strong>🎵 Análisis de audio completo:</strong> Volumen, silencios, calidad sonora con PyDub<br>
+            • <strong>Reporte profesional:</strong> Diseño 3IT optimizado para PDF y presentaciones<br>
+            • <strong>Calidad garantizada:</strong> Reducción del 70% de falsos positivos vs herramientas estándar
+        </div>
+    </section>"""
+
+    def _html_documento(self, logo_css, titulo=None, estilos_extra=""):
+        """Inicio del documento: metadatos y estilos 3IT completos (hasta abrir <body>)"""
+        titulo = titulo or f"Reporte Auditoría Curso {self.especificacion.nombre} - 3IT"
+        yield f"""<!DOCTYPE html>
         <html lang="es">
         <head>
             <meta charset="UTF-8">
             <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <title>Reporte Auditoría Curso OKR - 3IT</title>
+            <title>{titulo}</title>
             <style>
                 /* ===== RESET Y CONFIGURACIÓN BASE ===== */
                 * {{
@@ -1386,57 +4773,32 @@ class AuditorOKROptimizado:
         .mt-20 {{ margin-top: 20px; }}
         .font-weight-300 {{ font-weight: 300; }}
         .font-weight-600 {{ font-weight: 600; }}
-    </style>
+{estilos_extra}    </style>
 </head>
 
-<body>
+<body>"""
+
+    def _html_cabecera(self, logo_html, subtitulo="Análisis Integral de Calidad + Audio", titulo=None):
+        """Encabezado 3IT con título y logo"""
+        titulo = titulo or f"Auditoría Curso {self.especificacion.nombre}"
+        yield f"""
     <!-- HEADER -->
     <header class="header no-break">
         <div class="header-content">
             <div class="header-text">
-                <h1>Auditoría Curso OKR</h1>
-                <div class="subtitle">Análisis Integral de Calidad + Audio</div>
+                <h1>{titulo}</h1>
+                <div class="subtitle">{subtitulo}</div>
             </div>
             <div class="logo-section">
                 {logo_html}
             </div>
         </div>
     </header>
+"""
 
-    <!-- RESUMEN EJECUTIVO -->
-    <section class="executive-summary no-break">
-        <h2 class="summary-title">Resumen Ejecutivo</h2>
-        
-        <div class="summary-grid">
-            <div class="summary-card">
-                <div class="summary-number status-info">{self.reporte['resumen_ejecutivo']['archivos_revisados']}</div>
-                <div class="summary-label">Archivos Revisados</div>
-            </div>
-            <div class="summary-card">
-                <div class="summary-number status-{get_status_color(total_criticos)}">{total_criticos}</div>
-                <div class="summary-label">Problemas Críticos</div>
-            </div>
-            <div class="summary-card">
-                <div class="summary-number status-{get_status_color(total_menores)}">{total_menores}</div>
-                <div class="summary-label">Problemas Menores</div>
-            </div>
-            <div class="summary-card">
-                <div class="summary-number status-{get_status_color(porcentaje_completitud, True)}">{porcentaje_completitud:.0f}%</div>
-                <div class="summary-label">Completitud</div>
-            </div>
-        </div>
-
-        <div class="alert alert-success">
-            <strong>🎯 AUDITORÍA INTEGRAL CON TECNOLOGÍA AVANZADA + AUDIO</strong><br>
-            • <strong>Análisis inteligente:</strong> {len(self.palabras_validas)} términos técnicos protegidos automáticamente<br>
-            • <strong>Detección estructural:</strong> Verificación completa de módulos y documentos<br>
-            • <strong>Filtros ortográficos:</strong> Algoritmos avanzados para detectar solo errores reales<br>
-            • <strong>Análisis de archivos:</strong> Verificación de integridad, tamaño y corrupción<br>
-            • <strong>🎵 Análisis de audio completo:</strong> Volumen, silencios, calidad sonora con PyDub<br>
-            • <strong>Reporte profesional:</strong> Diseño 3IT optimizado para PDF y presentaciones<br>
-            • <strong>Calidad garantizada:</strong> Reducción del 70% de falsos positivos vs herramientas estándar
-        </div>
-    </section>
+    def _html_modulos(self):
+        """Cards de módulos con diseño 3IT"""
+        yield """
 
     <!-- ESTADO POR MÓDULOS -->
     <section class="content-section page-break">
@@ -1447,16 +4809,16 @@ class AuditorOKROptimizado:
         # Generar cards de módulos con diseño 3IT
         for modulo_key, modulo_data in self.reporte["estructura_modulos"].items():
             estado_class = modulo_data["estado"].lower()
-            docs_porcentaje = (modulo_data["documentos_encontrados"] / 5) * 100
+            docs_porcentaje = (modulo_data["documentos_encontrados"] / modulo_data["documentos_esperados"]) * 100
             
             progress_class = "excellent" if docs_porcentaje == 100 else ("warning" if docs_porcentaje >= 60 else "warning")
             badge_class = "success" if modulo_data["estado"] == "COMPLETO" else ("warning" if modulo_data["estado"] == "PARCIAL" else "critical")
             
-            html += f"""
+            yield f"""
             <div class="module-card {estado_class}">
                 <div class="module-title">{modulo_key}: {modulo_data['nombre']}</div>
-                <p><strong>Documentos:</strong> {modulo_data['documentos_encontrados']}/5</p>
-                <p><strong>Videos:</strong> {modulo_data['videos_encontrados']}/5</p>
+                <p><strong>Documentos:</strong> {modulo_data['documentos_encontrados']}/{modulo_data['documentos_esperados']}</p>
+                <p><strong>Videos:</strong> {modulo_data['videos_encontrados']}/{modulo_data['videos_esperados']}</p>
                 <div class="progress-bar">
                     <div class="progress-fill progress-{progress_class}" style="width: {docs_porcentaje}%"></div>
                 </div>
@@ -1464,31 +4826,24 @@ class AuditorOKROptimizado:
             """
             
             if modulo_data["archivos_faltantes"]:
-                html += '<div class="mt-20"><strong>Archivos Faltantes:</strong><ul style="margin-top: 10px;">'
+                yield '<div class="mt-20"><strong>Archivos Faltantes:</strong><ul style="margin-top: 10px;">'
                 for faltante in modulo_data["archivos_faltantes"]:
-                    html += f"<li>{faltante['archivo']} - {faltante['subtema']}</li>"
-                html += "</ul></div>"
+                    yield f"<li>{faltante['archivo']} - {faltante['subtema']}</li>"
+                yield "</ul></div>"
             
-            html += "</div>"
+            yield "</div>"
         
-        html += """
+        yield """
         </div>
     </section>"""
-        
-    # En el método generar_reporte_3it_optimizado(), busca esta línea:
-# html += f"""
-# <!-- ERRORES ORTOGRÁFICOS -->
-# <section class="content-section page-break">
 
-# Y CÁMBIALA por:
-# (Quitamos el "page-break" cuando hay pocos errores)
-
-        # Errores ortográficos con diseño 3IT - CORRECCIÓN PDF
+    def _html_ortografia(self, total_errores_ortografia):
+        """Errores ortográficos con diseño 3IT, una fila a la vez - CORRECCIÓN PDF"""
         if self.reporte["errores_ortograficos"]:
             # Solo agregar page-break si hay más de 5 errores
             page_break_class = "page-break" if len(self.reporte["errores_ortograficos"]) > 5 else ""
             
-            html += f"""
+            yield f"""
     <!-- ERRORES ORTOGRÁFICOS -->
     <section class="content-section {page_break_class}">
         <h2 class="section-title">Errores Ortográficos Detectados ({total_errores_ortografia} total)</h2>
@@ -1499,7 +4854,32 @@ class AuditorOKROptimizado:
             • <strong>Filtros específicos:</strong> Referencias numéricas y títulos repetidos<br>
             • <strong>Garantía:</strong> Solo errores que requieren corrección real
         </div>
+"""
+            yield self._html_tabla_errores_inicio()
+            for error in self.reporte["errores_ortograficos"]:
+                yield self._html_fila_error(error)
+            yield self._html_tabla_fin()
+            
+            yield f"""
+        <div class="alert alert-success">
+            <strong>✅ {total_errores_ortografia} errores ortográficos reales detectados</strong><br>
+            <em>Usa Ctrl+F en Word con el texto de "Buscar en Word" para localizar rápidamente cada error.</em>
+        </div>
+    </section>"""
+        else:
+            # Para cuando NO hay errores, tampoco usar page-break
+            yield f"""
+    <!-- ERRORES ORTOGRÁFICOS -->
+    <section class="content-section">
+        <h2 class="section-title">Revisión Ortográfica</h2>
+        <div class="alert alert-success">
+            <strong>🎉 ¡EXCELENTE! No se detectaron errores ortográficos reales</strong><br>
+            Los filtros inteligentes procesaron el contenido y no encontraron errores que requieran corrección.
+        </div>
+    </section>"""
 
+    def _html_tabla_errores_inicio(self):
+        return """
         <div class="table-container">
             <table>
                 <thead>
@@ -1513,47 +4893,32 @@ class AuditorOKROptimizado:
                 </thead>
                 <tbody>
             """
-            
-            for error in self.reporte["errores_ortograficos"]:
-                html += f"""
+
+    def _html_fila_error(self, error):
+        return f"""
                     <tr>
                         <td><span class="file-name">{error['archivo']}</span></td>
                         <td>{error['modulo']}</td>
                         <td><div class="error-text">{error['texto_error']}</div></td>
-                        <td><span class="search-hint">🔍 Ctrl+F: "{error['buscar_texto']}"</span></td>
+                        <td><span class="search-hint">🔍 Ctrl+F: "{error['buscar_texto']}"</span>{f"<br><small>📍 {error['ubicacion']}</small>" if error.get('ubicacion') else ""}</td>
                         <td><span class="suggestion">{error['sugerencias']}</span></td>
                     </tr>
                 """
-            
-            html += f"""
+
+    def _html_tabla_fin(self):
+        return """
                 </tbody>
             </table>
         </div>
+"""
 
-        <div class="alert alert-success">
-            <strong>✅ {total_errores_ortografia} errores ortográficos reales detectados</strong><br>
-            <em>Usa Ctrl+F en Word con el texto de "Buscar en Word" para localizar rápidamente cada error.</em>
-        </div>
-    </section>"""
-        else:
-            # Para cuando NO hay errores, tampoco usar page-break
-            html += f"""
-    <!-- ERRORES ORTOGRÁFICOS -->
-    <section class="content-section">
-        <h2 class="section-title">Revisión Ortográfica</h2>
-        <div class="alert alert-success">
-            <strong>🎉 ¡EXCELENTE! No se detectaron errores ortográficos reales</strong><br>
-            Los filtros inteligentes procesaron el contenido y no encontraron errores que requieran corrección.
-        </div>
-    </section>"""
-            
-    
+    def _html_videos_problematicos(self):
+        """Videos problemáticos con diseño 3IT"""
+        # Se recorre la lista del reporte sin copiarla
+        videos_con_problemas = (v for v in self.reporte["videos_problematicos"] if v.get("problema"))
         
-        # Videos problemáticos con diseño 3IT
-        videos_con_problemas = [v for v in self.reporte["videos_problematicos"] if v.get("problema")]
-        
-        if videos_con_problemas:
-            html += """
+        if any(v.get("problema") for v in self.reporte["videos_problematicos"]):
+            yield """
     <!-- VIDEOS CON PROBLEMAS -->
     <section class="content-section page-break">
         <h2 class="section-title">Videos con Problemas de Archivo</h2>
@@ -1570,8 +4935,8 @@ class AuditorOKROptimizado:
                 <tbody>
             """
             for video in videos_con_problemas:
-                badge_class = "critical" if "corrupto" in video["problema"].lower() else "warning"
-                html += f"""
+                badge_class = "critical" if any(t in video["problema"].lower() for t in ("corrupto", "dañado")) else "warning"
+                yield f"""
                     <tr>
                         <td><span class="file-name">{video['archivo']}</span></td>
                         <td>{video['modulo']}</td>
@@ -1579,18 +4944,19 @@ class AuditorOKROptimizado:
                         <td><span class="badge badge-{badge_class}">{video['problema']}</span></td>
                     </tr>
                 """
-            html += """
+            yield """
                 </tbody>
             </table>
         </div>
     </section>"""
-        
-        # ✅ SECCIÓN DE AUDIO INTEGRADA CON DISEÑO 3IT
+
+    def _html_audio(self):
+        """✅ SECCIÓN DE AUDIO INTEGRADA CON DISEÑO 3IT"""
         if "problemas_audio" in self.reporte and self.reporte["problemas_audio"]:
             todos_los_videos = self.reporte["problemas_audio"]
-            videos_con_problemas_audio = [v for v in todos_los_videos if v["estado_audio"] == "PROBLEMAS"]
+            total_con_problemas_audio = self.reporte["resumen_ejecutivo"]["videos_audio_con_problemas"]
             
-            html += f"""
+            yield f"""
     <!-- ANÁLISIS COMPLETO DE AUDIO -->
     <section class="content-section page-break">
         <h2 class="section-title">🎵 Análisis Completo de Audio ({len(todos_los_videos)} videos analizados)</h2>
@@ -1598,12 +4964,27 @@ class AuditorOKROptimizado:
         <div class="alert alert-info">
             <strong>🎯 REPORTE COMPLETO DE AUDIO CON PyDub</strong><br>
             • <strong>Videos analizados:</strong> {len(todos_los_videos)}<br>
-            • <strong>Videos con problemas:</strong> {len(videos_con_problemas_audio)}<br>
-            • <strong>Videos correctos:</strong> {len(todos_los_videos) - len(videos_con_problemas_audio)}<br>
+            • <strong>Videos con problemas:</strong> {total_con_problemas_audio}<br>
+            • <strong>Videos correctos:</strong> {len(todos_los_videos) - total_con_problemas_audio}<br>
             • <strong>Análisis completo:</strong> Todo el video analizado (sin limitaciones)<br>
             • <strong>Métricas:</strong> Volumen, silencios, calidad sonora para cursos educativos
         </div>
-        
+        """
+            yield self._html_tabla_audio_inicio()
+            for video in todos_los_videos:
+                yield self._html_fila_audio(video)
+            yield self._html_tabla_fin()
+            
+            yield f"""        
+        <div class="alert alert-success">
+            <p><strong>🎯 Total de videos perfectos: {len(todos_los_videos) - total_con_problemas_audio}/{len(todos_los_videos)}</strong></p>
+            <p><strong>🎵 Métricas analizadas:</strong> Volumen máximo, promedio, mínimo, desviación estándar, porcentaje de silencio</p>
+            <p><strong>🚨 Problemas críticos detectados:</strong> Audio sin sonido, saturación, exceso de silencio</p>
+        </div>
+    </section>"""
+
+    def _html_tabla_audio_inicio(self):
+        return """
         <div class="table-container">
             <table>
                 <thead>
@@ -1622,25 +5003,43 @@ class AuditorOKROptimizado:
                 </thead>
                 <tbody>
             """
-            
-            for video in todos_los_videos:
-                metricas = video.get("metricas_audio", {})
-                problemas = video.get("problemas_audio", [])
-                
-                if video["estado_audio"] == "PROBLEMAS":
-                    if any(p in str(problemas) for p in ["SIN AUDIO", "SATURADO", "MUY CORTO"]):
-                        badge_class = "critical"
-                        estado_texto = "🚨 CRÍTICO"
-                    else:
-                        badge_class = "warning" 
-                        estado_texto = "⚠️ MENOR"
-                else:
-                    badge_class = "success"
-                    estado_texto = "✅ PERFECTO"
-                
-                problemas_texto = ", ".join(problemas) if problemas else "Ninguno"
-                
-                html += f"""
+
+    def _html_fila_audio(self, video):
+        metricas = video.get("metricas_audio", {})
+        problemas = video.get("problemas_audio", [])
+        
+        if video["estado_audio"] == "PROBLEMAS":
+            if any(p in str(problemas) for p in ["SIN AUDIO", "SATURADO", "MUY CORTO"]):
+                badge_class = "critical"
+                estado_texto = "🚨 CRÍTICO"
+            else:
+                badge_class = "warning" 
+                estado_texto = "⚠️ MENOR"
+        else:
+            badge_class = "success"
+            estado_texto = "✅ PERFECTO"
+        
+        problemas_texto = ", ".join(problemas) if problemas else "Ninguno"
+        silencio_texto = f"{metricas.get('porcentaje_silencio', 0):.1f}%"
+        muestreo = video.get("muestreo")
+        if muestreo and not muestreo["escalado"]:
+            # Valores estimados: se muestra el intervalo del silencio y de cuántas ventanas sale
+            inferior, superior = muestreo["intervalos"]["porcentaje_silencio"]
+            silencio_texto = f"≈{silencio_texto}<br><small>{inferior:.1f}–{superior:.1f}%</small>"
+            problemas_texto += f"<br><small>Estimado con {muestreo['ventanas']} ventanas ({muestreo['cobertura']:.0f}% del video)</small>"
+        anticipado = video.get("veredicto_anticipado")
+        if anticipado:
+            problemas_texto += f"<br><small>Veredicto rápido: {anticipado['decodificado_s']:.1f} de {anticipado['duracion_s']:.1f}s decodificados</small>"
+        evolucion = video.get("evolucion")
+        if evolucion:
+            # Tendencia: ejecuciones anteriores del historial y la actual
+            silencios = [e["porcentaje_silencio"] for e in evolucion] + [metricas.get('porcentaje_silencio', 0)]
+            volumenes = [e["volumen_promedio"] for e in evolucion] + [metricas.get('volumen_promedio', 0)]
+            problemas_texto += (f"<br><small>Tendencia ({len(silencios)} ejecuciones): silencio "
+                                f"{' → '.join(f'{v:.0f}%' for v in silencios)}; vol. prom. "
+                                f"{' → '.join(f'{v:.1f}' for v in volumenes)} dB</small>")
+        
+        return f"""
                     <tr>
                         <td><span class="file-name">{video['archivo']}</span></td>
                         <td>{video['modulo']}</td>
@@ -1649,29 +5048,18 @@ class AuditorOKROptimizado:
                         <td>{metricas.get('volumen_promedio', 0):.1f}dB</td>
                         <td>{metricas.get('volumen_minimo', 0):.1f}dB</td>
                         <td>{metricas.get('volumen_desviacion', 0):.1f}dB</td>
-                        <td>{metricas.get('porcentaje_silencio', 0):.1f}%</td>
+                        <td>{silencio_texto}</td>
                         <td><span class="badge badge-{badge_class}">{estado_texto}</span></td>
                         <td><small>{problemas_texto}</small></td>
                     </tr>
                 """
-            
-            html += f"""
-                </tbody>
-            </table>
-        </div>
-        
-        <div class="alert alert-success">
-            <p><strong>🎯 Total de videos perfectos: {len(todos_los_videos) - len(videos_con_problemas_audio)}/{len(todos_los_videos)}</strong></p>
-            <p><strong>🎵 Métricas analizadas:</strong> Volumen máximo, promedio, mínimo, desviación estándar, porcentaje de silencio</p>
-            <p><strong>🚨 Problemas críticos detectados:</strong> Audio sin sonido, saturación, exceso de silencio</p>
-        </div>
-    </section>"""
-        
-        # Próximos pasos con diseño 3IT + audio
+
+    def _html_cierre(self, logo_footer_html, total_criticos, total_errores_ortografia):
+        """Próximos pasos con diseño 3IT + audio, y pie de página"""
         estado_lanzamiento = "success" if total_criticos == 0 else "warning"
         mensaje_lanzamiento = "✅ CURSO LISTO para lanzamiento" if total_criticos == 0 else f"❌ Requiere corrección de {total_criticos} problemas críticos antes del lanzamiento"
         
-        html += f"""
+        yield f"""
     <!-- PRÓXIMOS PASOS -->
     <section class="content-section">
         <h2 class="section-title">Próximos Pasos Recomendados</h2>
@@ -1712,21 +5100,75 @@ class AuditorOKROptimizado:
     </footer>
 </body>
 </html>"""
-        
 
+    ETAPAS_AUDITORIA = (
+        ("estructura", "verificar_estructura_modulos"),
+        ("ortografia", "revisar_ortografia_optimizada"),
+        ("videos", "analizar_videos"),
+        ("audio", "analizar_audio_videos"),
+    )
 
-        # Guardar reporte
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        ruta_reporte = self.ruta_base / f"Reporte_Auditoria_OKR_3IT_Audio_{timestamp}.html"
-        
-        with open(ruta_reporte, 'w', encoding='utf-8') as f:
-            f.write(html)
-        
-        print(f"📄 Reporte 3IT con audio optimizado para PDF guardado en: {ruta_reporte}")
-        return ruta_reporte
+    async def ejecutar_etapas_concurrentes(self):
+        """
+        Estructura, ortografía, videos y audio a la vez, cada etapa en su propio hilo.
+        Dentro de cada etapa siguen valiendo sus límites (concurrencia_ortografia, trabajadores_audio).
+        Cada etapa trabaja sobre una vista del auditor con reporte y medidor propios. Su parcial se
+        incorpora al reporte cuando terminan ella y las anteriores, no apenas termina: problemas_criticos
+        y problemas_menores los llenan varias etapas, y así sus filas quedan en el mismo orden que en la
+        ejecución secuencial. Mientras tanto la consola pasa por ConsolaEtapas
+        """
+        self.obtener_inventario()
+        consola = ConsolaEtapas(sys.stdout)
+        sys.stdout = consola
+        try:
+            vistas = []
+            for nombre, metodo in self.ETAPAS_AUDITORIA:
+                # Copia superficial armada a mano: copy.copy pasaría por __getstate__ y perdería LanguageTool
+                vista = object.__new__(type(self))
+                vista.__dict__.update(self.__dict__)
+                vista.reporte = self.reporte_vacio()
+                vista.medidor = MedidorEtapas(compartido=True)
+                tarea = asyncio.create_task(asyncio.to_thread(self._ejecutar_etapa, vista, nombre, metodo, consola))
+                vistas.append((nombre, vista, tarea))
+            
+            for nombre, vista, tarea in vistas:
+                await tarea
+                self._incorporar_parcial(vista.reporte)
+                for registro in vista.medidor.etapas:
+                    registro["dentro_de"] = "etapas_concurrentes"
+                    self.medidor.etapas.append(registro)
+                # El pool de audio lo crea la vista: queda en el auditor para las próximas ejecuciones
+                if self._pool_audio is None:
+                    self._pool_audio = vista._pool_audio
+                print(f"✅ Etapa '{nombre}' incorporada al reporte")
+        finally:
+            sys.stdout = consola.cerrar()
+
+    @staticmethod
+    def _ejecutar_etapa(vista, nombre, metodo, consola=None):
+        if consola is not None:
+            consola.asignar_etapa(nombre)
+        with vista.medidor.etapa(nombre):
+            getattr(vista, metodo)()
+        # Aviso apenas termina, aunque se incorpore al reporte después de las anteriores
+        print(f"🏁 Etapa {nombre!r} terminada")
+
+    def _incorporar_parcial(self, parcial):
+        """Sumar al reporte lo que agregó una etapa en su reporte parcial"""
+        vacio = self.reporte_vacio()
+        for clave, valor in parcial.items():
+            if clave == "timestamp":
+                continue
+            if isinstance(valor, (list, ListaEnDisco)):
+                self.reporte[clave].extend(valor)
+            elif isinstance(valor, dict):
+                self.reporte[clave].update({k: v for k, v in valor.items() if v != vacio[clave].get(k)})
 
-    def ejecutar_auditoria_optimizada(self):
-        """Ejecutar auditoría MEJORADA con diseño 3IT + análisis de audio completo"""
+    def ejecutar_auditoria_optimizada(self, inventario=None):
+        """
+        Ejecutar auditoría MEJORADA con diseño 3IT + análisis de audio completo
+        inventario: escaneo ya hecho del curso (modo vigilancia); si no se indica se escanea aquí
+        """
         print("🚀 Iniciando Auditoría COMPLETA con diseño 3IT + Audio...")
         print("=" * 70)
         print("🎯 FUNCIONALIDADES IMPLEMENTADAS:")
@@ -1742,20 +5184,60 @@ class AuditorOKROptimizado:
         print("=" * 70)
         
         try:
-            # Paso 1: Verificar estructura de módulos
-            self.verificar_estructura_modulos()
+            self.medidor.reiniciar()
+            if self.coordinador:
+                # Los trabajadores auditan con la misma configuración y especificación que este auditor
+                self.coordinador.configurar(self)
             
-            # Paso 2: Revisar ortografía MEJORADA
-            self.revisar_ortografia_optimizada()
+            # Paso 0: Un único escaneo del árbol del curso, compartido por todas las etapas
+            with self.medidor.etapa("inventario"):
+                self.inventario = inventario
+                self.sondeos = {}
+                self.obtener_inventario()
+                if self.ruta_inventario:
+                    self.inventario.exportar(self.ruta_inventario)
+                    print(f"📂 Inventario exportado en: {self.ruta_inventario}")
             
-            # Paso 3: Analizar videos (archivos)
-            self.analizar_videos()
+            if self.etapas_concurrentes:
+                # Pasos 1 a 4 solapados: el tiempo total se acerca al de la etapa más lenta
+                with self.medidor.etapa("etapas_concurrentes"):
+                    asyncio.run(self.ejecutar_etapas_concurrentes())
+            else:
+                # Paso 1: Verificar estructura de módulos
+                with self.medidor.etapa("estructura"):
+                    self.verificar_estructura_modulos()
+                
+                # Paso 2: Revisar ortografía MEJORADA
+                with self.medidor.etapa("ortografia"):
+                    self.revisar_ortografia_optimizada()
+                
+                # Paso 3: Analizar videos (archivos)
+                with self.medidor.etapa("videos"):
+                    self.analizar_videos()
+                
+                # Paso 4: ✅ NUEVO - Analizar AUDIO de videos
+                with self.medidor.etapa("audio"):
+                    self.analizar_audio_videos()
             
-            # Paso 4: ✅ NUEVO - Analizar AUDIO de videos
-            self.analizar_audio_videos()
+            if self.cache:
+                with self.medidor.etapa("cache"):
+                    self.cache.persistir()
+                    self.cache_parrafos.persistir()
+                print(f"♻️ Caché: {self.cache.aciertos} archivos reutilizados, {self.cache.fallos} procesados")
+                print(f"♻️ Párrafos: {self.cache_parrafos.reutilizados} reutilizados, "
+                      f"{self.cache_parrafos.revisados} enviados a LanguageTool")
             
             # Paso 5: Generar reporte 3IT + Audio
-            ruta_reporte = self.generar_reporte_3it_optimizado()
+            with self.medidor.etapa("reporte_html"):
+                ruta_reporte = self.generar_reporte_3it_optimizado()
+            
+            # Tiempos por etapa: en el reporte y en un JSON para comparar ejecuciones
+            self.reporte["rendimiento"] = self.medidor.a_dict()
+            ruta_tiempos = Path(self.ruta_tiempos) if self.ruta_tiempos else ruta_reporte.with_name(ruta_reporte.stem + "_tiempos.json")
+            try:
+                self.medidor.exportar(ruta_tiempos)
+            except OSError as e:
+                print(f"⚠️ No se pudieron guardar los tiempos: {e}")
             
             # ✅ TODO ESTO VA DENTRO DEL TRY
             print("=" * 70)
@@ -1769,7 +5251,7 @@ class AuditorOKROptimizado:
             
             # ✅ ESTADÍSTICAS DE AUDIO
             if "problemas_audio" in self.reporte and self.reporte["problemas_audio"]:
-                videos_con_audio_problemas = len([v for v in self.reporte["problemas_audio"] if v["estado_audio"] == "PROBLEMAS"])
+                videos_con_audio_problemas = self.reporte["resumen_ejecutivo"]["videos_audio_con_problemas"]
                 total_videos_audio = len(self.reporte["problemas_audio"])
                 print(f"   🎵 Videos analizados (audio): {total_videos_audio}")
                 print(f"   🎵 Videos con problemas de audio: {videos_con_audio_problemas}")
@@ -1778,6 +5260,9 @@ class AuditorOKROptimizado:
             print(f"   💯 Completitud: {self.reporte['resumen_ejecutivo']['porcentaje_completitud']:.0f}%")
             print("=" * 70)
             print(f"📄 REPORTE: {ruta_reporte}")
+            print(f"⏱️ TIEMPOS: {ruta_tiempos}")
+            print("=" * 70)
+            self.medidor.imprimir_resumen()
             print("=" * 70)
             
             if len(self.reporte['problemas_criticos']) == 0:
@@ -1804,6 +5289,178 @@ class AuditorOKROptimizado:
             traceback.print_exc()
             return None, None
 
+    def vigilar(self, intervalo=2.0, espera=5.0, max_ciclos=None):
+        """
+        Modo vigilancia: auditar, y volver a auditar cada vez que cambian archivos del curso.
+        LanguageTool y los lexicones siguen cargados entre ciclos, y la caché incremental hace
+        que solo se revisen de nuevo los archivos creados o modificados.
+        intervalo: segundos entre escaneos del árbol
+        espera: segundos sin cambios antes de re-auditar (una sincronización en ráfaga dispara un solo ciclo)
+        max_ciclos: re-auditorías antes de salir (None = hasta Ctrl+C)
+        """
+        if self.cache is None:
+            self.activar_cache()
+        
+        self.reporte_fijo = True
+        auditado = InventarioCurso.escanear(self.ruta_base)
+        self.ejecutar_auditoria_optimizada(auditado)
+        print("📄 Cada ciclo sobrescribe Reporte_Auditoria_OKR_3IT_Audio_vigilancia en la carpeta del curso")
+        print(f"👀 Vigilando {self.ruta_base} (escaneo cada {intervalo:g} s, espera de {espera:g} s). Ctrl+C para salir")
+        
+        anterior = auditado
+        ultimo_cambio = None
+        ciclos = 0
+        try:
+            while max_ciclos is None or ciclos < max_ciclos:
+                time.sleep(intervalo)
+                try:
+                    actual = InventarioCurso.escanear(self.ruta_base)
+                except OSError as e:
+                    # Carpeta movida o borrada a mitad de la sincronización: se reintenta en el próximo escaneo
+                    print(f"⚠️ No se pudo escanear el curso: {e}")
+                    continue
+                
+                if any(actual.comparar(anterior).values()):
+                    ultimo_cambio = time.monotonic()
+                anterior = actual
+                
+                if ultimo_cambio is None or time.monotonic() - ultimo_cambio < espera:
+                    continue
+                ultimo_cambio = None
+                
+                cambios = actual.comparar(auditado)
+                if not any(cambios.values()):
+                    continue
+                
+                print("=" * 70)
+                print(f"🔄 Cambios detectados ({datetime.now().strftime('%H:%M:%S')}):")
+                for clave, simbolo in (("nuevos", "➕"), ("modificados", "✏️"), ("eliminados", "➖")):
+                    for relativa in cambios[clave]:
+                        print(f"   {simbolo} {relativa}")
+                
+                self.cache.aciertos = self.cache.fallos = 0
+                self.cache_parrafos.reutilizados = self.cache_parrafos.revisados = 0
+                self.reiniciar_reporte()
+                self.ejecutar_auditoria_optimizada(actual)
+                auditado = actual
+                ciclos += 1
+        except KeyboardInterrupt:
+            print("\n👋 Vigilancia detenida")
+        finally:
+            self.reporte_fijo = False
+        return self.reporte
+
+    def auditar_portafolio(self, cursos, carpeta_salida):
+        """
+        Auditar varios cursos seguidos con el mismo LanguageTool, lexicones y procesos de audio.
+        cursos: rutas, o tuplas (ruta, EspecificacionCurso); cada curso deja su reporte en su carpeta
+        y en carpeta_salida se escribe el resumen del portafolio (HTML y JSON).
+        Devuelve (resumen por curso, ruta del HTML)
+        """
+        carpeta_salida = Path(carpeta_salida)
+        carpeta_salida.mkdir(parents=True, exist_ok=True)
+        
+        resumen = []
+        for n, curso in enumerate(cursos, 1):
+            ruta, especificacion = curso if isinstance(curso, tuple) else (curso, None)
+            print("=" * 70)
+            print(f"📚 CURSO {n}/{len(cursos)}: {ruta}")
+            try:
+                self.cambiar_curso(ruta, especificacion)
+            except (OSError, ValueError) as e:
+                print(f"❌ Especificación inválida para {ruta}: {e}")
+                resumen.append({"curso": Path(ruta).name, "ruta": str(ruta), "reporte": None, "error": str(e)})
+                continue
+            
+            reporte, ruta_reporte = self.ejecutar_auditoria_optimizada()
+            fila = {"curso": self.especificacion.nombre, "ruta": str(self.ruta_base),
+                    "reporte": str(ruta_reporte) if ruta_reporte else None}
+            if reporte:
+                ejecutivo = reporte["resumen_ejecutivo"]
+                fila.update({
+                    "porcentaje_completitud": ejecutivo["porcentaje_completitud"],
+                    "archivos_revisados": ejecutivo["archivos_revisados"],
+                    "problemas_criticos": ejecutivo["problemas_criticos"],
+                    "problemas_menores": ejecutivo["problemas_menores"],
+                    "errores_ortograficos": len(reporte["errores_ortograficos"]),
+                    "videos_con_problemas_audio": ejecutivo["videos_audio_con_problemas"],
+                    "tiempo_s": reporte["rendimiento"]["tiempo_total_s"]
+                })
+            else:
+                fila["error"] = "La auditoría no terminó (ver consola)"
+            resumen.append(fila)
+        
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        ruta_json = carpeta_salida / f"Portafolio_Auditoria_3IT_{timestamp}.json"
+        with open(ruta_json, 'w', encoding='utf-8') as f:
+            json.dump({"generado": datetime.now().strftime("%Y-%m-%d %H:%M:%S"), "cursos": resumen},
+                      f, ensure_ascii=False, indent=2)
+        
+        ruta_html = carpeta_salida / f"Portafolio_Auditoria_3IT_{timestamp}.html"
+        logo_css, logo_html, logo_footer_html = self._estilos_logo(self.verificar_logo_existe(carpeta_salida))
+        self._escribir_html(ruta_html, self._html_portafolio(resumen, logo_css, logo_html))
+        
+        print("=" * 70)
+        print(f"📚 PORTAFOLIO: {len(resumen)} cursos, {sum(1 for c in resumen if 'error' in c)} con errores")
+        for fila in resumen:
+            if "error" in fila:
+                print(f"   ❌ {fila['curso']}: {fila['error']}")
+            else:
+                print(f"   {'✅' if fila['problemas_criticos'] == 0 else '⚠️'} {fila['curso']}: "
+                      f"{fila['porcentaje_completitud']:.0f}% completo, {fila['problemas_criticos']} críticos, "
+                      f"{fila['errores_ortograficos']} errores ortográficos")
+        print(f"📄 RESUMEN DEL PORTAFOLIO: {ruta_html}")
+        return resumen, ruta_html
+
+    def _html_portafolio(self, resumen, logo_css, logo_html):
+        """Resumen del portafolio: una fila por curso con enlace a su reporte"""
+        yield from self._html_documento(logo_css, "Portafolio de Cursos - 3IT")
+        yield from self._html_cabecera(logo_html, f"{len(resumen)} cursos auditados", titulo="Portafolio de Cursos")
+        yield """
+    <section class="content-section">
+        <h2 class="section-title">Estado por Curso</h2>
+        <div class="table-container">
+            <table>
+                <thead>
+                    <tr>
+                        <th>Curso</th>
+                        <th>Completitud</th>
+                        <th>Críticos</th>
+                        <th>Menores</th>
+                        <th>Errores Ortográficos</th>
+                        <th>Audio con Problemas</th>
+                        <th>Reporte</th>
+                    </tr>
+                </thead>
+                <tbody>
+            """
+        for fila in resumen:
+            if "error" in fila:
+                yield f"""
+                    <tr>
+                        <td><span class="file-name">{fila['curso']}</span><br><small>{fila['ruta']}</small></td>
+                        <td colspan="6"><span class="badge badge-critical">{fila['error']}</span></td>
+                    </tr>
+                """
+                continue
+            badge_class = "success" if fila["problemas_criticos"] == 0 else "critical"
+            yield f"""
+                    <tr>
+                        <td><span class="file-name">{fila['curso']}</span><br><small>{fila['ruta']}</small></td>
+                        <td>{fila['porcentaje_completitud']:.0f}%</td>
+                        <td><span class="badge badge-{badge_class}">{fila['problemas_criticos']}</span></td>
+                        <td>{fila['problemas_menores']}</td>
+                        <td>{fila['errores_ortograficos']}</td>
+                        <td>{fila['videos_con_problemas_audio']}</td>
+                        <td><a href="{Path(fila['reporte']).resolve().as_uri()}">Abrir</a></td>
+                    </tr>
+                """
+        yield self._html_tabla_fin()
+        yield """
+    </section>
+</body>
+</html>"""
+
 
 # ✅ FUNCIÓN PRINCIPAL COMPLETA
 def main():
@@ -1811,13 +5468,110 @@ def main():
     Auditor OKR COMPLETO con Diseño 3IT + Análisis de Audio
     Versión final integrada
     """
-    ruta_sharepoint = r"C:\Capacitación Externa"
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Auditor OKR COMPLETO con Diseño 3IT + Análisis de Audio")
+    parser.add_argument("rutas", nargs="*", default=[r"C:\Capacitación Externa"], metavar="ruta",
+                        help="Carpeta sincronizada del curso (con MODULO 1..N); varias = portafolio de cursos")
+    parser.add_argument("--especificacion", default=None, metavar="ARCHIVO_JSON",
+                        help=f"Ficha de los cursos que no traen su propio {ARCHIVO_ESPECIFICACION} (por defecto, el curso OKR)")
+    parser.add_argument("--salida-portafolio", default=".", metavar="CARPETA",
+                        help="Dónde guardar el resumen del portafolio cuando se auditan varios cursos")
+    parser.add_argument("--modo-audio", choices=MODOS_AUDIO, default="completo",
+                        help="'streaming' decodifica por bloques con memoria constante (videos largos); "
+                             "'muestreo' estima las métricas con unas pocas ventanas (revisión rápida)")
+    parser.add_argument("--ventanas-muestreo", type=int, default=12,
+                        help="Ventanas decodificadas por video en modo muestreo")
+    parser.add_argument("--segundos-ventana", type=float, default=10,
+                        help="Duración de cada ventana en modo muestreo")
+    parser.add_argument("--veredicto-rapido", action="store_true",
+                        help="Control aprobado/rechazado: dejar de decodificar un video en cuanto es crítico con seguridad")
+    parser.add_argument("--trabajadores-audio", type=int, default=1,
+                        help="Procesos para analizar audio en paralelo (0 = todos los núcleos)")
+    parser.add_argument("--motor-audio", choices=MOTORES_AUDIO, default="pydub",
+                        help="'numpy' calcula volumen y silencios de forma vectorizada; la caché y el historial "
+                             "guardan sus resultados aparte de los de PyDub")
+    parser.add_argument("--exportar-inventario", default=None, metavar="ARCHIVO_JSON",
+                        help="Guardar el inventario de archivos del curso para comparar ejecuciones")
+    parser.add_argument("--servidor-languagetool", default=None, metavar="[HOST:]PUERTO",
+                        help="Usar (y arrancar si hace falta) un servidor LanguageTool persistente compartido")
+    parser.add_argument("--exportar-tiempos", default=None, metavar="ARCHIVO_JSON",
+                        help="Dónde guardar los tiempos por etapa (por defecto junto al reporte)")
+    parser.add_argument("--perfil-memoria", action="store_true",
+                        help="Medir también el pico de memoria Python por etapa (tracemalloc, más lento)")
+    parser.add_argument("--filas-por-pagina", type=int, default=None, metavar="N",
+                        help="Dividir el reporte en un índice y páginas por módulo, con N filas por tabla")
+    parser.add_argument("--revisar-tablas", action="store_true",
+                        help="Revisar también tablas, encabezados, pies de página, cuadros de texto y notas de los documentos")
+    parser.add_argument("--generar-lexico", action="store_true",
+                        help="Regenerar el lexicón inglés compacto desde NLTK y salir")
+    parser.add_argument("--etapas-concurrentes", action="store_true",
+                        help="Ejecutar estructura, ortografía, videos y audio solapadas en lugar de una tras otra")
+    parser.add_argument("--concurrencia-ortografia", type=int, default=1,
+                        help="Documentos revisados a la vez (consultas simultáneas a LanguageTool)")
+    parser.add_argument("--vigilar", action="store_true",
+                        help="Quedarse vigilando la carpeta y re-auditar solo lo que cambie (activa la caché)")
+    parser.add_argument("--intervalo-vigilancia", type=float, default=2.0, metavar="SEGUNDOS",
+                        help="Segundos entre escaneos de la carpeta en modo vigilancia")
+    parser.add_argument("--espera-vigilancia", type=float, default=5.0, metavar="SEGUNDOS",
+                        help="Segundos sin cambios antes de re-auditar (agrupa sincronizaciones en ráfaga)")
+    parser.add_argument("--cache", action="store_true",
+                        help="Reutilizar resultados de archivos sin cambios desde la última ejecución")
+    parser.add_argument("--ruta-cache", default=None,
+                        help="Archivo de caché (por defecto .auditoria_okr_cache.json en la carpeta del curso)")
+    parser.add_argument("--reporte-en-disco", action="store_true",
+                        help="Guardar los hallazgos en una base temporal en disco (memoria acotada en auditorías enormes)")
+    parser.add_argument("--historial", nargs="?", const="", default=None, metavar="ARCHIVO_SQLITE",
+                        help="Guardar las métricas de audio de cada ejecución en SQLite, reutilizarlas para videos sin cambios "
+                             "y mostrar su evolución (por defecto .auditoria_okr_historial.sqlite3 en la carpeta del curso)")
+    parser.add_argument("--coordinar", nargs="?", const=str(PUERTO_COLA), default=None, metavar="[HOST:]PUERTO",
+                        help=f"Repartir documentos y videos entre trabajadores conectados a esta cola (puerto {PUERTO_COLA} por defecto)")
+    parser.add_argument("--trabajador", default=None, metavar="HOST:PUERTO",
+                        help="Trabajar para el coordinador en esa dirección (no audita ninguna ruta por sí mismo)")
+    parser.add_argument("--clave-cola", default=os.environ.get("AUDITORIA_OKR_CLAVE"), metavar="CLAVE",
+                        help="Clave compartida entre coordinador y trabajadores (por defecto $AUDITORIA_OKR_CLAVE)")
+    parser.add_argument("--reintentos-cola", type=int, default=2,
+                        help="Veces que una tarea vuelve a la cola si se pierde el trabajador que la tenía")
+    parser.add_argument("--montaje", default=None, metavar="RUTA_COORDINADOR=RUTA_LOCAL",
+                        help="En un trabajador: dónde está montada en este host la carpeta de cursos del coordinador")
+    args = parser.parse_args()
+    
+    if args.generar_lexico:
+        lexico = LexicoCompacto.generar(RUTA_LEXICO_INGLES, words.words(), huella_corpus_ingles())
+        print(f"✅ Lexicón generado: {RUTA_LEXICO_INGLES} ({len(lexico)} palabras)")
+        return
+    
+    if (args.coordinar or args.trabajador) and not args.clave_cola:
+        print("❌ Error: La cola distribuida necesita --clave-cola (o AUDITORIA_OKR_CLAVE)")
+        return
+    
+    if args.trabajador:
+        montaje = tuple(args.montaje.split("=", 1)) if args.montaje and "=" in args.montaje else None
+        trabajador = TrabajadorAuditoria(direccion_cola(args.trabajador), args.clave_cola,
+                                         servidor_languagetool=args.servidor_languagetool, montaje=montaje)
+        try:
+            trabajador.ejecutar()
+        except KeyboardInterrupt:
+            print(f"\n🛑 Trabajador detenido ({trabajador.tareas} tareas resueltas)")
+        return
     
-    # Verificar que la ruta existe
-    if not Path(ruta_sharepoint).exists():
-        print("❌ Error: La ruta especificada no existe.")
+    # Verificar que las rutas existen
+    faltantes = [ruta for ruta in args.rutas if not Path(ruta).exists()]
+    if faltantes:
+        print(f"❌ Error: La ruta especificada no existe: {', '.join(faltantes)}")
         print("📁 Verifica la ruta de la carpeta sincronizada")
         return
+    if args.vigilar and len(args.rutas) > 1:
+        print("❌ Error: El modo vigilancia trabaja sobre un solo curso")
+        return
+    
+    especificacion = None
+    if args.especificacion:
+        try:
+            especificacion = EspecificacionCurso.cargar(args.especificacion)
+        except (OSError, ValueError) as e:
+            print(f"❌ Error leyendo la especificación {args.especificacion}: {e}")
+            return
 
     print("🎯 AUDITOR OKR COMPLETO + DISEÑO 3IT + AUDIO v2.0")
     print("Desarrollado por Romina Sáez - 3IT Ingeniería y Desarrollo")
@@ -1844,9 +5598,70 @@ def main():
     print("   • Detecta problemas de volumen, silencios y calidad")
     print()
     
+    if args.perfil_memoria:
+        tracemalloc.start()
+    
     # Crear auditor y ejecutar
-    auditor = AuditorOKROptimizado(ruta_sharepoint)
-    reporte, archivo_reporte = auditor.ejecutar_auditoria_optimizada()
+    coordinador = None
+    if args.coordinar:
+        try:
+            coordinador = CoordinadorAuditoria(direccion_cola(args.coordinar, "0.0.0.0"), args.clave_cola,
+                                               reintentos=args.reintentos_cola)
+        except OSError as e:
+            print(f"❌ Error abriendo la cola distribuida en {args.coordinar}: {e}")
+            return
+    
+    # El portafolio vuelve a leer la ficha de cada curso al llegar a él: el auditor se crea sobre el
+    # primer curso con ficha válida, así una ficha rota solo marca como fallido a su propio curso
+    ruta_inicial = args.rutas[0]
+    if len(args.rutas) > 1:
+        for ruta in args.rutas:
+            try:
+                EspecificacionCurso.para_curso(ruta, especificacion)
+            except (OSError, ValueError):
+                continue
+            ruta_inicial = ruta
+            break
+    try:
+        auditor = AuditorOKROptimizado(ruta_inicial, modo_audio=args.modo_audio,
+                                       trabajadores_audio=args.trabajadores_audio,
+                                       usar_cache=args.cache or args.vigilar, ruta_cache=args.ruta_cache,
+                                       motor_audio=args.motor_audio,
+                                       ruta_inventario=args.exportar_inventario,
+                                       servidor_languagetool=args.servidor_languagetool,
+                                       concurrencia_ortografia=args.concurrencia_ortografia,
+                                       ruta_tiempos=args.exportar_tiempos,
+                                       filas_por_pagina=args.filas_por_pagina,
+                                       revisar_tablas=args.revisar_tablas,
+                                       especificacion=especificacion,
+                                       etapas_concurrentes=args.etapas_concurrentes,
+                                       ventanas_muestreo=args.ventanas_muestreo,
+                                       segundos_ventana=args.segundos_ventana,
+                                       veredicto_rapido=args.veredicto_rapido,
+                                       historial=args.historial is not None,
+                                       ruta_historial=args.historial or None,
+                                       reporte_en_disco=args.reporte_en_disco,
+                                       coordinador=coordinador)
+    except (OSError, ValueError) as e:
+        print(f"❌ Configuración de auditoría inválida: {e}")
+        if coordinador:
+            coordinador.cerrar()
+        return
+    
+    try:
+        if args.vigilar:
+            auditor.vigilar(intervalo=args.intervalo_vigilancia, espera=args.espera_vigilancia)
+            return
+        
+        if len(args.rutas) > 1:
+            # Un solo LanguageTool, lexicón y pool de audio para todos los cursos
+            auditor.auditar_portafolio(args.rutas, args.salida_portafolio)
+            return
+        
+        reporte, archivo_reporte = auditor.ejecutar_auditoria_optimizada()
+    finally:
+        # Con --reporte-en-disco esto cierra el almacén: de ahí en más sus listas solo informan len()
+        auditor.cerrar()
     
     if reporte:
         print("\n🎯 RESUMEN FINAL COMPLETO CON DISEÑO 3IT + AUDIO:")
@@ -1858,7 +5673,7 @@ def main():
         
         # ✅ ESTADÍSTICAS DE AUDIO EN RESUMEN
         if "problemas_audio" in reporte and reporte["problemas_audio"]:
-            videos_con_problemas_audio = len([v for v in reporte["problemas_audio"] if v["estado_audio"] == "PROBLEMAS"])
+            videos_con_problemas_audio = reporte["resumen_ejecutivo"]["videos_audio_con_problemas"]
             total_videos_audio = len(reporte["problemas_audio"])
             print(f"   🎵 Videos analizados (audio): {total_videos_audio}")
             print(f"   🎵 Videos con problemas de audio: {videos_con_problemas_audio}")
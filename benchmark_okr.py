@@ -0,0 +1,367 @@
+"""
+Banco de pruebas de rendimiento del Auditor OKR
+
+Genera un curso sintético (MODULO N/MATERIAL DE ESTUDIO y MODULO N/VIDEOS) a la escala pedida y
+ejecuta cada etapa de AuditorOKROptimizado sin conexión, con un corrector local en lugar de
+LanguageTool. Informa ítems/s y heap Python pico por etapa para comparar cambios antes de publicarlos.
+"""
+import io
+import json
+import re
+import sys
+import math
+import random
+import shutil
+import statistics
+import subprocess
+import tempfile
+import time
+import tracemalloc
+import wave
+from array import array
+from collections import namedtuple
+from contextlib import redirect_stdout
+from pathlib import Path
+
+from audit_okr import (AuditorOKROptimizado, ARCHIVO_ESPECIFICACION, CARPETA_DOCUMENTOS, CARPETA_VIDEOS,
+                       MODOS_AUDIO, MOTORES_AUDIO)
+
+FRECUENCIA_MUESTREO = 44100
+FRECUENCIA_TONO = 441  # periodo exacto de 100 muestras a 44.1 kHz
+
+# Vocabulario de relleno (palabras que el corrector sintético nunca marca)
+VOCABULARIO = (
+    "el", "la", "los", "las", "un", "una", "de", "del", "en", "con", "por", "para", "que", "como",
+    "objetivo", "resultado", "clave", "equipo", "empresa", "proyecto", "trimestre", "medición",
+    "estrategia", "alineación", "seguimiento", "indicador", "avance", "meta", "prioridad", "valor",
+    "organización", "gestión", "evaluación", "información", "comunicación", "planificación",
+    "cliente", "proceso", "mejora", "calidad", "tiempo", "propuesta", "revisión", "compromiso"
+)
+
+# Erratas inyectadas: las tipográficas comunes (siempre reportadas) y palabras inventadas
+ERRATAS_COMUNES = {
+    "herrmientas": "herramientas", "anlaisis": "análisis", "implementacion": "implementación",
+    "organizacion": "organización", "evaluacion": "evaluación", "gestion": "gestión",
+    "comunicacion": "comunicación", "planificacion": "planificación", "capacitacion": "capacitación"
+}
+
+# Perfiles de audio: cada video usa uno, en rotación, para recorrer todas las ramas del análisis
+PERFILES_AUDIO = ("normal", "silencios", "saturado", "bajo")
+
+CoincidenciaSintetica = namedtuple("CoincidenciaSintetica", "offset errorLength replacements context ruleIssueType")
+
+
+class CorrectorSintetico:
+    """
+    Sustituto local de LanguageTool: marca las erratas conocidas del curso sintético, con la
+    misma forma de resultado (offset, errorLength, replacements, context). latencia_ms simula
+    el costo de la consulta a un servidor real
+    """
+
+    PATRON_PALABRA = re.compile(r"\w+")
+
+    def __init__(self, erratas, latencia_ms=0):
+        self.erratas = {clave.lower(): valor for clave, valor in erratas.items()}
+        self.latencia_ms = latencia_ms
+        self.consultas = 0
+
+    def check(self, texto):
+        self.consultas += 1
+        if self.latencia_ms:
+            time.sleep(self.latencia_ms / 1000)
+        coincidencias = []
+        for m in self.PATRON_PALABRA.finditer(texto):
+            sugerencia = self.erratas.get(m.group(0).lower())
+            if sugerencia is not None:
+                coincidencias.append(CoincidenciaSintetica(
+                    m.start(), len(m.group(0)), [sugerencia],
+                    texto[max(0, m.start() - 40):m.end() + 40], "misspelling"
+                ))
+        return coincidencias
+
+
+def generar_texto(aleatorio, palabras, erratas, proporcion_erratas):
+    """Párrafo de relleno con erratas intercaladas según la proporción pedida"""
+    salida = []
+    for _ in range(palabras):
+        if aleatorio.random() < proporcion_erratas:
+            salida.append(aleatorio.choice(erratas))
+        else:
+            salida.append(aleatorio.choice(VOCABULARIO))
+    return " ".join(salida).capitalize() + "."
+
+
+def generar_docx(ruta, aleatorio, parrafos, palabras_por_parrafo, erratas, proporcion_erratas):
+    from docx import Document
+
+    documento = Document()
+    documento.add_heading(f"Material sintético {ruta.stem}", level=1)
+    for _ in range(parrafos):
+        documento.add_paragraph(generar_texto(aleatorio, palabras_por_parrafo, erratas, proporcion_erratas))
+    documento.save(str(ruta))
+
+
+def señal_audio(perfil, segundos):
+    """
+    PCM mono 16 bits (array 'h') para un perfil de audio:
+    normal (tono a -12 dBFS), silencios (un tercio en silencio), saturado (onda cuadrada a escala
+    completa) y bajo (tono a -44 dBFS)
+    """
+    amplitud = {"normal": 10 ** (-12 / 20), "silencios": 10 ** (-12 / 20), "bajo": 10 ** (-44 / 20)}.get(perfil, 1.0)
+    periodo_muestras = FRECUENCIA_MUESTREO // FRECUENCIA_TONO
+    if perfil == "saturado":
+        periodo = array('h', [32767] * (periodo_muestras // 2) + [-32768] * (periodo_muestras - periodo_muestras // 2))
+    else:
+        periodo = array('h', (int(32767 * amplitud * math.sin(2 * math.pi * i / periodo_muestras))
+                              for i in range(periodo_muestras)))
+
+    un_segundo = periodo * FRECUENCIA_TONO
+    silencio = array('h', bytes(2 * FRECUENCIA_MUESTREO))
+    muestras = array('h')
+    for segundo in range(int(segundos)):
+        # Perfil "silencios": 3 s de silencio cada 9 s
+        if perfil == "silencios" and segundo % 9 >= 6:
+            muestras.extend(silencio)
+        else:
+            muestras.extend(un_segundo)
+    return muestras
+
+
+def generar_video(ruta, perfil, segundos, ffmpeg):
+    """Video mínimo (imagen negra) con la pista de audio del perfil, codificado con ffmpeg"""
+    with tempfile.TemporaryDirectory() as temporal:
+        ruta_wav = Path(temporal) / "audio.wav"
+        with wave.open(str(ruta_wav), "wb") as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(FRECUENCIA_MUESTREO)
+            wav.writeframes(señal_audio(perfil, segundos).tobytes())
+
+        codec_audio = "aac" if ruta.suffix.lower() == ".mp4" else "pcm_s16le"
+        subprocess.run([
+            ffmpeg, "-y", "-loglevel", "error",
+            "-f", "lavfi", "-i", "color=c=black:s=64x64:r=1",
+            "-i", str(ruta_wav),
+            "-shortest", "-c:v", "mpeg4", "-c:a", codec_audio, str(ruta)
+        ], check=True)
+
+
+def generar_curso(ruta_base, modulos=6, documentos_por_modulo=3, parrafos=40, palabras_por_parrafo=60,
+                  proporcion_erratas=0.02, videos_por_modulo=2, segundos_audio=60, semilla=0):
+    """
+    Crear un árbol de curso sintético y devolver el diccionario de erratas inyectadas
+    (para el corrector sintético). Los videos requieren ffmpeg en el PATH
+    """
+    aleatorio = random.Random(semilla)
+    ruta_base = Path(ruta_base)
+
+    inventadas = {}
+    while len(inventadas) < 20:
+        palabra = "".join(aleatorio.choice("bcdfghjklmnpqrstvwxz") + aleatorio.choice("aeiou") for _ in range(4))
+        inventadas[palabra] = palabra[:-1]
+    erratas = dict(ERRATAS_COMUNES, **inventadas)
+    lista_erratas = sorted(erratas)
+
+    ffmpeg = shutil.which("ffmpeg")
+    if videos_por_modulo and not ffmpeg:
+        print("⚠️ ffmpeg no está en el PATH: el curso sintético se genera sin videos")
+        videos_por_modulo = 0
+
+    # Ficha del curso sintético, para que se audite cualquier cantidad de módulos
+    especificacion = {"nombre": "Sintético", "videos_esperados": videos_por_modulo, "modulos": {}}
+    extensiones = (".mp4", ".mov", ".avi")
+    for m in range(1, modulos + 1):
+        especificacion["modulos"][f"MODULO {m}"] = {
+            "nombre": f"Módulo sintético {m}",
+            "subtemas": [f"{m}.{d} Subtema sintético" for d in range(1, documentos_por_modulo + 1)]
+        }
+        carpeta_documentos = ruta_base / f"MODULO {m}" / CARPETA_DOCUMENTOS
+        carpeta_videos = ruta_base / f"MODULO {m}" / CARPETA_VIDEOS
+        carpeta_documentos.mkdir(parents=True, exist_ok=True)
+        carpeta_videos.mkdir(parents=True, exist_ok=True)
+
+        for d in range(1, documentos_por_modulo + 1):
+            generar_docx(carpeta_documentos / f"Modulo {m}.{d}.docx", aleatorio,
+                         parrafos, palabras_por_parrafo, lista_erratas, proporcion_erratas)
+
+        for v in range(1, videos_por_modulo + 1):
+            indice = (m - 1) * videos_por_modulo + (v - 1)
+            perfil = PERFILES_AUDIO[indice % len(PERFILES_AUDIO)]
+            extension = extensiones[indice % len(extensiones)]
+            generar_video(carpeta_videos / f"Video {m}.{v} {perfil}{extension}", perfil, segundos_audio, ffmpeg)
+
+    with open(ruta_base / ARCHIVO_ESPECIFICACION, 'w', encoding='utf-8') as f:
+        json.dump(especificacion, f, ensure_ascii=False, indent=2)
+
+    return erratas
+
+
+def ejecutar_benchmark(ruta_curso, erratas, repeticiones=3, latencia_ms=0, perfil_memoria=True,
+                       mostrar_salida=False, **opciones_auditor):
+    """
+    Auditar el curso sintético `repeticiones` veces y devolver, por etapa, la mediana de tiempo y de
+    ítems/s y el pico de heap Python (tracemalloc, reiniciado en cada etapa). La memoria residente
+    pico solo se informa para todo el proceso: es un máximo acumulado y no distingue etapas
+    """
+    corridas = []
+    for repeticion in range(repeticiones):
+        if perfil_memoria:
+            tracemalloc.start()
+        corrector = CorrectorSintetico(erratas, latencia_ms)
+        salida = io.StringIO()
+        try:
+            with redirect_stdout(sys.stdout if mostrar_salida else salida):
+                auditor = AuditorOKROptimizado(ruta_curso, corrector=corrector,
+                                               ruta_tiempos=Path(ruta_curso) / f"tiempos_{repeticion}.json",
+                                               **opciones_auditor)
+                try:
+                    reporte, _ = auditor.ejecutar_auditoria_optimizada()
+                finally:
+                    auditor.cerrar()
+        finally:
+            if perfil_memoria:
+                tracemalloc.stop()
+        if reporte is None:
+            raise RuntimeError(f"La auditoría falló en la repetición {repeticion + 1}:\n{salida.getvalue()[-2000:]}")
+        corridas.append(reporte["rendimiento"])
+        print(f"   Repetición {repeticion + 1}/{repeticiones}: {reporte['rendimiento']['tiempo_total_s']:.2f} s "
+              f"({corrector.consultas} consultas al corrector)")
+
+    etapas = {}
+    for corrida in corridas:
+        for etapa in corrida["etapas"]:
+            etapas.setdefault(etapa["etapa"], []).append(etapa)
+
+    resumen = {}
+    for nombre, mediciones in etapas.items():
+        velocidades = [m["items_por_s"] for m in mediciones if m["items_por_s"] is not None]
+        heap = [m["heap_python_pico_kb"] for m in mediciones if m["heap_python_pico_kb"] is not None]
+        resumen[nombre] = {
+            "tiempo_s": round(statistics.median(m["tiempo_s"] for m in mediciones), 4),
+            "tiempo_min_s": round(min(m["tiempo_s"] for m in mediciones), 4),
+            "cpu_s": round(statistics.median(m["cpu_s"] + m["cpu_hijos_s"] for m in mediciones), 4),
+            "items": mediciones[0]["items"],
+            "bytes": mediciones[0]["bytes"],
+            "items_por_s": round(statistics.median(velocidades), 2) if velocidades else None,
+            "heap_python_pico_kb": max(heap) if heap else None,
+            "cpu_compartida": any(m.get("cpu_compartida") for m in mediciones)
+        }
+    picos = [etapa["memoria_pico_kb"] for corrida in corridas for etapa in corrida["etapas"]
+             if etapa["memoria_pico_kb"] is not None]
+    return {
+        "plataforma": corridas[0]["plataforma"],
+        "python": corridas[0]["python"],
+        "cpus": corridas[0]["cpus"],
+        "repeticiones": repeticiones,
+        "tiempo_total_s": round(statistics.median(c["tiempo_total_s"] for c in corridas), 4),
+        "memoria_pico_proceso_kb": max(picos) if picos else None,
+        "etapas": resumen
+    }
+
+
+def imprimir_resultados(resultados, base=None):
+    print(f"{'Etapa':<24} {'Real(s)':>9} {'CPU(s)':>9} {'Ítems':>7} {'Ítems/s':>10} {'Heap MB':>9} {'vs base':>9}")
+    for nombre, etapa in resultados["etapas"].items():
+        velocidad = f"{etapa['items_por_s']:.1f}" if etapa["items_por_s"] is not None else "N/A"
+        heap = f"{etapa['heap_python_pico_kb'] / 1024:.1f}" if etapa["heap_python_pico_kb"] is not None else "N/A"
+        comparacion = ""
+        anterior = (base or {}).get("etapas", {}).get(nombre)
+        if anterior and anterior["tiempo_s"] > 0:
+            comparacion = f"{(etapa['tiempo_s'] / anterior['tiempo_s'] - 1) * 100:+.0f}%"
+        cpu = f"{etapa['cpu_s']:.3f}{'*' if etapa.get('cpu_compartida') else ''}"
+        print(f"{nombre:<24} {etapa['tiempo_s']:>9.3f} {cpu:>9} {etapa['items']:>7} "
+              f"{velocidad:>10} {heap:>9} {comparacion:>9}")
+    print(f"{'TOTAL':<24} {resultados['tiempo_total_s']:>9.3f}")
+    if any(etapa.get("cpu_compartida") for etapa in resultados["etapas"].values()):
+        print("* CPU de todo el proceso mientras la etapa corría junto a las demás (--etapas-concurrentes)")
+    if resultados.get("memoria_pico_proceso_kb") is not None:
+        print(f"Memoria residente pico del proceso (todas las repeticiones): {resultados['memoria_pico_proceso_kb'] / 1024:.0f} MB")
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark del Auditor OKR sobre un curso sintético")
+    parser.add_argument("--ruta", default=None,
+                        help="Carpeta donde generar el curso (por defecto, una temporal que se borra al final)")
+    parser.add_argument("--reutilizar", action="store_true",
+                        help="No regenerar el curso si la carpeta ya existe (solo medir)")
+    parser.add_argument("--modulos", type=int, default=6)
+    parser.add_argument("--documentos", type=int, default=3, help="Documentos por módulo")
+    parser.add_argument("--parrafos", type=int, default=40, help="Párrafos por documento")
+    parser.add_argument("--palabras", type=int, default=60, help="Palabras por párrafo")
+    parser.add_argument("--erratas", type=float, default=0.02, help="Proporción de palabras con errata")
+    parser.add_argument("--videos", type=int, default=2, help="Videos por módulo")
+    parser.add_argument("--segundos-audio", type=int, default=60, help="Duración del audio de cada video")
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument("--latencia-corrector", type=float, default=0, metavar="MS",
+                        help="Latencia simulada por consulta al corrector")
+    parser.add_argument("--sin-perfil-memoria", action="store_true",
+                        help="No usar tracemalloc (más rápido, sin pico de memoria Python por etapa)")
+    parser.add_argument("--modo-audio", choices=MODOS_AUDIO, default="completo")
+    parser.add_argument("--motor-audio", choices=MOTORES_AUDIO, default="pydub")
+    parser.add_argument("--trabajadores-audio", type=int, default=1)
+    parser.add_argument("--concurrencia-ortografia", type=int, default=1)
+    parser.add_argument("--etapas-concurrentes", action="store_true",
+                        help="Solapar estructura, ortografía, videos y audio")
+    parser.add_argument("--salida", default=None, metavar="ARCHIVO_JSON", help="Guardar los resultados")
+    parser.add_argument("--comparar", default=None, metavar="ARCHIVO_JSON",
+                        help="Resultados de una ejecución anterior para comparar tiempos por etapa")
+    parser.add_argument("--verbose", action="store_true", help="Mostrar la salida completa del auditor")
+    args = parser.parse_args()
+
+    temporal = None
+    if args.ruta:
+        ruta_curso = Path(args.ruta)
+    else:
+        temporal = tempfile.mkdtemp(prefix="benchmark_okr_")
+        ruta_curso = Path(temporal)
+
+    try:
+        ruta_erratas = ruta_curso / "erratas_sinteticas.json"
+        if args.reutilizar and ruta_erratas.exists():
+            erratas = json.loads(ruta_erratas.read_text(encoding="utf-8"))
+            print(f"♻️ Reutilizando curso sintético en {ruta_curso}")
+        else:
+            print(f"🔧 Generando curso sintético en {ruta_curso}...")
+            inicio = time.perf_counter()
+            erratas = generar_curso(ruta_curso, args.modulos, args.documentos, args.parrafos, args.palabras,
+                                    args.erratas, args.videos, args.segundos_audio, args.semilla)
+            ruta_erratas.write_text(json.dumps(erratas, ensure_ascii=False), encoding="utf-8")
+            print(f"✅ Curso generado en {time.perf_counter() - inicio:.1f} s")
+
+        print(f"⏱️ Midiendo {args.repeticiones} repeticiones...")
+        resultados = ejecutar_benchmark(
+            ruta_curso, erratas, args.repeticiones, args.latencia_corrector,
+            perfil_memoria=not args.sin_perfil_memoria, mostrar_salida=args.verbose,
+            modo_audio=args.modo_audio, motor_audio=args.motor_audio,
+            trabajadores_audio=args.trabajadores_audio, concurrencia_ortografia=args.concurrencia_ortografia,
+            etapas_concurrentes=args.etapas_concurrentes
+        )
+        resultados["escala"] = {
+            "modulos": args.modulos, "documentos": args.documentos, "parrafos": args.parrafos,
+            "palabras": args.palabras, "erratas": args.erratas, "videos": args.videos,
+            "segundos_audio": args.segundos_audio, "semilla": args.semilla
+        }
+
+        base = None
+        if args.comparar:
+            with open(args.comparar, encoding="utf-8") as f:
+                base = json.load(f)
+
+        print("=" * 90)
+        imprimir_resultados(resultados, base)
+        print("=" * 90)
+
+        if args.salida:
+            with open(args.salida, "w", encoding="utf-8") as f:
+                json.dump(resultados, f, ensure_ascii=False, indent=2)
+            print(f"📄 Resultados guardados en: {args.salida}")
+    finally:
+        if temporal:
+            shutil.rmtree(temporal, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
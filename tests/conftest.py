@@ -0,0 +1,102 @@
+import sys
+import wave
+from pathlib import Path
+
+import pytest
+
+# audit_okr.py es un módulo suelto en la raíz del repositorio
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+# Tramos (segundos, amplitud) de una señal con tonos, silencios y ruido cerca del umbral de -50 dBFS
+TRAMOS_AUDIO = ((3, 0.5), (2.5, 0.0), (3, 0.3), (3.5, 0.0045), (2.5, 0.002), (1.2, 0.99), (2.2, 0.0))
+
+
+@pytest.fixture
+def escribir_wav(tmp_path):
+    """Fábrica de WAV PCM sintéticos: escribir_wav(ancho, canales, frame_rate) -> ruta"""
+    np = pytest.importorskip("numpy")
+
+    def escribir(ancho, canales, frame_rate=16000, tramos=TRAMOS_AUDIO):
+        rnd = np.random.default_rng(1)
+        partes = []
+        for segundos, amplitud in tramos:
+            t = np.arange(int(segundos * frame_rate)) / frame_rate
+            partes.append(amplitud * np.sin(2 * np.pi * 440 * t) + rnd.uniform(-5e-4, 5e-4, len(t)))
+        senal = np.clip(np.concatenate(partes), -1, 1)
+        maximo = 2 ** (8 * ancho - 1) - 1
+        tipo = {1: np.int8, 2: "<i2", 4: "<i4"}[ancho]
+        muestras = np.repeat((senal * maximo).astype(np.int64)[:, None], canales, axis=1)
+        if ancho == 1:
+            # WAV de 8 bits es sin signo
+            datos = (muestras + 128).astype(np.uint8).tobytes()
+        else:
+            datos = muestras.astype(tipo).tobytes()
+        ruta = tmp_path / f"senal_{ancho * 8}b_{canales}c.wav"
+        with wave.open(str(ruta), "wb") as archivo:
+            archivo.setnchannels(canales)
+            archivo.setsampwidth(ancho)
+            archivo.setframerate(frame_rate)
+            archivo.writeframes(datos)
+        return ruta
+
+    return escribir
+
+
+class CorrectorFalso:
+    """
+    Sustituto de LanguageTool: marca como error cada palabra que empieza con 'zz'.
+    Con demora, los documentos más cortos tardan más (terminan en otro orden que el de envío)
+    """
+
+    def __init__(self, demora=0.0):
+        self.demora = demora
+        self.consultas = 0
+
+    def check(self, texto):
+        from types import SimpleNamespace
+        import re
+        import time
+
+        self.consultas += 1
+        if self.demora:
+            time.sleep(self.demora * 1000 / (len(texto) + 100))
+        return [SimpleNamespace(offset=m.start(), errorLength=len(m.group(0)), replacements=["corregida"],
+                                context=texto[max(0, m.start() - 20):m.end() + 20], ruleIssueType="misspelling")
+                for m in re.finditer(r"\bzz\w*", texto)]
+
+
+@pytest.fixture
+def curso(tmp_path):
+    """Curso OKR chico: módulos 1 y 2 con documentos (algunos con errores 'zz...'), sin videos"""
+    docx = pytest.importorskip("docx")
+    ruta = tmp_path / "curso"
+    for modulo in (1, 2):
+        carpeta = ruta / f"MODULO {modulo}" / "MATERIAL DE ESTUDIO"
+        carpeta.mkdir(parents=True)
+        (ruta / f"MODULO {modulo}" / "VIDEOS").mkdir()
+        for n in range(1, 6):
+            documento = docx.Document()
+            relleno = "Texto del subtema sobre objetivos y resultados clave. " * (2 + 3 * n)
+            documento.add_paragraph(relleno)
+            documento.add_paragraph(" ".join(f"zzm{modulo}d{n}p{k}" for k in range(n * modulo)) + " " + relleno)
+            documento.save(carpeta / f"Modulo {modulo}.{n}.docx")
+    return ruta
+
+
+@pytest.fixture
+def nuevo_auditor(monkeypatch):
+    """Fábrica de auditores con CorrectorFalso y sin lexicón inglés (no escribe en la caché del usuario)"""
+    import audit_okr
+
+    monkeypatch.setattr(audit_okr, "abrir_lexico_ingles", frozenset)
+    creados = []
+
+    def crear(ruta, corrector=None, **opciones):
+        auditor = audit_okr.AuditorOKROptimizado(ruta, corrector=corrector or CorrectorFalso(), **opciones)
+        creados.append(auditor)
+        return auditor
+
+    yield crear
+    for auditor in creados:
+        auditor.cerrar()
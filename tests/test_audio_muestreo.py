@@ -0,0 +1,101 @@
+"""Evaluación de las medidas de audio y estimación por muestreo"""
+import math
+
+import pytest
+
+from audit_okr import PISO_DBFS, UMBRALES_AUDIO, AuditorOKROptimizado
+
+
+def evaluar(**medidas):
+    base = {"duracion_total": 120.0, "max_volumen": -6.0, "segmentos": [-6.0] * 12,
+            "cantidad_silencios": 0, "duracion_silencios": 0.0}
+    base.update(medidas)
+    return object.__new__(AuditorOKROptimizado).evaluar_problemas_audio(base)
+
+
+def test_chunk_en_silencio_digital_no_es_error_de_analisis():
+    # Un chunk de 10 s de ceros mide -inf dBFS: se evalúa con el piso en vez de fallar
+    resultado = evaluar(segmentos=[-6.0] * 11 + [-math.inf], cantidad_silencios=1, duracion_silencios=10.0)
+    assert resultado["metricas"]["volumen_minimo"] == PISO_DBFS
+    assert math.isfinite(resultado["metricas"]["volumen_desviacion"])
+    assert resultado["problemas"] == [f"VOLUMEN INCONSISTENTE (±{resultado['metricas']['volumen_desviacion']:.1f}dB)"]
+    assert not resultado["es_critico"]
+
+
+def test_video_en_silencio_digital():
+    resultado = evaluar(max_volumen=-math.inf, segmentos=[-math.inf] * 12,
+                        cantidad_silencios=1, duracion_silencios=120.0)
+    assert resultado["problemas"] == ["SIN AUDIO AUDIBLE"]
+    assert resultado["es_critico"]
+    assert resultado["metricas"]["volumen_promedio"] == PISO_DBFS
+
+
+def ventana(silencio=0.05, pico=-6.0, cortes=0):
+    return {"duracion_total": 10.0, "max_volumen": pico, "segmentos": [pico],
+            "cantidad_silencios": cortes, "duracion_silencios": 10.0 * silencio, "continua_silencio": False}
+
+
+class AnalizadorFalso:
+    """Devuelve la medida preparada de cada ventana, en orden"""
+
+    def __init__(self, ventanas):
+        self.ventanas = iter(ventanas)
+        self.primer_silencio_ms = None
+
+    def finalizar(self):
+        return next(self.ventanas)
+
+
+def medir_por_muestreo(monkeypatch, ventanas, duracion=1200.0):
+    """medir_audio_muestreo sin ffmpeg: cada ventana 'decodificada' es la medida indicada"""
+    auditor = object.__new__(AuditorOKROptimizado)
+    auditor.ventanas_muestreo = len(ventanas)
+    auditor.segundos_ventana = 10
+    analizador = AnalizadorFalso(ventanas)
+    completo = {"duracion_total": duracion, "max_volumen": -6.0, "segmentos": [-6.0],
+                "cantidad_silencios": 0, "duracion_silencios": 0.0, "completo": True}
+    monkeypatch.setattr(auditor, "_formato_pcm", lambda ruta: ({}, {}, "s16le", 2), raising=False)
+    monkeypatch.setattr(auditor, "_duracion_video", lambda ruta, info: duracion, raising=False)
+    monkeypatch.setattr(auditor, "_nuevo_analizador", lambda pista, ancho: analizador, raising=False)
+    monkeypatch.setattr(auditor, "_decodificar_pcm", lambda *args, **kwargs: None, raising=False)
+    monkeypatch.setattr(auditor, "medir_audio_streaming", lambda ruta: dict(completo), raising=False)
+    return auditor.medir_audio_muestreo("video.mp4")
+
+
+def test_lejos_de_los_umbrales_se_queda_con_la_estimacion(monkeypatch):
+    medidas = medir_por_muestreo(monkeypatch, [ventana(0.05 + 0.01 * (i % 3)) for i in range(12)])
+    assert "completo" not in medidas
+    assert not medidas["muestreo"]["escalado"]
+    assert medidas["duracion_silencios"] == pytest.approx(0.06 * 1200, rel=0.05)
+
+
+@pytest.mark.parametrize("fracciones, umbral", [([0.20, 0.30] * 6, 25), ([0.35, 0.45] * 6, 40)])
+def test_silencio_cerca_del_umbral_escala(monkeypatch, fracciones, umbral):
+    assert umbral in UMBRALES_AUDIO["porcentaje_silencio"]
+    medidas = medir_por_muestreo(monkeypatch, [ventana(f) for f in fracciones])
+    assert medidas["completo"]
+    assert medidas["muestreo"]["escalado"]
+    assert "porcentaje_silencio" in medidas["muestreo"]["motivo"]
+    inferior, superior = medidas["muestreo"]["intervalos"]["porcentaje_silencio"]
+    assert inferior <= umbral <= superior
+
+
+@pytest.mark.parametrize("pico, escala", [(-41.0, True), (-45.0, False), (-61.0, True), (-65.0, False)])
+def test_pico_cerca_de_menos_40_o_menos_60_dbfs(monkeypatch, pico, escala):
+    # El pico muestreado es una cota inferior: el real puede estar hasta MARGEN_MUESTREO_DB más arriba
+    medidas = medir_por_muestreo(monkeypatch, [ventana(pico=pico) for _ in range(12)])
+    assert medidas["muestreo"]["escalado"] == escala
+    assert ("completo" in medidas) == escala
+    if escala:
+        assert "volumen_max" in medidas["muestreo"]["motivo"]
+
+
+def test_intervalo_de_silencio_se_achica_con_la_cobertura():
+    ventanas = [ventana(f) for f in [0.1, 0.2] * 6]
+    _, poca = AuditorOKROptimizado.estimar_medidas_audio(ventanas, 12000.0)
+    _, mucha = AuditorOKROptimizado.estimar_medidas_audio(ventanas, 240.0)
+
+    def ancho(intervalos):
+        return intervalos["porcentaje_silencio"][1] - intervalos["porcentaje_silencio"][0]
+
+    assert ancho(mucha) < ancho(poca)
@@ -0,0 +1,55 @@
+"""Análisis por bloques (AnalizadorAudioIncremental) contra el análisis completo de PyDub"""
+import importlib.util
+import shutil
+import wave
+
+import pytest
+
+pytest.importorskip("pydub")
+
+from audit_okr import AnalizadorAudioIncremental, AnalizadorAudioNumpy, AuditorOKROptimizado, audioop
+
+CLASES = [AnalizadorAudioIncremental]
+if importlib.util.find_spec("numpy") is not None:
+    CLASES.append(AnalizadorAudioNumpy)
+
+
+def auditor(motor="pydub"):
+    # Solo lo que usan medir_audio_completo y medir_audio_streaming
+    instancia = object.__new__(AuditorOKROptimizado)
+    instancia.motor_audio = motor
+    instancia.veredicto_rapido = False
+    instancia.bloque_pcm_bytes = 4099
+    return instancia
+
+
+def alimentar_por_bloques(clase, ruta, tamaño_bloque):
+    with wave.open(str(ruta), "rb") as archivo:
+        ancho = archivo.getsampwidth()
+        analizador = clase(archivo.getframerate(), archivo.getnchannels(), ancho)
+        datos = archivo.readframes(archivo.getnframes())
+    if ancho == 1:
+        # WAV de 8 bits es sin signo, igual que lo convierte AudioSegment
+        datos = audioop.bias(datos, 1, -128)
+    for inicio in range(0, len(datos), tamaño_bloque):
+        analizador.alimentar(datos[inicio:inicio + tamaño_bloque])
+    return analizador.finalizar()
+
+
+@pytest.mark.parametrize("ancho", [1, 2, 4])
+@pytest.mark.parametrize("canales", [1, 2])
+def test_bloques_igual_que_completo(escribir_wav, ancho, canales):
+    ruta = escribir_wav(ancho, canales)
+    esperado = auditor().medir_audio_completo(ruta)
+    # Tamaños que no son múltiplo del frame: los bloques cortan muestras a la mitad
+    for tamaño_bloque in (333, 4099, 1 << 20):
+        for clase in CLASES:
+            assert alimentar_por_bloques(clase, ruta, tamaño_bloque) == esperado, (clase.__name__, tamaño_bloque)
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg no disponible")
+@pytest.mark.parametrize("ancho", [1, 2, 4])
+def test_medir_audio_streaming_igual_que_completo(escribir_wav, ancho):
+    # De punta a punta: el pipe de ffmpeg entrega el PCM en bloques de bloque_pcm_bytes
+    ruta = escribir_wav(ancho, 2)
+    assert auditor().medir_audio_streaming(ruta) == auditor().medir_audio_completo(ruta)
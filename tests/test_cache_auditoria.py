@@ -0,0 +1,108 @@
+"""CacheAuditoria: aciertos, fallos e invalidación por tamaño, mtime, contenido y configuración"""
+import os
+
+import pytest
+
+from audit_okr import CacheAuditoria
+
+
+@pytest.fixture
+def archivo(tmp_path):
+    ruta = tmp_path / "documento.docx"
+    ruta.write_bytes(b"contenido original")
+    return ruta
+
+
+@pytest.fixture
+def ruta_cache(tmp_path):
+    return tmp_path / "cache.json"
+
+
+RESULTADO = {"errores": [{"palabra_incorrecta": "herrmientas"}], "revisado": True}
+
+
+def test_fallo_y_luego_acierto(archivo, ruta_cache):
+    cache = CacheAuditoria(ruta_cache, "firma")
+    assert cache.obtener("documento", archivo) is None
+    cache.guardar("documento", archivo, RESULTADO)
+    assert cache.obtener("documento", archivo) == RESULTADO
+    assert (cache.aciertos, cache.fallos) == (1, 1)
+    # El tipo es parte de la clave
+    assert cache.obtener("video", archivo) is None
+
+
+def test_resultado_devuelto_es_una_copia(archivo, ruta_cache):
+    cache = CacheAuditoria(ruta_cache, "firma")
+    cache.guardar("documento", archivo, RESULTADO)
+    cache.obtener("documento", archivo)["errores"].clear()
+    assert cache.obtener("documento", archivo) == RESULTADO
+
+
+def test_persistida_entre_ejecuciones(archivo, ruta_cache):
+    cache = CacheAuditoria(ruta_cache, "firma")
+    cache.guardar("documento", archivo, RESULTADO)
+    cache.persistir()
+    assert CacheAuditoria(ruta_cache, "firma").obtener("documento", archivo) == RESULTADO
+
+
+def test_cambio_de_tamaño_invalida(archivo, ruta_cache):
+    cache = CacheAuditoria(ruta_cache, "firma")
+    cache.guardar("documento", archivo, RESULTADO)
+    archivo.write_bytes(b"contenido original con un parrafo nuevo")
+    assert cache.obtener("documento", archivo) is None
+
+
+def test_cambio_de_contenido_con_mismo_tamaño_invalida(archivo, ruta_cache):
+    cache = CacheAuditoria(ruta_cache, "firma")
+    cache.guardar("documento", archivo, RESULTADO)
+    mtime = archivo.stat().st_mtime_ns
+    archivo.write_bytes(b"contenido ORIGINAL")
+    os.utime(archivo, ns=(mtime + 1_000_000_000, mtime + 1_000_000_000))
+    assert cache.obtener("documento", archivo) is None
+
+
+def test_solo_cambio_de_mtime_rehashea_y_reutiliza(archivo, ruta_cache):
+    # Direccionada por contenido: un archivo tocado pero igual vuelve a hashearse y sigue siendo acierto
+    cache = CacheAuditoria(ruta_cache, "firma")
+    cache.guardar("documento", archivo, RESULTADO)
+    mtime = archivo.stat().st_mtime_ns + 5_000_000_000
+    os.utime(archivo, ns=(mtime, mtime))
+    assert cache.obtener("documento", archivo) == RESULTADO
+    assert cache.huellas[str(archivo.resolve())]["mtime_ns"] == mtime
+
+
+def test_huella_no_relee_si_tamaño_y_mtime_no_cambiaron(archivo, ruta_cache):
+    cache = CacheAuditoria(ruta_cache, "firma")
+    huella = cache.huella(archivo)
+    # Cambio de contenido que conserva tamaño y mtime: se confía en la huella guardada
+    st = archivo.stat()
+    archivo.write_bytes(b"contenido ORIGINAL")
+    os.utime(archivo, ns=(st.st_atime_ns, st.st_mtime_ns))
+    assert cache.huella(archivo) == huella
+
+
+def test_otra_configuracion_descarta_resultados(archivo, ruta_cache):
+    cache = CacheAuditoria(ruta_cache, "firma")
+    cache.guardar("documento", archivo, RESULTADO)
+    cache.persistir()
+    otra = CacheAuditoria(ruta_cache, "otra firma")
+    assert otra.obtener("documento", archivo) is None
+    # Las huellas sí se conservan: no hace falta volver a leer los archivos
+    assert str(archivo.resolve()) in otra.huellas
+
+
+def test_persistir_descarta_archivos_borrados(archivo, ruta_cache):
+    cache = CacheAuditoria(ruta_cache, "firma")
+    cache.guardar("documento", archivo, RESULTADO)
+    archivo.unlink()
+    cache.persistir()
+    recargada = CacheAuditoria(ruta_cache, "firma")
+    assert recargada.huellas == {}
+    assert recargada.resultados == {}
+
+
+def test_cache_ilegible_se_reconstruye(ruta_cache, archivo, capsys):
+    ruta_cache.write_text("{no es json", encoding="utf-8")
+    cache = CacheAuditoria(ruta_cache, "firma")
+    assert cache.obtener("documento", archivo) is None
+    assert "Caché ilegible" in capsys.readouterr().out
@@ -0,0 +1,97 @@
+"""Cola distribuida en localhost: un trabajador muere a mitad de una tarea y el resultado es el de una auditoría local"""
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from audit_okr import CoordinadorAuditoria
+
+pytestmark = pytest.mark.skipif(not hasattr(signal, "SIGKILL"), reason="requiere SIGKILL (POSIX)")
+
+CLAVE = "secreto-de-prueba"
+
+# El trabajador usa el mismo CorrectorFalso que las pruebas; con "morir" se mata (SIGKILL) al recibir su primera tarea
+TRABAJADOR = """
+import os, signal, sys
+import audit_okr
+from conftest import CorrectorFalso
+
+audit_okr.abrir_lexico_ingles = frozenset
+
+
+class Trabajador(audit_okr.TrabajadorAuditoria):
+    def resolver(self, *tarea):
+        if sys.argv[2] == "morir":
+            os.kill(os.getpid(), signal.SIGKILL)
+        return super().resolver(*tarea)
+
+
+Trabajador(("127.0.0.1", int(sys.argv[1])), sys.argv[3], corrector=CorrectorFalso(), reconectar=False).ejecutar()
+"""
+
+
+def lanzar_trabajador(tmp_path, puerto, modo):
+    script = tmp_path / "trabajador.py"
+    script.write_text(TRABAJADOR, encoding="utf-8")
+    pruebas = Path(__file__).resolve().parent
+    entorno = dict(os.environ)
+    entorno["PYTHONPATH"] = os.pathsep.join(filter(None, [str(pruebas.parent), str(pruebas), entorno.get("PYTHONPATH")]))
+    return subprocess.Popen([sys.executable, str(script), str(puerto), modo, CLAVE], env=entorno,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def esperar(condicion, limite=30):
+    inicio = time.monotonic()
+    while not condicion():
+        if time.monotonic() - inicio > limite:
+            raise TimeoutError("la condición no se cumplió a tiempo")
+        time.sleep(0.05)
+
+
+def sin_tiempos(reporte):
+    return {clave: valor for clave, valor in reporte.items() if clave not in ("timestamp", "rendimiento")}
+
+
+def test_trabajador_caido_se_reintenta_y_coincide_con_local(nuevo_auditor, curso, tmp_path, capsys):
+    local, _ = nuevo_auditor(curso).ejecutar_auditoria_optimizada()
+    assert local is not None
+
+    coordinador = CoordinadorAuditoria(("127.0.0.1", 0), CLAVE)
+    auditor = nuevo_auditor(curso, coordinador=coordinador)
+    procesos = [lanzar_trabajador(tmp_path, coordinador.direccion[1], "morir")]
+    try:
+        # Solo el trabajador que muere está conectado cuando se reparten las tareas: recibe la primera
+        esperar(lambda: coordinador.trabajadores == 1)
+        resultado = {}
+        hilo = threading.Thread(target=lambda: resultado.update(reporte=auditor.ejecutar_auditoria_optimizada()[0]))
+        hilo.start()
+        assert procesos[0].wait(timeout=30) == -signal.SIGKILL
+        # Su tarea vuelve a la cola y la resuelve un trabajador sano
+        procesos.append(lanzar_trabajador(tmp_path, coordinador.direccion[1], "normal"))
+        hilo.join(timeout=60)
+        assert not hilo.is_alive()
+    finally:
+        coordinador.cerrar()
+        for proceso in procesos:
+            try:
+                proceso.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                proceso.kill()
+
+    salida = capsys.readouterr().out
+    assert "Trabajador perdido" in salida
+    assert "vuelve a la cola (intento 2 de 3)" in salida
+    assert procesos[1].returncode == 0
+    distribuido = resultado["reporte"]
+    assert distribuido is not None
+    assert len(distribuido["errores_ortograficos"]) == 45
+    assert sin_tiempos(distribuido) == sin_tiempos(local)
+    # Todos los documentos los revisó el trabajador sano, ninguno el auditor local
+    ortografia = next(e for e in distribuido["rendimiento"]["etapas"] if e["etapa"] == "ortografia")
+    assert len(ortografia["archivos"]) == 10
+    assert {medida.get("trabajador", "").rsplit(":", 1)[-1] for medida in ortografia["archivos"]} == {str(procesos[1].pid)}
@@ -0,0 +1,44 @@
+"""ConsolaEtapas: las líneas de hilos distintos salen enteras y con el nombre de su etapa"""
+import io
+import threading
+
+from audit_okr import ConsolaEtapas
+
+
+def test_lineas_enteras_por_hilo():
+    destino = io.StringIO()
+    consola = ConsolaEtapas(destino)
+    listos = threading.Barrier(2)
+
+    def escribir(nombre):
+        consola.asignar_etapa(nombre)
+        for n in range(200):
+            consola.write(f"{nombre} {n}: inicio... ")
+            if n == 0:
+                # Los dos hilos quedan con una línea a medias al mismo tiempo
+                listos.wait()
+            consola.write("fin\n")
+
+    hilos = [threading.Thread(target=escribir, args=(nombre,)) for nombre in ("audio", "ortografia")]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    consola.write("sin etapa\n")
+    assert consola.cerrar() is destino
+
+    lineas = destino.getvalue().splitlines()
+    assert len(lineas) == 401
+    for nombre in ("audio", "ortografia"):
+        propias = [linea for linea in lineas if linea.startswith(f"[{nombre}] ")]
+        assert propias == [f"[{nombre}] {nombre} {n}: inicio... fin" for n in range(200)]
+    assert lineas[-1] == "sin etapa"
+
+
+def test_cerrar_escribe_la_linea_a_medias():
+    destino = io.StringIO()
+    consola = ConsolaEtapas(destino)
+    consola.asignar_etapa("audio")
+    consola.write("📊 Analizando audio completo... ")
+    consola.cerrar()
+    assert destino.getvalue() == "[audio] 📊 Analizando audio completo... \n"
@@ -0,0 +1,83 @@
+"""consultar_corrector con la caché de párrafos: las coincidencias guardadas se reubican tras editar"""
+import re
+from types import SimpleNamespace
+
+import pytest
+
+from audit_okr import AuditorOKROptimizado, CacheParrafos, IndiceParrafos
+
+
+class CorrectorFalso:
+    """Marca como error cada palabra que empieza con 'zz'; guarda los textos que recibe"""
+
+    def __init__(self):
+        self.textos = []
+
+    def check(self, texto):
+        self.textos.append(texto)
+        return [SimpleNamespace(offset=m.start(), errorLength=len(m.group(0)), replacements=["corregida"],
+                                context=m.group(0), ruleIssueType="misspelling")
+                for m in re.finditer(r"\bzz\w*", texto)]
+
+
+def indice(*parrafos):
+    resultado = IndiceParrafos()
+    for n, texto in enumerate(parrafos, 1):
+        resultado.agregar(texto, f"Párrafo {n}")
+    return resultado
+
+
+def auditor(corrector, ruta_cache):
+    # Solo lo que usa consultar_corrector: el corrector y la caché de párrafos
+    instancia = object.__new__(AuditorOKROptimizado)
+    instancia.spell_checker = corrector
+    instancia.cache_parrafos = CacheParrafos(ruta_cache, "corrector-falso")
+    return instancia
+
+
+def posiciones(coincidencias):
+    return [(c.offset, c.errorLength, list(c.replacements), c.ruleIssueType) for c in coincidencias]
+
+
+@pytest.fixture
+def ruta_cache(tmp_path):
+    return tmp_path / "parrafos.json"
+
+
+def test_documento_nuevo_igual_que_sin_cache(ruta_cache):
+    corrector = CorrectorFalso()
+    documento = indice("Primer zzparrafo", "Sin errores aquí", "Otro zzerror y zzotro")
+    obtenidas = auditor(corrector, ruta_cache).consultar_corrector(documento)
+    assert corrector.textos == [documento.texto]
+    assert posiciones(obtenidas) == posiciones(CorrectorFalso().check(documento.texto))
+
+
+def test_offsets_reubicados_tras_editar(ruta_cache):
+    corrector = CorrectorFalso()
+    revisor = auditor(corrector, ruta_cache)
+    revisor.consultar_corrector(indice("Primer zzparrafo", "Sin errores aquí", "Otro zzerror y zzotro"))
+    corrector.textos.clear()
+
+    # Párrafo nuevo al comienzo y el segundo editado: los demás se corren pero vienen de la caché
+    editado = indice("Introducción zznueva", "Primer zzparrafo", "Ahora con zzfalta", "Otro zzerror y zzotro")
+    medida = {}
+    obtenidas = revisor.consultar_corrector(editado, medida)
+
+    assert corrector.textos == ["Introducción zznueva\nAhora con zzfalta\n"]
+    assert medida == {"parrafos_reutilizados": 2, "parrafos_revisados": 2}
+    assert posiciones(obtenidas) == posiciones(CorrectorFalso().check(editado.texto))
+    for coincidencia in obtenidas:
+        assert editado.texto[coincidencia.offset:coincidencia.offset + coincidencia.errorLength].startswith("zz")
+
+
+def test_cache_persistida_entre_ejecuciones(ruta_cache):
+    documento = indice("Un zzerror", "Otro párrafo")
+    primero = auditor(CorrectorFalso(), ruta_cache)
+    esperadas = posiciones(primero.consultar_corrector(documento))
+    primero.cache_parrafos.persistir()
+
+    corrector = CorrectorFalso()
+    obtenidas = auditor(corrector, ruta_cache).consultar_corrector(indice("Nuevo inicio", "Un zzerror", "Otro párrafo"))
+    assert corrector.textos == ["Nuevo inicio\n"]
+    desplazamiento = len("Nuevo inicio\n")
+    assert posiciones(obtenidas) == [(offset + desplazamiento, *resto) for offset, *resto in esperadas]
@@ -0,0 +1,41 @@
+"""EspecificacionCurso: una ficha mal formada es un ValueError, que el portafolio trata como curso fallido"""
+import copy
+import json
+
+import pytest
+
+from audit_okr import CURSO_OKR, EspecificacionCurso
+
+
+def test_ficha_original_valida():
+    especificacion = EspecificacionCurso.desde_dict(CURSO_OKR)
+    assert especificacion.documentos_esperados("MODULO 1") == 5
+    assert especificacion.videos_esperados("MODULO 1") == 5
+
+
+def ficha(**cambios):
+    datos = copy.deepcopy(CURSO_OKR)
+    datos.update(cambios)
+    return datos
+
+
+@pytest.mark.parametrize("datos", [
+    ["MODULO 1"],
+    ficha(modulos={}),
+    ficha(modulos={"Unidad 1": CURSO_OKR["modulos"]["MODULO 1"]}),
+    ficha(modulos={"MODULO 1": ["1.1 Origen"]}),
+    ficha(modulos={"MODULO 1": "Introducción"}),
+    ficha(modulos={"MODULO 1": {"subtemas": ["1.1 Origen"]}}),
+    ficha(modulos={"MODULO 1": {"nombre": "Introducción"}}),
+    ficha(palabras_validas="okr"),
+    ficha(palabras_validas=["okr", 3]),
+])
+def test_ficha_mal_formada_es_value_error(datos):
+    with pytest.raises(ValueError):
+        EspecificacionCurso.desde_dict(datos)
+
+
+def test_archivo_del_curso_mal_formado(tmp_path):
+    (tmp_path / "especificacion_curso.json").write_text(json.dumps({"modulos": {"MODULO 1": None}}), encoding="utf-8")
+    with pytest.raises(ValueError):
+        EspecificacionCurso.para_curso(tmp_path)
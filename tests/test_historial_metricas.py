@@ -0,0 +1,91 @@
+"""Historial SQLite de métricas de audio: búsquedas por huella del contenido y firma de audio"""
+import os
+
+import pytest
+
+from audit_okr import HistorialMetricas
+
+
+def resultado(volumen):
+    return {"es_critico": False, "problemas": [], "metricas": {"duracion": 60.0, "volumen_promedio": volumen}}
+
+
+@pytest.fixture
+def historial(tmp_path):
+    historial = HistorialMetricas(tmp_path / "historial.sqlite3")
+    yield historial
+    historial.cerrar()
+
+
+def escribir(ruta, contenido):
+    ruta.write_bytes(contenido)
+    return ruta
+
+
+def test_huella_por_contenido_y_recalculo_por_stat(historial, tmp_path):
+    a = escribir(tmp_path / "a.mp4", b"video uno")
+    copia = escribir(tmp_path / "copia.mp4", b"video uno")
+    assert historial.huella(a) == historial.huella(copia)
+
+    huella = historial.huella(a)
+    # Mismo tamaño y mtime: se sirve la huella guardada sin leer el archivo
+    st = os.stat(a)
+    a.write_bytes(b"video dos")
+    os.utime(a, ns=(st.st_atime_ns, st.st_mtime_ns))
+    assert historial.huella(a) == huella
+    # Cambió el mtime: se vuelve a leer el contenido
+    os.utime(a, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    assert historial.huella(a) != huella
+
+
+def test_obtener_por_huella_y_firma(historial, tmp_path):
+    huella = historial.huella(escribir(tmp_path / "a.mp4", b"video uno"))
+    otra = historial.huella(escribir(tmp_path / "b.mp4", b"video dos"))
+
+    historial.iniciar_ejecucion(tmp_path, "firma-1")
+    assert historial.obtener(huella) is None
+    historial.guardar(huella, "MODULO 1", "a.mp4", resultado(-20.0))
+
+    historial.iniciar_ejecucion(tmp_path, "firma-1")
+    assert historial.obtener(huella) == resultado(-20.0)
+    assert historial.obtener(otra) is None
+    assert historial.servidos == 1
+
+    # Otra configuración de audio no reutiliza lo medido con la anterior
+    historial.iniciar_ejecucion(tmp_path, "firma-2")
+    assert historial.obtener(huella) is None
+    historial.guardar(huella, "MODULO 1", "a.mp4", resultado(-25.0))
+    assert historial.obtener(huella) == resultado(-25.0)
+
+    # Con la primera firma se sirve el resultado más reciente medido con ella
+    historial.iniciar_ejecucion(tmp_path, "firma-1")
+    assert historial.obtener(huella) == resultado(-20.0)
+
+
+def test_persistencia_y_evolucion(tmp_path):
+    ruta = tmp_path / "historial.sqlite3"
+    historial = HistorialMetricas(ruta)
+    huella = historial.huella(escribir(tmp_path / "a.mp4", b"video uno"))
+    for volumen in (-20.0, -22.0):
+        historial.iniciar_ejecucion(tmp_path, "firma")
+        historial.guardar(huella, "MODULO 1", "a.mp4", resultado(volumen))
+        historial.confirmar()
+    historial.cerrar()
+
+    historial = HistorialMetricas(ruta)
+    try:
+        historial.iniciar_ejecucion(tmp_path, "firma")
+        assert historial.obtener(huella) == resultado(-22.0)
+        evolucion = historial.evolucion("MODULO 1", "a.mp4")
+        assert [e["volumen_promedio"] for e in evolucion] == [-20.0, -22.0]
+        assert all(e["huella"] == huella[:12] for e in evolucion)
+        assert historial.evolucion("MODULO 2", "a.mp4") == []
+    finally:
+        historial.cerrar()
+
+
+def test_firma_de_audio_cambia_con_la_configuracion(nuevo_auditor, tmp_path):
+    pydub = nuevo_auditor(tmp_path, motor_audio="pydub").firma_audio()
+    assert nuevo_auditor(tmp_path, motor_audio="pydub").firma_audio() == pydub
+    assert nuevo_auditor(tmp_path, motor_audio="numpy").firma_audio() != pydub
+    assert nuevo_auditor(tmp_path, modo_audio="muestreo").firma_audio() != pydub
@@ -0,0 +1,80 @@
+"""LectorDocx / IndiceParrafos contra el texto que entrega python-docx para el mismo documento"""
+import pytest
+
+docx = pytest.importorskip("docx")
+
+from audit_okr import IndiceParrafos, LectorDocx
+
+
+@pytest.fixture
+def documento(tmp_path):
+    d = docx.Document()
+    d.add_paragraph("Gestión de OKR: objetivos y resultados clave")
+    d.add_paragraph("")
+    parrafo = d.add_paragraph("Antes del tab")
+    run = parrafo.add_run()
+    run.add_tab()
+    run.add_text("después")
+    run.add_break()
+    run.add_text("otra línea con ñ y acentos: evaluación")
+    d.add_paragraph("Último párrafo del cuerpo")
+
+    tabla = d.add_table(rows=2, cols=3)
+    for fila in range(2):
+        for columna in range(3):
+            tabla.cell(fila, columna).text = f"celda {fila + 1}.{columna + 1}"
+    combinada = tabla.cell(0, 0).merge(tabla.cell(0, 1))
+    combinada.text = "celda combinada"
+
+    seccion = d.sections[0]
+    seccion.header.paragraphs[0].text = "Encabezado del curso"
+    seccion.footer.paragraphs[0].text = "Pie de página 3IT"
+
+    ruta = tmp_path / "documento.docx"
+    d.save(ruta)
+    return ruta
+
+
+def test_cuerpo_igual_a_python_docx(documento):
+    esperado = [p.text for p in docx.Document(documento).paragraphs]
+    obtenido = list(LectorDocx(documento).parrafos())
+    assert [texto for texto, _ in obtenido] == esperado
+    assert [origen for _, origen in obtenido] == [f"Párrafo {n}" for n in range(1, len(esperado) + 1)]
+
+
+def test_completo_agrega_tablas_encabezado_y_pie(documento):
+    d = docx.Document(documento)
+    celdas = []
+    for tabla in d.tables:
+        for fila in tabla.rows:
+            vistas = set()
+            for celda in fila.cells:
+                # python-docx repite la celda combinada en cada columna que abarca
+                if celda._tc in vistas:
+                    continue
+                vistas.add(celda._tc)
+                celdas.extend(p.text for p in celda.paragraphs)
+    seccion = d.sections[0]
+    esperado = ([p.text for p in d.paragraphs] + celdas
+                + [p.text for p in seccion.header.paragraphs] + [p.text for p in seccion.footer.paragraphs])
+
+    obtenido = list(LectorDocx(documento).parrafos(completo=True))
+    assert [texto for texto, _ in obtenido] == esperado
+    origenes = dict((texto, origen) for texto, origen in obtenido)
+    assert origenes["celda combinada"] == "Tabla 1, fila 1, columna 1"
+    assert origenes["celda 1.3"] == "Tabla 1, fila 1, columna 3"
+    assert origenes["Encabezado del curso"] == "Encabezado (sección 1)"
+    assert origenes["Pie de página 3IT"] == "Pie de página (sección 1)"
+
+
+def test_indice_ubica_offsets_en_su_parrafo(documento):
+    indice = IndiceParrafos.desde_docx(documento)
+    textos = [p.text for p in docx.Document(documento).paragraphs]
+    assert indice.texto == "".join(texto + "\n" for texto in textos)
+
+    offset = indice.texto.index("evaluación")
+    parrafo, origen, posicion = indice.ubicar(offset)
+    assert parrafo == 3
+    assert origen == "Párrafo 3"
+    assert textos[2][posicion - 1:].startswith("evaluación")
+    assert indice.ubicar(0) == (1, "Párrafo 1", 1)
@@ -0,0 +1,31 @@
+"""Motor NumPy contra PyDub (medir_audio_completo) sobre PCM sintético de 16 y 32 bits"""
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("pydub")
+
+from audit_okr import AuditorOKROptimizado
+
+
+def medir(ruta, motor, bloque_pcm_bytes=1 << 16):
+    # Solo lo que usa medir_audio_completo
+    auditor = object.__new__(AuditorOKROptimizado)
+    auditor.motor_audio = motor
+    auditor.bloque_pcm_bytes = bloque_pcm_bytes
+    return auditor.medir_audio_completo(ruta)
+
+
+@pytest.mark.parametrize("ancho", [2, 4])
+@pytest.mark.parametrize("canales", [1, 2])
+def test_numpy_igual_que_pydub(escribir_wav, ancho, canales):
+    ruta = escribir_wav(ancho, canales)
+    esperado = medir(ruta, "pydub")
+    assert esperado["cantidad_silencios"] > 0
+    assert medir(ruta, "numpy") == esperado
+
+
+def test_numpy_independiente_del_tamaño_de_bloque(escribir_wav):
+    ruta = escribir_wav(4, 2)
+    esperado = medir(ruta, "numpy")
+    for bloque in (4096, 100_003, 1 << 22):
+        assert medir(ruta, "numpy", bloque) == esperado
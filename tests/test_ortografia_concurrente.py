@@ -0,0 +1,28 @@
+"""revisar_ortografia_optimizada: con concurrencia el reporte queda en el mismo orden que sin ella"""
+import pytest
+
+from conftest import CorrectorFalso
+
+
+def revisar(nuevo_auditor, curso, concurrencia):
+    auditor = nuevo_auditor(curso, corrector=CorrectorFalso(demora=0.05), concurrencia_ortografia=concurrencia)
+    auditor.revisar_ortografia_optimizada()
+    return auditor.reporte
+
+
+@pytest.mark.parametrize("concurrencia", [2, 4, 10])
+def test_mismo_orden_con_concurrencia(nuevo_auditor, curso, concurrencia):
+    secuencial = revisar(nuevo_auditor, curso, 1)
+    paralelo = revisar(nuevo_auditor, curso, concurrencia)
+
+    assert secuencial["errores_ortograficos"]
+    assert paralelo["errores_ortograficos"] == secuencial["errores_ortograficos"]
+    assert paralelo["problemas_criticos"] == secuencial["problemas_criticos"]
+    assert paralelo["problemas_menores"] == secuencial["problemas_menores"]
+    assert paralelo["resumen_ejecutivo"]["archivos_revisados"] == 10
+
+
+def test_orden_de_documentos_y_parrafos(nuevo_auditor, curso):
+    errores = revisar(nuevo_auditor, curso, 4)["errores_ortograficos"]
+    claves = [(e["modulo"], e["archivo"], e["parrafo"], e["posicion_en_parrafo"]) for e in errores]
+    assert claves == sorted(claves)
@@ -0,0 +1,61 @@
+"""reporte_en_disco: las listas del reporte en SQLite cuentan y recorren lo mismo que en memoria"""
+from audit_okr import AlmacenReporte, ListaEnDisco
+from conftest import CorrectorFalso
+
+LISTAS = ("errores_ortograficos", "videos_problematicos", "problemas_audio", "archivos_faltantes",
+          "problemas_criticos", "problemas_menores", "recomendaciones")
+
+
+def auditar(nuevo_auditor, curso, en_disco):
+    auditor = nuevo_auditor(curso, corrector=CorrectorFalso(), reporte_en_disco=en_disco)
+    reporte, ruta_reporte = auditor.ejecutar_auditoria_optimizada()
+    assert reporte is not None
+    return reporte
+
+
+def por_modulo(filas):
+    cuentas = {}
+    for fila in filas:
+        cuentas[fila.get("modulo")] = cuentas.get(fila.get("modulo"), 0) + 1
+    return cuentas
+
+
+def test_auditoria_en_disco_igual_a_en_memoria(nuevo_auditor, curso):
+    memoria = auditar(nuevo_auditor, curso, False)
+    disco = auditar(nuevo_auditor, curso, True)
+
+    assert disco["resumen_ejecutivo"] == memoria["resumen_ejecutivo"]
+    assert len(memoria["errores_ortograficos"]) == 45
+    for clave in LISTAS:
+        assert isinstance(disco[clave], ListaEnDisco)
+        assert len(disco[clave]) == len(memoria[clave]), clave
+        assert bool(disco[clave]) == bool(memoria[clave]), clave
+        assert list(disco[clave]) == memoria[clave], clave
+        assert disco[clave].por_modulo == por_modulo(memoria[clave]), clave
+        for modulo in disco[clave].por_modulo:
+            assert list(disco[clave].filas(modulo)) == [f for f in memoria[clave] if f.get("modulo") == modulo]
+
+
+def test_lista_en_disco_lotes_extend_y_descartar():
+    almacen = AlmacenReporte()
+    try:
+        filas = [{"modulo": f"MODULO {i % 3}", "n": i} for i in range(AlmacenReporte.LOTE * 2 + 7)]
+        lista = almacen.nueva_lista()
+        for fila in filas:
+            lista.append(fila)
+        assert len(lista) == len(filas)
+        assert list(lista) == filas
+        assert lista.por_modulo == por_modulo(filas)
+
+        # extend con otra lista en disco mueve sus filas y la deja vacía
+        destino = almacen.nueva_lista()
+        destino.append({"modulo": "MODULO 9", "n": -1})
+        destino.extend(lista)
+        assert list(destino) == [{"modulo": "MODULO 9", "n": -1}] + filas
+        assert len(destino) == len(filas) + 1 and not lista and list(lista) == []
+        assert list(destino.filas("MODULO 1")) == [f for f in filas if f["modulo"] == "MODULO 1"]
+
+        destino.descartar()
+        assert len(destino) == 0 and list(destino) == [] and destino.por_modulo == {}
+    finally:
+        almacen.cerrar()
@@ -0,0 +1,81 @@
+"""Reporte paginado: reparto de filas en páginas por módulo y enlaces entre páginas e índice"""
+import re
+from html.parser import HTMLParser
+
+import pytest
+
+
+class Enlaces(HTMLParser):
+    def __init__(self):
+        super().__init__()
+        self.hrefs = []
+
+    def handle_starttag(self, etiqueta, atributos):
+        if etiqueta == "a" and dict(atributos).get("href", "").endswith(".html"):
+            self.hrefs.append(dict(atributos)["href"])
+
+
+def enlaces(ruta):
+    lector = Enlaces()
+    lector.feed(ruta.read_text(encoding="utf-8"))
+    return lector.hrefs
+
+
+@pytest.fixture
+def reporte(nuevo_auditor, curso):
+    auditor = nuevo_auditor(curso, filas_por_pagina=4)
+    auditor.verificar_estructura_modulos()
+    auditor.revisar_ortografia_optimizada()
+    return auditor, auditor.generar_reporte_3it_optimizado()
+
+
+def test_filas_repartidas_en_paginas(reporte):
+    auditor, indice = reporte
+    errores = auditor.reporte["errores_ortograficos"]
+    for modulo, cantidad, paginas in (("MODULO 1", 15, 4), ("MODULO 2", 30, 8)):
+        propias = [e["palabra_incorrecta"] for e in errores if e["modulo"] == modulo]
+        assert len(propias) == cantidad
+        base = modulo.lower().replace(" ", "-")
+        vistas = []
+        for n in range(1, paginas + 1):
+            html = (indice.parent / f"{base}-ortografia-{n}.html").read_text(encoding="utf-8")
+            # Cada fila resalta su palabra con error (únicas en el curso de prueba)
+            en_pagina = re.findall(r'<span style="background:yellow; font-weight:bold;">(zz\w+)</span>', html)
+            assert len(en_pagina) == (4 if n < paginas else cantidad - 4 * (paginas - 1))
+            assert f"página {n} de {paginas}" in html
+            vistas.extend(en_pagina)
+        assert vistas == propias
+        assert not (indice.parent / f"{base}-ortografia-{paginas + 1}.html").exists()
+
+
+def test_enlaces_entre_paginas(reporte):
+    _, indice = reporte
+    carpeta = indice.parent
+    paginas = sorted(carpeta.glob("modulo-*-ortografia-*.html"))
+    assert len(paginas) == 12
+    # El índice enlaza la primera página de cada módulo; todo enlace apunta a un archivo escrito
+    assert {"modulo-1-ortografia-1.html", "modulo-2-ortografia-1.html"} <= set(enlaces(indice))
+    for pagina in [indice] + paginas:
+        for href in enlaces(pagina):
+            assert (carpeta / href).exists(), (pagina.name, href)
+
+    for base, total in (("modulo-1-ortografia", 4), ("modulo-2-ortografia", 8)):
+        for n in range(1, total + 1):
+            destinos = enlaces(carpeta / f"{base}-{n}.html")
+            assert "index.html" in destinos
+            assert (f"{base}-{n - 1}.html" in destinos) == (n > 1)
+            assert (f"{base}-{n + 1}.html" in destinos) == (n < total)
+            # Siempre se puede ir a la primera y a la última
+            assert {f"{base}-1.html", f"{base}-{total}.html"} - {f"{base}-{n}.html"} <= set(destinos)
+
+
+def test_modulos_con_acentos_no_comparten_paginas(nuevo_auditor, curso):
+    auditor = nuevo_auditor(curso, filas_por_pagina=4)
+    nombres = {auditor._nombre_pagina(modulo, "audio", 1) for modulo in ("MODULO AÑO", "MODULO ANO", "Módulo ano")}
+    assert len(nombres) == 3
+
+
+@pytest.mark.parametrize("filas", [0, -1])
+def test_filas_por_pagina_invalidas(nuevo_auditor, curso, filas):
+    with pytest.raises(ValueError):
+        nuevo_auditor(curso, filas_por_pagina=filas)
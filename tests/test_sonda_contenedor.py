@@ -0,0 +1,123 @@
+"""SondaContenedor: cabeceras MP4/MOV/AVI generadas con ffmpeg y cabeceras mínimas armadas a mano"""
+import shutil
+import struct
+import subprocess
+
+import pytest
+
+from audit_okr import SondaContenedor
+
+FFMPEG = shutil.which("ffmpeg")
+requiere_ffmpeg = pytest.mark.skipif(FFMPEG is None, reason="ffmpeg no disponible")
+
+VARIANTES = {
+    "rapido.mp4": ["-c:v", "mpeg4", "-c:a", "aac", "-movflags", "+faststart"],
+    "normal.mp4": ["-c:v", "mpeg4", "-c:a", "aac"],
+    "fragmentado.mp4": ["-c:v", "mpeg4", "-c:a", "aac", "-movflags", "frag_keyframe+empty_moov"],
+    "clip.mov": ["-c:v", "mpeg4", "-c:a", "aac"],
+    "clip.avi": ["-c:v", "mpeg4", "-c:a", "pcm_s16le"],
+    "sin_audio.mp4": ["-c:v", "mpeg4", "-an"],
+}
+
+
+@pytest.fixture(scope="module")
+def videos(tmp_path_factory):
+    carpeta = tmp_path_factory.mktemp("videos")
+    for nombre, opciones in VARIANTES.items():
+        entradas = ["-f", "lavfi", "-i", "testsrc=size=64x48:rate=10:duration=1"]
+        if "-an" not in opciones:
+            entradas += ["-f", "lavfi", "-i", "sine=duration=1"]
+        subprocess.run([FFMPEG, "-v", "error", *entradas, *opciones, "-shortest", str(carpeta / nombre), "-y"],
+                       check=True)
+    return carpeta
+
+
+def sondear(ruta):
+    return SondaContenedor(ruta).sondear()
+
+
+def tipos(info):
+    return [pista["tipo"] for pista in info["pistas"]]
+
+
+@requiere_ffmpeg
+@pytest.mark.parametrize("nombre, formato", [("rapido.mp4", "mp4"), ("normal.mp4", "mp4"),
+                                             ("clip.mov", "mov"), ("clip.avi", "avi")])
+def test_contenedor_completo(videos, nombre, formato):
+    info = sondear(videos / nombre)
+    assert info["formato"] == formato
+    assert info["problema"] is None
+    assert info["indice_intacto"]
+    assert info["duracion"] == pytest.approx(1.0, abs=0.1)
+    assert tipos(info) == ["video", "audio"]
+    assert info["bitrate_kbps"] > 0
+
+
+@requiere_ffmpeg
+def test_avi_informa_codec_de_audio(videos):
+    assert sondear(videos / "clip.avi")["pistas"][1]["codec"] == "pcm"
+
+
+@requiere_ffmpeg
+def test_mp4_fragmentado(videos):
+    info = sondear(videos / "fragmentado.mp4")
+    assert info["problema"] is None
+    assert info["indice_intacto"]
+    assert tipos(info) == ["video", "audio"]
+
+
+@requiere_ffmpeg
+def test_sin_audio(videos):
+    info = sondear(videos / "sin_audio.mp4")
+    assert info["problema"] is None
+    assert tipos(info) == ["video"]
+
+
+@requiere_ffmpeg
+@pytest.mark.parametrize("nombre", ["rapido.mp4", "normal.mp4", "clip.avi"])
+def test_truncado(videos, tmp_path, nombre):
+    datos = (videos / nombre).read_bytes()
+    ruta = tmp_path / nombre
+    ruta.write_bytes(datos[:len(datos) // 2])
+    info = sondear(ruta)
+    assert "truncado" in info["problema"]
+    assert not info["indice_intacto"]
+
+
+@requiere_ffmpeg
+def test_moov_mayor_que_el_limite_no_es_un_daño(videos, monkeypatch):
+    monkeypatch.setattr(SondaContenedor, "MAX_MOOV", 16)
+    assert sondear(videos / "rapido.mp4") is None
+
+
+def atomo(tipo, cuerpo=b""):
+    return struct.pack(">I4s", 8 + len(cuerpo), tipo) + cuerpo
+
+
+def test_mp4_sin_moov(tmp_path):
+    ruta = tmp_path / "sin_moov.mp4"
+    ruta.write_bytes(atomo(b"ftyp", b"isom\0\0\0\0isom") + atomo(b"mdat", b"\0" * 64))
+    assert "falta el átomo moov" in sondear(ruta)["problema"]
+
+
+def test_mp4_atomo_invalido(tmp_path):
+    ruta = tmp_path / "invalido.mp4"
+    ruta.write_bytes(atomo(b"ftyp", b"isom\0\0\0\0isom") + struct.pack(">I4s", 4, b"mdat") + b"\0" * 64)
+    assert "inválido" in sondear(ruta)["problema"]
+
+
+def test_avi_hdrl_demasiado_corto(tmp_path):
+    # LIST de 2 bytes: antes se leía el resto del archivo con read(-2)
+    cuerpo = b"AVI " + struct.pack("<4sI", b"LIST", 2) + b"hd" + b"\0" * 4096
+    ruta = tmp_path / "corrupto.avi"
+    ruta.write_bytes(b"RIFF" + struct.pack("<I", len(cuerpo)) + cuerpo)
+    info = sondear(ruta)
+    assert info["formato"] == "avi"
+    assert "inválida" in info["problema"]
+    assert not info["indice_intacto"]
+
+
+def test_formato_desconocido(tmp_path):
+    ruta = tmp_path / "texto.mp4"
+    ruta.write_bytes(b"esto no es un video" * 10)
+    assert sondear(ruta) is None
@@ -0,0 +1,45 @@
+"""Veredicto rápido: cortar la decodificación en cuanto el video es crítico da el mismo veredicto"""
+import shutil
+
+import pytest
+
+pytest.importorskip("pydub")
+pytestmark = pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg no disponible")
+
+
+def analizar(nuevo_auditor, tmp_path, ruta, veredicto_rapido):
+    auditor = nuevo_auditor(tmp_path, modo_audio="streaming", veredicto_rapido=veredicto_rapido,
+                            bloque_pcm_bytes=64 * 1024)
+    return auditor.detectar_problemas_audio_optimizado(ruta, mostrar_progreso=False)
+
+
+def categoria(problema):
+    # "EXCESO DE SILENCIO (52.3%)" y "EXCESO DE SILENCIO (≥41.0%)" son el mismo veredicto
+    return problema.split(" (")[0]
+
+
+@pytest.mark.parametrize("tramos, problema", [
+    (((1, 1.0), (59, 0.3)), "AUDIO SATURADO/DISTORSIONADO"),
+    (((32, 0.0), (28, 0.3)), "EXCESO DE SILENCIO"),
+    (((12, 0.3),), "VIDEO MUY CORTO"),
+])
+def test_mismo_veredicto_critico_que_el_analisis_completo(nuevo_auditor, tmp_path, escribir_wav, tramos, problema):
+    ruta = escribir_wav(2, 1, tramos=tramos)
+    completo = analizar(nuevo_auditor, tmp_path, ruta, False)
+    rapido = analizar(nuevo_auditor, tmp_path, ruta, True)
+
+    assert completo["es_critico"] and rapido["es_critico"]
+    assert [categoria(p) for p in completo["problemas"]] == [problema]
+    assert [categoria(p) for p in rapido["problemas"]] == [problema]
+    # Se detuvo antes del final
+    anticipado = rapido["veredicto_anticipado"]
+    assert anticipado["decodificado_s"] < anticipado["duracion_s"]
+
+
+def test_video_sin_problemas_se_analiza_entero(nuevo_auditor, tmp_path, escribir_wav):
+    ruta = escribir_wav(2, 1, tramos=((60, 0.3),))
+    completo = analizar(nuevo_auditor, tmp_path, ruta, False)
+    rapido = analizar(nuevo_auditor, tmp_path, ruta, True)
+    assert "veredicto_anticipado" not in rapido
+    assert rapido == completo
+    assert not rapido["es_critico"]